@@ -1,7 +1,7 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import select
 
@@ -10,13 +10,17 @@ from app.models.example import ExampleModel
 from app.modules.account import profile_router, router as account_router
 from app.modules.admin import router as admin_router
 from app.modules.analysis import router as analysis_router
+from app.modules.analysis.parsing import shutdown_parser_pool, start_parser_pool
 from app.modules.company import router as company_router
 from app.modules.contribution import router as contribution_router
 from app.modules.preparation import router as preparation_router
 from app.modules.questions import router as questions_router
 from app.modules.questions.user_views import router as user_questions_router
 from app.modules.roadmap import router as roadmap_router
-from app.utils.db import DBSession, database
+from app.utils.db import READ_PRIMARY_HEADER, DBSession, database, read_primary_after_write
+from app.utils.jobs import start_job_workers, stop_job_workers
+from app.utils.openai_client import close_openai_client, init_openai_client
+from app.utils.user_cache import start_user_cache_listener, stop_user_cache_listener
 
 # Configure logging
 logging.basicConfig(
@@ -33,7 +37,11 @@ async def lifespan(app: FastAPI):
     
     Handles:
     - Database initialization on startup
-    - Database cleanup on shutdown
+    - Shared OpenAI client creation on startup
+    - Background job workers (JOB_WORKERS) start/stop
+    - File parser process pool (PARSER_WORKERS) start/stop
+    - User cache invalidation listener (LISTEN user_cache_invalidate) start/stop
+    - Database and OpenAI client cleanup on shutdown
     """
     # Startup: Initialize database connection pool and create tables
     try:
@@ -49,6 +57,15 @@ async def lifespan(app: FastAPI):
         jd_upload_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"Upload directories ready: cv={cv_upload_path}, jd={jd_upload_path}")
 
+        if settings.openai.api_key:
+            init_openai_client()
+        else:
+            logger.warning("OPENAI_API_KEY is not set; LLM features are unavailable")
+
+        start_job_workers()
+        start_parser_pool()
+        start_user_cache_listener()
+
         logger.info("Application startup complete")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
@@ -59,6 +76,10 @@ async def lifespan(app: FastAPI):
     # Shutdown: Close database connections and cleanup resources
     try:
         logger.info("Shutting down application...")
+        await stop_job_workers()
+        shutdown_parser_pool()
+        await stop_user_cache_listener()
+        await close_openai_client()
         await database.close()
         logger.info("Application shutdown complete")
     except Exception as e:
@@ -80,8 +101,18 @@ def create_app():
         allow_credentials=settings.cors.allow_credentials,
         allow_methods=settings.cors.allow_methods,
         allow_headers=settings.cors.allow_headers,
+        expose_headers=[READ_PRIMARY_HEADER],
     )
 
+    if settings.database.read_url:
+        # Read-your-writes with a replica: after a successful write, the client's reads use the primary
+        @app.middleware("http")
+        async def read_your_writes(request: Request, call_next):
+            response = await call_next(request)
+            if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+                read_primary_after_write(request, response)
+            return response
+
     # Include routers
     app.include_router(account_router)
     app.include_router(profile_router)
@@ -59,10 +59,33 @@ class DatabaseSettings(BaseSettings):
         validation_alias="DB_ECHO",
     )
 
-    @field_validator("url", mode="before")
+    # Optional read replica for ReadDBSession endpoints
+    read_url: PostgresDsn | None = Field(
+        default=None,
+        description="Read replica URL for read-only endpoints (unset: reads use DATABASE_URL)",
+        validation_alias="DATABASE_READ_URL",
+    )
+
+    read_sticky_seconds: float = Field(
+        default=10.0,
+        ge=0,
+        le=600,
+        description="Seconds a client's reads stay on the primary after its own write (replica lag)",
+        validation_alias="DB_READ_STICKY_SECONDS",
+    )
+
+    migrate_on_startup: bool = Field(
+        default=True,
+        description="Apply pending schema migrations when a process starts (false: fail if the schema is behind)",
+        validation_alias="DB_MIGRATE_ON_STARTUP",
+    )
+
+    @field_validator("url", "read_url", mode="before")
     @classmethod
-    def convert_to_async_url(cls, v: str | PostgresDsn) -> str:
+    def convert_to_async_url(cls, v: str | PostgresDsn | None) -> str | None:
         """Convert sync PostgreSQL URL to async format."""
+        if v is None or v == "":
+            return None
         url_str = str(v)
         if url_str.startswith("postgresql://"):
             url_str = url_str.replace("postgresql://", "postgresql+asyncpg://", 1)
@@ -193,6 +216,104 @@ class OpenAISettings(BaseSettings):
         validation_alias="OPENAI_MAX_TOKENS",
     )
 
+    timeout: float = Field(
+        default=60.0,
+        gt=0,
+        le=600,
+        description="Default request timeout in seconds (call sites may pass their own)",
+        validation_alias="OPENAI_TIMEOUT",
+    )
+
+    connect_timeout: float = Field(
+        default=10.0,
+        gt=0,
+        le=60,
+        description="TCP/TLS connect timeout in seconds",
+        validation_alias="OPENAI_CONNECT_TIMEOUT",
+    )
+
+    max_retries: int = Field(
+        default=2,
+        ge=0,
+        le=10,
+        description="Retries performed by the OpenAI SDK on transient errors",
+        validation_alias="OPENAI_MAX_RETRIES",
+    )
+
+    max_connections: int = Field(
+        default=50,
+        ge=1,
+        le=1000,
+        description="Maximum HTTP connections in the shared client pool (per worker)",
+        validation_alias="OPENAI_MAX_CONNECTIONS",
+    )
+
+    max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        le=1000,
+        description="Idle keep-alive connections kept in the shared client pool",
+        validation_alias="OPENAI_MAX_KEEPALIVE_CONNECTIONS",
+    )
+
+    keepalive_expiry: float = Field(
+        default=60.0,
+        ge=0,
+        le=3600,
+        description="Seconds an idle keep-alive connection is kept open",
+        validation_alias="OPENAI_KEEPALIVE_EXPIRY",
+    )
+
+    http2: bool = Field(
+        default=False,
+        description="Use HTTP/2 when the endpoint supports it (requires the optional 'h2' package: httpx[http2])",
+        validation_alias="OPENAI_HTTP2",
+    )
+
+    cache_enabled: bool = Field(
+        default=True,
+        description="Cache completions for call sites that opt in (set false to bypass globally)",
+        validation_alias="OPENAI_CACHE_ENABLED",
+    )
+
+    cache_ttl_seconds: int = Field(
+        default=7 * 24 * 3600,
+        ge=60,
+        description="How long cached completions stay valid (memory and Postgres tiers)",
+        validation_alias="OPENAI_CACHE_TTL_SECONDS",
+    )
+
+    cache_memory_entries: int = Field(
+        default=512,
+        ge=0,
+        le=100000,
+        description="Max completions kept in the per-worker in-memory cache (0 = Postgres only)",
+        validation_alias="OPENAI_CACHE_MEMORY_ENTRIES",
+    )
+
+    cache_purge_interval_seconds: int = Field(
+        default=3600,
+        ge=0,
+        description="Min seconds between deletes of expired llm_cache rows, run by a worker after a cache write (0 = never)",
+        validation_alias="OPENAI_CACHE_PURGE_INTERVAL_SECONDS",
+    )
+
+    roadmap_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=10,
+        description="Max roadmap items generated concurrently within one request",
+        validation_alias="OPENAI_ROADMAP_CONCURRENCY",
+    )
+
+    roadmap_max_concurrency: int = Field(
+        default=16,
+        ge=1,
+        le=200,
+        description="Max roadmap item generations in flight per worker process (across all requests)",
+        validation_alias="OPENAI_ROADMAP_MAX_CONCURRENCY",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -235,6 +356,14 @@ class StorageSettings(BaseSettings):
         validation_alias="UPLOAD_JD_SUBDIR",
     )
 
+    max_jd_size_mb: int = Field(
+        default=10,
+        ge=1,
+        le=50,
+        description="Maximum JD file size in megabytes",
+        validation_alias="MAX_JD_SIZE_MB",
+    )
+
     @property
     def cv_upload_path(self) -> str:
         """Get the full path for CV uploads."""
@@ -246,6 +375,11 @@ class StorageSettings(BaseSettings):
         """Get the maximum CV file size in bytes."""
         return self.max_cv_size_mb * 1024 * 1024
 
+    @property
+    def max_jd_size_bytes(self) -> int:
+        """Get the maximum JD file size in bytes."""
+        return self.max_jd_size_mb * 1024 * 1024
+
     @property
     def jd_upload_path(self) -> str:
         """Get the full path for JD (job description) file uploads."""
@@ -289,6 +423,188 @@ class AuthSettings(BaseSettings):
         validation_alias="REFRESH_TOKEN_EXPIRE_DAYS",
     )
 
+    bcrypt_rounds: int = Field(
+        default=12,
+        ge=4,
+        le=16,
+        description="bcrypt cost factor for new hashes (stored hashes with another cost are rehashed on login)",
+        validation_alias="BCRYPT_ROUNDS",
+    )
+
+    bcrypt_threads: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Threads per worker for bcrypt hashing/verification (bcrypt releases the GIL)",
+        validation_alias="BCRYPT_THREADS",
+    )
+
+    user_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        le=3600,
+        description="Seconds an authenticated user is cached per worker (0 = always read from DB)",
+        validation_alias="USER_CACHE_TTL_SECONDS",
+    )
+
+    user_cache_size: int = Field(
+        default=10000,
+        ge=0,
+        description="Max users kept in the per-worker user cache",
+        validation_alias="USER_CACHE_SIZE",
+    )
+
+    token_cache_size: int = Field(
+        default=10000,
+        ge=0,
+        description="Max verified access tokens cached per worker until their exp (0 = verify every request)",
+        validation_alias="TOKEN_CACHE_SIZE",
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+
+class JobSettings(BaseSettings):
+    workers: int = Field(
+        default=2,
+        ge=0,
+        le=64,
+        description="Background job worker coroutines per app process (0 = run scripts/run_worker.py instead)",
+        validation_alias="JOB_WORKERS",
+    )
+
+    poll_interval: float = Field(
+        default=1.0,
+        gt=0,
+        le=60,
+        description="Seconds an idle worker waits before polling the job table again",
+        validation_alias="JOB_POLL_INTERVAL",
+    )
+
+    max_attempts: int = Field(
+        default=3,
+        ge=1,
+        le=20,
+        description="Attempts per job before it is marked failed",
+        validation_alias="JOB_MAX_ATTEMPTS",
+    )
+
+    retry_backoff_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        le=3600,
+        description="Base delay before a retry; doubles with each attempt",
+        validation_alias="JOB_RETRY_BACKOFF_SECONDS",
+    )
+
+    timeout_seconds: float = Field(
+        default=600.0,
+        gt=0,
+        le=86400,
+        description="Max run time of one attempt; running jobs older than this are reclaimed",
+        validation_alias="JOB_TIMEOUT_SECONDS",
+    )
+
+    pregenerate_memory_scan: bool = Field(
+        default=True,
+        description="Generate knowledge areas and memory scan questions in the background right after the JD is stored",
+        validation_alias="PREGENERATE_MEMORY_SCAN",
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+
+class ParserSettings(BaseSettings):
+    """Settings for the PDF/DOCX text extraction process pool."""
+
+    workers: int = Field(
+        default=2,
+        ge=0,
+        le=32,
+        description="Parser processes per app process (0 = parse in a thread of the app process)",
+        validation_alias="PARSER_WORKERS",
+    )
+
+    max_queue: int = Field(
+        default=16,
+        ge=1,
+        le=1024,
+        description="Max parse tasks queued or running per app process; beyond this uploads get 503",
+        validation_alias="PARSER_MAX_QUEUE",
+    )
+
+    timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        le=600,
+        description="Max time to extract text from one file",
+        validation_alias="PARSER_TIMEOUT_SECONDS",
+    )
+
+    max_pdf_pages: int = Field(
+        default=50,
+        ge=1,
+        le=2000,
+        description="Only the first N pages of a PDF are extracted",
+        validation_alias="PARSER_MAX_PDF_PAGES",
+    )
+
+    pdf_pages_per_task: int = Field(
+        default=10,
+        ge=1,
+        le=500,
+        description="Pages per parse task; longer PDFs are split across parser processes",
+        validation_alias="PARSER_PDF_PAGES_PER_TASK",
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+
+class QuestionCatalogSettings(BaseSettings):
+    enabled: bool = Field(
+        default=True,
+        description="Serve memory scan question selection from the in-process catalog snapshot",
+        validation_alias="QUESTION_CATALOG_ENABLED",
+    )
+
+    check_interval: float = Field(
+        default=2.0,
+        ge=0,
+        le=3600,
+        description="Seconds between checks of the catalog version stamp (0 = every request)",
+        validation_alias="QUESTION_CATALOG_CHECK_INTERVAL",
+    )
+
+    rebuild_interval: float = Field(
+        default=3600.0,
+        ge=60,
+        le=86400,
+        description="Seconds between full catalog rebuilds (backstop for missed incremental changes)",
+        validation_alias="QUESTION_CATALOG_REBUILD_INTERVAL",
+    )
+
+    change_retention_seconds: float = Field(
+        default=86400.0,
+        ge=3600,
+        description="Age after which question_catalog_changes rows are pruned (must exceed rebuild interval)",
+        validation_alias="QUESTION_CATALOG_CHANGE_RETENTION_SECONDS",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -329,6 +645,9 @@ class Settings(BaseSettings):
     openai: OpenAISettings = Field(default_factory=OpenAISettings)
     auth: AuthSettings = Field(default_factory=AuthSettings)
     storage: StorageSettings = Field(default_factory=StorageSettings)
+    jobs: JobSettings = Field(default_factory=JobSettings)
+    question_catalog: QuestionCatalogSettings = Field(default_factory=QuestionCatalogSettings)
+    parser: ParserSettings = Field(default_factory=ParserSettings)
 
     @property
     def is_production(self) -> bool:
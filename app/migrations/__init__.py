@@ -0,0 +1,19 @@
+"""Versioned database schema migrations (see runner.py)."""
+
+from .runner import (
+    check_schema_version,
+    get_migrations,
+    get_schema_version,
+    latest_version,
+    migrate,
+    migrate_database,
+)
+
+__all__ = [
+    "check_schema_version",
+    "get_migrations",
+    "get_schema_version",
+    "latest_version",
+    "migrate",
+    "migrate_database",
+]
@@ -0,0 +1,164 @@
+"""
+Versioned schema migrations.
+
+Migrations are the modules in app/migrations/versions, named NNNN_description.py
+and applied in order; each defines `async def upgrade(conn: AsyncConnection)`.
+Applied versions are recorded in the schema_version table, one row per migration.
+
+migrate() applies the pending ones, each in its own transaction, while holding a
+Postgres advisory lock, so concurrent runners (several hosts starting at once)
+apply every migration exactly once. It runs once per deploy from the gunicorn
+master (on_starting in gunicorn.config.py) or scripts/migrate.py; app workers
+only compare the recorded version with the latest one (check_schema_version).
+
+0001 creates every table from the current models (create_all), so on a new
+database each later migration runs against a schema that already contains its
+change: migrations after 0001 must be idempotent (IF NOT EXISTS, guarded DO
+blocks, create_all for a single table). See DEVELOPMENT.md.
+"""
+
+import importlib
+import logging
+import pkgutil
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.migrations import versions
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_TABLE = "schema_version"
+# pg_advisory_lock key of the migration runner (any constant unique to this app)
+MIGRATION_LOCK_ID = 7_360_240_117
+
+_VERSION_RE = re.compile(r"^(\d{4})_(\w+)$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One migration module of app/migrations/versions."""
+
+    version: int
+    name: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+@lru_cache(maxsize=1)
+def get_migrations() -> tuple[Migration, ...]:
+    """All migrations in version order (versions must be 1, 2, 3, ... without gaps)."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        match = _VERSION_RE.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), module.upgrade))
+    migrations.sort(key=lambda m: m.version)
+    found = [m.version for m in migrations]
+    if found != list(range(1, len(found) + 1)):
+        raise RuntimeError(f"Migration versions must be 1..N without gaps or duplicates, found {found}")
+    return tuple(migrations)
+
+
+def latest_version() -> int:
+    """Version the code expects the database to be at."""
+    migrations = get_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+async def get_schema_version(conn: AsyncConnection) -> int:
+    """Highest applied migration version (0 when schema_version does not exist yet)."""
+    exists = await conn.scalar(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": SCHEMA_VERSION_TABLE})
+    if not exists:
+        return 0
+    version = await conn.scalar(text(f"SELECT max(version) FROM {SCHEMA_VERSION_TABLE}"))
+    return version or 0
+
+
+async def check_schema_version(engine: AsyncEngine) -> int:
+    """
+    Pending migrations of the database, for worker startup: one query, no locks or DDL.
+
+    Returns:
+        int: How many migrations the database is behind the code (0 = up to date)
+    """
+    async with engine.connect() as conn:
+        try:
+            version = await conn.scalar(text(f"SELECT max(version) FROM {SCHEMA_VERSION_TABLE}")) or 0
+        except DBAPIError:
+            # schema_version does not exist yet: nothing has been migrated
+            version = 0
+    latest = latest_version()
+    if version > latest:
+        logger.warning("Database schema version %s is newer than this code (%s)", version, latest)
+    return max(latest - version, 0)
+
+
+async def migrate(engine: AsyncEngine) -> list[int]:
+    """
+    Apply pending migrations under the advisory lock; returns the versions applied.
+
+    Each migration and its schema_version row commit together, so a failed
+    migration leaves the database at the previous version and is retried on the
+    next run.
+    """
+    applied: list[int] = []
+    async with engine.connect() as conn:
+        # Session-level lock: held across the per-migration transactions below
+        await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+        await conn.commit()
+        try:
+            await conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+                    "version INTEGER PRIMARY KEY, "
+                    "name VARCHAR(255) NOT NULL, "
+                    "applied_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'))"
+                )
+            )
+            await conn.commit()
+
+            current = await get_schema_version(conn)
+            await conn.commit()
+            for migration in get_migrations():
+                if migration.version <= current:
+                    continue
+                logger.info("Applying migration %04d_%s", migration.version, migration.name)
+                try:
+                    await migration.upgrade(conn)
+                    await conn.execute(
+                        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, name) VALUES (:version, :name)"),
+                        {"version": migration.version, "name": migration.name},
+                    )
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    logger.exception("Migration %04d_%s failed", migration.version, migration.name)
+                    raise
+                applied.append(migration.version)
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_ID})
+            await conn.commit()
+
+    if applied:
+        logger.info("Database migrated to version %s (applied %s)", applied[-1], applied)
+    else:
+        logger.info("Database schema is up to date (version %s)", latest_version())
+    return applied
+
+
+async def migrate_database() -> list[int]:
+    """migrate() on a short-lived engine of its own (gunicorn master, scripts/migrate.py)."""
+    engine = create_async_engine(str(settings.database.url), poolclass=NullPool)
+    try:
+        return await migrate(engine)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,31 @@
+"""
+Tables of all models (CREATE TABLE IF NOT EXISTS).
+
+On a new database this creates the tables as the models define them today,
+so later migrations must stay idempotent (IF NOT EXISTS checks) to also
+apply cleanly on top of it. A migration adding a table for a new model
+creates just that table: SQLModel.metadata.create_all(sync_conn, tables=[Model.__table__]).
+"""
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import SQLModel
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # Import all models here to ensure they're registered with SQLModel
+    from app.models.example import ExampleModel  # noqa: F401
+    from app.models.job import Job  # noqa: F401
+    from app.models.llm_cache import LLMCacheEntry  # noqa: F401
+    from app.modules.account.models import User  # noqa: F401
+    from app.modules.analysis.models import JDAnalysis  # noqa: F401
+    from app.modules.company.models import Company  # noqa: F401
+    from app.modules.contribution.models import Contribution  # noqa: F401
+    from app.modules.questions.models import (  # noqa: F401
+        AssessmentSession,
+        QuestionCatalogChange,
+        UserQuestionAnswer,
+    )
+    from app.modules.preparation.models import Preparation, SelfCheckSet  # noqa: F401
+    from app.modules.roadmap.models import DailyTask, Roadmap  # noqa: F401
+
+    await conn.run_sync(SQLModel.metadata.create_all)
@@ -0,0 +1,28 @@
+"""Profile columns on users (full name, contact, summaries, preferred language)."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # Add profile columns to users if missing (no bind params inside DO $$ - not supported by PostgreSQL)
+    for col, col_type in [
+        ("full_name", "VARCHAR(255)"),
+        ("phone", "VARCHAR(50)"),
+        ("linkedin_url", "VARCHAR(500)"),
+        ("current_company", "VARCHAR(255)"),
+        ("skills_summary", "TEXT"),
+        ("education_summary", "TEXT"),
+        ("preferred_language", "VARCHAR(10) DEFAULT 'en'"),
+    ]:
+        await conn.execute(text(f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'users' AND column_name = '{col}'
+                ) THEN
+                    ALTER TABLE users ADD COLUMN {col} {col_type};
+                END IF;
+            END $$;
+        """))
@@ -0,0 +1,47 @@
+"""Link assessment sessions and roadmaps to preparations; allow answers without a question row."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # Add preparation_id to assessment_sessions if missing
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'assessment_sessions' AND column_name = 'preparation_id'
+            ) THEN
+                ALTER TABLE assessment_sessions
+                ADD COLUMN preparation_id INTEGER REFERENCES preparations(id);
+            END IF;
+        END $$;
+    """))
+    # Add preparation_id to roadmaps if missing
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'roadmaps' AND column_name = 'preparation_id'
+            ) THEN
+                ALTER TABLE roadmaps
+                ADD COLUMN preparation_id INTEGER REFERENCES preparations(id);
+            END IF;
+        END $$;
+    """))
+    # Make user_question_answers.question_id nullable if needed (PostgreSQL: alter column drop not null)
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'user_question_answers' AND column_name = 'question_id'
+            ) THEN
+                ALTER TABLE user_question_answers ALTER COLUMN question_id DROP NOT NULL;
+            END IF;
+        EXCEPTION WHEN OTHERS THEN
+            NULL;
+        END $$;
+    """))
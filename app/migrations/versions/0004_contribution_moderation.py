@@ -0,0 +1,52 @@
+"""Moderation columns on contributions (status, approver, approval time, job position)."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # Add moderation columns to contributions if missing
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'contributions' AND column_name = 'status'
+            ) THEN
+                ALTER TABLE contributions ADD COLUMN status VARCHAR(20) DEFAULT 'pending';
+            END IF;
+        END $$;
+    """))
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'contributions' AND column_name = 'approved_by_admin_id'
+            ) THEN
+                ALTER TABLE contributions ADD COLUMN approved_by_admin_id INTEGER REFERENCES users(id);
+            END IF;
+        END $$;
+    """))
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'contributions' AND column_name = 'approved_at'
+            ) THEN
+                ALTER TABLE contributions ADD COLUMN approved_at TIMESTAMP;
+            END IF;
+        END $$;
+    """))
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'contributions' AND column_name = 'job_position'
+            ) THEN
+                ALTER TABLE contributions ADD COLUMN job_position VARCHAR(255);
+            END IF;
+        END $$;
+    """))
@@ -0,0 +1,44 @@
+"""Memory scan columns on preparations (last result, knowledge areas, generation claim)."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # preparations.last_memory_scan_result (JSON) for viewing last scan result
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'preparations' AND column_name = 'last_memory_scan_result'
+            ) THEN
+                ALTER TABLE preparations ADD COLUMN last_memory_scan_result JSONB;
+            END IF;
+        END $$;
+    """))
+    # preparations.knowledge_areas (JSON array): vùng kiến thức từ JD+profile, dùng cho memory scan / roadmap / self-check
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'preparations' AND column_name = 'knowledge_areas'
+            ) THEN
+                ALTER TABLE preparations ADD COLUMN knowledge_areas JSONB DEFAULT '[]';
+            END IF;
+        END $$;
+    """))
+
+    # preparations.memory_scan_generation_started_at: claim sinh câu hỏi memory scan (single-flight)
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'preparations' AND column_name = 'memory_scan_generation_started_at'
+            ) THEN
+                ALTER TABLE preparations ADD COLUMN memory_scan_generation_started_at TIMESTAMP;
+            END IF;
+        END $$;
+    """))
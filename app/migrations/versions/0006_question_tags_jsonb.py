@@ -0,0 +1,32 @@
+"""questions.tags as JSONB with a GIN index on lowercased tags."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # questions.tags: JSON -> JSONB, lọc tag trong SQL qua GIN index trên tags đã lowercase
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'questions' AND column_name = 'tags' AND data_type = 'json'
+            ) THEN
+                ALTER TABLE questions ALTER COLUMN tags TYPE JSONB USING tags::jsonb;
+            END IF;
+        END $$;
+    """))
+    await conn.execute(text("""
+        CREATE OR REPLACE FUNCTION question_tags_lower(tags JSONB) RETURNS TEXT[]
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT coalesce(array_agg(lower(t)), '{}')
+            FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(tags) = 'array' THEN tags ELSE '[]'::jsonb END
+            ) AS t
+        $$;
+    """))
+    await conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_questions_tags_lower
+        ON questions USING GIN (question_tags_lower(tags));
+    """))
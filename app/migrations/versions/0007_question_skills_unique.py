@@ -0,0 +1,23 @@
+"""Unique (question_id, skill_id) on question_skills, dropping older duplicates."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # question_skills: unique (question_id, skill_id) cho INSERT ... ON CONFLICT; bỏ bản ghi trùng cũ trước
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_indexes
+                WHERE tablename = 'question_skills' AND indexname = 'uq_question_skills_question_skill'
+            ) THEN
+                DELETE FROM question_skills a
+                USING question_skills b
+                WHERE a.question_id = b.question_id AND a.skill_id = b.skill_id AND a.id > b.id;
+                ALTER TABLE question_skills
+                ADD CONSTRAINT uq_question_skills_question_skill UNIQUE (question_id, skill_id);
+            END IF;
+        END $$;
+    """))
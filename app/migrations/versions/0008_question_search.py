@@ -0,0 +1,66 @@
+"""Full-text search column and index on questions (unaccent when available)."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # Full-text search for questions: unaccent (tiếng Việt không dấu) + generated tsvector + GIN
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS unaccent;
+        EXCEPTION WHEN OTHERS THEN
+            RAISE NOTICE 'unaccent extension not available, search stays accent-sensitive: %', SQLERRM;
+        END $$;
+    """))
+    # unaccent() is only STABLE; generated columns and indexes need an IMMUTABLE wrapper
+    await conn.execute(text("""
+        DO $$
+        DECLARE
+            ext_schema TEXT;
+        BEGIN
+            SELECT n.nspname INTO ext_schema
+            FROM pg_extension e JOIN pg_namespace n ON n.oid = e.extnamespace
+            WHERE e.extname = 'unaccent';
+            IF ext_schema IS NOT NULL THEN
+                EXECUTE format(
+                    'CREATE OR REPLACE FUNCTION immutable_unaccent(value TEXT) RETURNS TEXT '
+                    'LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS '
+                    '$f$ SELECT %1$I.unaccent(%2$L::regdictionary, value) $f$',
+                    ext_schema, ext_schema || '.unaccent'
+                );
+            ELSE
+                CREATE OR REPLACE FUNCTION immutable_unaccent(value TEXT) RETURNS TEXT
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS $f$ SELECT value $f$;
+            END IF;
+        END $$;
+    """))
+    await conn.execute(text("""
+        CREATE OR REPLACE FUNCTION question_tags_text(tags JSONB) RETURNS TEXT
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT immutable_unaccent(coalesce(string_agg(t, ' '), ''))
+            FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(tags) = 'array' THEN tags ELSE '[]'::jsonb END
+            ) AS t
+        $$;
+    """))
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'questions' AND column_name = 'search_vector'
+            ) THEN
+                ALTER TABLE questions ADD COLUMN search_vector TSVECTOR GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple'::regconfig, immutable_unaccent(coalesce(title, ''))), 'A')
+                    || setweight(to_tsvector('simple'::regconfig, question_tags_text(tags)), 'A')
+                    || setweight(to_tsvector('simple'::regconfig, immutable_unaccent(coalesce(content, ''))), 'B')
+                ) STORED;
+            END IF;
+        END $$;
+    """))
+    await conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_questions_search_vector
+        ON questions USING GIN (search_vector);
+    """))
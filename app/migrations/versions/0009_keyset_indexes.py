@@ -0,0 +1,12 @@
+"""(created_at, id) indexes for keyset pagination of admin lists."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # Keyset pagination of admin lists: ORDER BY created_at DESC, id DESC
+    for table in ("questions", "users", "contributions"):
+        await conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_created_at_id ON {table} (created_at, id)"
+        ))
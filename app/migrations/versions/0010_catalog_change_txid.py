@@ -0,0 +1,20 @@
+"""Commit-ordered version stamp for the question catalog: writer transaction id on question_catalog_changes."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # Serial ids follow insert order, not commit order; readers poll by transaction id instead
+    await conn.execute(text("""
+        ALTER TABLE question_catalog_changes
+        ADD COLUMN IF NOT EXISTS txid xid8 NOT NULL DEFAULT pg_current_xact_id()
+    """))
+    await conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_question_catalog_changes_txid
+        ON question_catalog_changes (txid)
+    """))
+    await conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_question_catalog_changes_changed_at
+        ON question_catalog_changes (changed_at)
+    """))
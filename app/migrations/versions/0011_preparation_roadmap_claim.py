@@ -0,0 +1,12 @@
+"""Roadmap streaming claim timestamp on preparations (stale claims can be taken over)."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # preparations.roadmap_generation_started_at: set while a stream holds the roadmap claim
+    await conn.execute(text("""
+        ALTER TABLE preparations
+        ADD COLUMN IF NOT EXISTS roadmap_generation_started_at TIMESTAMP
+    """))
@@ -0,0 +1,16 @@
+"""tsm_system_rows extension for sampling questions without sorting the whole table (optional)."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    # TABLESAMPLE SYSTEM_ROWS(n) for the unfiltered question sample; without it the sample sorts all rows
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS tsm_system_rows;
+        EXCEPTION WHEN OTHERS THEN
+            RAISE NOTICE 'tsm_system_rows extension not available, question sampling sorts by random(): %', SQLERRM;
+        END $$;
+    """))
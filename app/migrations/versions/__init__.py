@@ -0,0 +1 @@
+"""Migration modules NNNN_description.py, applied in version order."""
@@ -0,0 +1,58 @@
+"""Background job model (Postgres-backed queue)."""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+from sqlmodel import Column, Field, JSON, SQLModel, Text
+
+
+class JobStatus:
+    """Lifecycle of a job row."""
+
+    QUEUED = "queued"  # Waiting for a worker (also used between retries)
+    RUNNING = "running"  # Claimed by a worker
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"  # Out of attempts or permanent error
+
+    ACTIVE = (QUEUED, RUNNING)
+
+
+class Job(SQLModel, table=True):
+    """A unit of background work claimed by workers with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "jobs"
+
+    id: int | None = Field(default=None, primary_key=True)
+    kind: str = Field(max_length=100, index=True)
+    status: str = Field(max_length=20, default=JobStatus.QUEUED, index=True)
+    user_id: int | None = Field(default=None, foreign_key="users.id", index=True)
+    preparation_id: int | None = Field(default=None, foreign_key="preparations.id", index=True)
+    payload: dict[str, Any] = Field(sa_column=Column(JSON), default_factory=dict)
+    result: dict[str, Any] | None = Field(sa_column=Column(JSON), default=None)
+    error: str | None = Field(sa_column=Column(Text), default=None)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    run_after: datetime = Field(default_factory=datetime.utcnow, index=True)
+    locked_at: datetime | None = Field(default=None)
+    finished_at: datetime | None = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class JobResponse(BaseModel):
+    """Job status for API responses (202 bodies and polling)."""
+
+    id: int
+    kind: str
+    status: str
+    preparation_id: int | None
+    attempts: int
+    max_attempts: int
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
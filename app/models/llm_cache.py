@@ -0,0 +1,17 @@
+"""Persistent tier of the LLM response cache."""
+
+from datetime import datetime
+
+from sqlmodel import Column, Field, SQLModel, Text
+
+
+class LLMCacheEntry(SQLModel, table=True):
+    """Completion text keyed by a hash of (model, messages, temperature, max_tokens)."""
+
+    __tablename__ = "llm_cache"
+
+    key: str = Field(primary_key=True, max_length=64)
+    model: str = Field(max_length=255)
+    content: str = Field(sa_column=Column(Text, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(index=True)
@@ -13,6 +13,7 @@ logger = logging.getLogger(__name__)
 MAX_CV_TEXT_LENGTH = 30_000  # truncate for LLM context
 MAX_SKILLS_SUMMARY_LENGTH = 4_000  # cap stored skills summary
 MAX_EDUCATION_SUMMARY_LENGTH = 3_000  # cap stored education summary
+CV_LLM_TIMEOUT = 60.0  # seconds; CV extraction returns a large JSON
 
 # Map common job titles/roles from CV to our UserRole-like values
 ROLE_NORMALIZE_MAP = {
@@ -114,6 +115,7 @@ CV/Resume text:
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
             max_tokens=settings.openai.max_tokens,
+            timeout=CV_LLM_TIMEOUT,
         )
         content = response.choices[0].message.content
         if not content:
@@ -11,9 +11,11 @@ from fastapi.responses import FileResponse
 from app.config import settings
 from app.modules.account.models import ProfileUpdate, User, UserResponse, UserRole
 from app.modules.account.profile_services import extract_profile_from_cv_llm
-from app.modules.analysis.services import extract_text_from_file
+from app.modules.analysis.parsing import extract_text_in_pool
 from app.utils.auth import CurrentUser
-from app.utils.db import DBSession
+from app.utils.db import DBSession, release_connection
+from app.utils.uploads import save_upload
+from app.utils.user_cache import invalidate_user
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +92,7 @@ async def update_profile(
 
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
+    await invalidate_user(session, current_user.id)
     await session.commit()
     await session.refresh(current_user)
 
@@ -119,15 +122,8 @@ async def upload_cv(
     # Validate file type
     ext = _validate_cv_file(file)
 
-    # Read file content and check size
-    content = await file.read()
-    max_size = settings.storage.max_cv_size_bytes
-
-    if len(content) > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size is {settings.storage.max_cv_size_mb} MB",
-        )
+    # File I/O and LLM extraction below are slow: give the pooled connection back until the final write
+    await release_connection(session)
 
     # Generate a unique filename: {uuid}_{sanitized_original_name}
     safe_original = "".join(
@@ -140,6 +136,16 @@ async def upload_cv(
     cv_dir = _ensure_cv_dir(current_user.id)
     file_path = cv_dir / unique_name
 
+    # Stream the new file to disk (aborts with 413 once over max_cv_size_bytes)
+    try:
+        await save_upload(file, file_path, max_bytes=settings.storage.max_cv_size_bytes)
+    except OSError as e:
+        logger.error(f"Failed to save CV file: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save file",
+        )
+
     # Delete old CV file if it exists
     if current_user.cv_path:
         old_path = Path(settings.storage.cv_upload_path) / current_user.cv_path
@@ -150,16 +156,6 @@ async def upload_cv(
             except OSError as e:
                 logger.warning(f"Failed to delete old CV: {e}")
 
-    # Write the new file
-    try:
-        file_path.write_bytes(content)
-    except OSError as e:
-        logger.error(f"Failed to save CV file: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to save file",
-        )
-
     # Store relative path (relative to cv_upload_path): {user_id}/{unique_name}
     relative_path = f"{current_user.id}/{unique_name}"
     current_user.cv_path = relative_path
@@ -167,7 +163,7 @@ async def upload_cv(
 
     # Extract profile from CV using LLM and auto-fill user fields
     try:
-        cv_text = extract_text_from_file(content=content, filename=file.filename or "")
+        cv_text = await extract_text_in_pool(path=file_path, filename=file.filename or "")
         if cv_text and cv_text.strip():
             extracted = await extract_profile_from_cv_llm(
                 cv_text,
@@ -197,6 +193,7 @@ async def upload_cv(
         logger.warning("CV profile extraction failed (upload succeeded): %s", e)
 
     session.add(current_user)
+    await invalidate_user(session, current_user.id)
     await session.commit()
     await session.refresh(current_user)
 
@@ -290,4 +287,5 @@ async def delete_cv(
     current_user.cv_path = None
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
+    await invalidate_user(session, current_user.id)
     await session.commit()
@@ -16,11 +16,11 @@ from app.modules.account.models import (
 )
 from app.utils.auth import (
     CurrentUser,
+    authenticate_user,
     create_access_token,
     create_refresh_token,
     decode_refresh_token,
     get_password_hash,
-    verify_password,
 )
 from app.utils.db import DBSession
 
@@ -54,7 +54,7 @@ async def register(user_data: UserCreate, session: DBSession) -> Token:
         )
 
     # Hash password and create user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -101,8 +101,8 @@ async def login(credentials: UserLogin, session: DBSession) -> Token:
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
 
-    # Verify user exists and password is correct
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    # Verify user exists and password is correct (rehashed if BCRYPT_ROUNDS changed)
+    if not await authenticate_user(session, user, credentials.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
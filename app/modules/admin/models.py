@@ -42,8 +42,10 @@ class UserListResponse(BaseModel):
 
     users: list[UserListItem]
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
+    next_cursor: str | None = None
 
 
 class BanUserRequest(BaseModel):
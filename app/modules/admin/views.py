@@ -3,7 +3,7 @@
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlmodel import func, select
+from sqlmodel import select
 
 from app.modules.account.models import Token, User, UserResponse
 from app.modules.admin.models import (
@@ -13,19 +13,29 @@ from app.modules.admin.models import (
     UserListItem,
     UserListResponse,
 )
-from app.modules.company.models import Company
+from app.modules.analysis.parsing import get_parser_stats
 from app.modules.contribution.models import (
     Contribution,
     ContributionAdminListResponse,
+    ContributionAdminPageResponse,
+    ContributionAdminSummaryResponse,
     ContributionResponse,
     ContributionStatus,
 )
+from app.modules.contribution.services import (
+    contribution_detail_statement,
+    contribution_summary_statement,
+)
 from app.utils.auth import (
     AdminUser,
+    authenticate_user,
     create_access_token,
-    verify_password,
 )
 from app.utils.db import DBSession
+from app.utils.llm_cache import get_llm_cache_stats
+from app.utils.openai_client import get_openai_pool_stats
+from app.utils.pagination import count_rows, paginate
+from app.utils.user_cache import get_user_cache_stats, invalidate_user
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -50,8 +60,8 @@ async def admin_login(credentials: AdminLoginRequest, session: DBSession) -> Tok
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
 
-    # Verify user exists and password is correct
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    # Verify user exists and password is correct (rehashed if BCRYPT_ROUNDS changed)
+    if not await authenticate_user(session, user, credentials.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -93,8 +103,10 @@ async def admin_login(credentials: AdminLoginRequest, session: DBSession) -> Tok
 async def list_users(
     admin: AdminUser,
     session: DBSession,
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    exact_count: bool = Query(False, description="Always compute an exact total"),
     email: str | None = Query(None, description="Filter by email (partial match)"),
     is_active: bool | None = Query(None, description="Filter by active status"),
     is_admin: bool | None = Query(None, description="Filter by admin status"),
@@ -105,8 +117,10 @@ async def list_users(
     Args:
         admin: Current admin user (dependency injection)
         session: Database session
-        page: Page number (1-indexed)
+        page: Page number (1-indexed), used when no cursor is given
         page_size: Number of items per page
+        cursor: Keyset cursor (next_cursor of the previous page)
+        exact_count: Compute an exact total instead of an estimate/cached count
         email: Filter by email (partial match)
         is_active: Filter by active status
         is_admin: Filter by admin status
@@ -126,23 +140,31 @@ async def list_users(
         statement = statement.where(User.is_admin == is_admin)
 
     # Get total count
-    count_statement = select(func.count()).select_from(statement.subquery())
-    total_result = await session.execute(count_statement)
-    total = total_result.scalar_one()
-
-    # Apply pagination and ordering
-    statement = statement.order_by(User.created_at.desc())
-    statement = statement.offset((page - 1) * page_size).limit(page_size)
+    filtered = bool(email) or is_active is not None or is_admin is not None
+    total, total_is_estimate = await count_rows(
+        session, statement, table="users", filtered=filtered, exact=exact_count
+    )
 
-    # Execute query
-    result = await session.execute(statement)
-    users = result.scalars().all()
+    # Newest first, keyset on (created_at, id)
+    users, next_cursor = await paginate(
+        session,
+        statement,
+        sort_key="created_at",
+        sort_expr=User.created_at,
+        id_column=User.id,
+        descending=True,
+        page_size=page_size,
+        cursor=cursor,
+        page=page,
+    )
 
     return UserListResponse(
         users=[UserListItem.model_validate(user) for user in users],
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
@@ -215,6 +237,7 @@ async def ban_user(
     user.is_active = False
     user.updated_at = datetime.utcnow()
     session.add(user)
+    await invalidate_user(session, user.id)
     await session.commit()
     await session.refresh(user)
 
@@ -251,6 +274,7 @@ async def unban_user(
     user.is_active = True
     user.updated_at = datetime.utcnow()
     session.add(user)
+    await invalidate_user(session, user.id)
     await session.commit()
     await session.refresh(user)
 
@@ -260,38 +284,59 @@ async def unban_user(
 # ----- Contribution moderation -----
 
 
-@router.get("/contributions", response_model=list[ContributionAdminListResponse])
+def _valid_contribution_status(status_filter: str | None) -> bool:
+    return bool(status_filter) and status_filter in (
+        ContributionStatus.PENDING,
+        ContributionStatus.APPROVED,
+        ContributionStatus.REJECTED,
+    )
+
+
+def _contribution_list_statement(status_filter: str | None, stmt=None):
+    """stmt (mặc định select(Contribution)), lọc theo status nếu hợp lệ (status lạ bị bỏ qua như trước)."""
+    if stmt is None:
+        stmt = select(Contribution)
+    if _valid_contribution_status(status_filter):
+        stmt = stmt.where(Contribution.status == status_filter)
+    return stmt
+
+
+@router.get("/contributions", response_model=ContributionAdminPageResponse)
 async def admin_list_contributions(
     admin: AdminUser,
     session: DBSession,
     status_filter: str | None = Query(None, alias="status", description="pending | approved | rejected"),
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="Bỏ qua khi có cursor"),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor của trang trước"),
 ):
-    """Danh sách đóng góp (admin) với lọc theo trạng thái và phân trang."""
-    stmt = select(Contribution).order_by(Contribution.created_at.desc())
-    if status_filter and status_filter in (
-        ContributionStatus.PENDING,
-        ContributionStatus.APPROVED,
-        ContributionStatus.REJECTED,
-    ):
-        stmt = stmt.where(Contribution.status == status_filter)
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-    result = await session.execute(stmt)
-    items = result.scalars().all()
-
-    out = []
-    for c in items:
-        company = await session.get(Company, c.company_id)
-        user = await session.get(User, c.user_id)
-        out.append(
-            ContributionAdminListResponse(
-                **ContributionResponse.model_validate(c).model_dump(),
-                company_name=company.name if company else "",
-                user_email=user.email if user else "",
-            )
-        )
-    return out
+    """
+    Danh sách đóng góp (admin) với lọc theo trạng thái và phân trang.
+
+    Phân trang keyset theo (created_at, id): cursor trang kế tiếp là next_cursor
+    trong body (None = trang cuối), như list users/questions. Trả bản rút gọn (jd_excerpt,
+    question_count); nội dung đầy đủ lấy qua GET /contributions/{contribution_id}.
+    """
+    stmt = _contribution_list_statement(
+        status_filter, contribution_summary_statement(with_user_email=True)
+    )
+    rows, next_cursor = await paginate(
+        session,
+        stmt,
+        sort_key="created_at",
+        sort_expr=Contribution.created_at,
+        id_column=Contribution.id,
+        descending=True,
+        page_size=page_size,
+        cursor=cursor,
+        page=page,
+    )
+    return ContributionAdminPageResponse(
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        items=[ContributionAdminSummaryResponse.model_validate(row) for row in rows],
+    )
 
 
 @router.get("/contributions/count")
@@ -299,18 +344,23 @@ async def admin_count_contributions(
     admin: AdminUser,
     session: DBSession,
     status_filter: str | None = Query(None, alias="status"),
+    exact: bool = Query(False, description="Đếm chính xác thay vì ước lượng/cache"),
 ):
-    """Tổng số đóng góp (để phân trang), có thể lọc theo status."""
-    stmt = select(func.count()).select_from(Contribution)
-    if status_filter and status_filter in (
-        ContributionStatus.PENDING,
-        ContributionStatus.APPROVED,
-        ContributionStatus.REJECTED,
-    ):
-        stmt = stmt.where(Contribution.status == status_filter)
-    result = await session.execute(stmt)
-    total = result.scalar_one()
-    return {"total": total}
+    """
+    Tổng số đóng góp (để phân trang), có thể lọc theo status.
+
+    Mặc định trả số ước lượng (pg_class.reltuples khi không lọc, cache ngắn khi lọc);
+    estimated cho biết total có phải số ước lượng hay không.
+    """
+    stmt = _contribution_list_statement(status_filter)
+    total, estimated = await count_rows(
+        session,
+        stmt,
+        table="contributions",
+        filtered=_valid_contribution_status(status_filter),
+        exact=exact,
+    )
+    return {"total": total, "estimated": estimated}
 
 
 @router.get("/contributions/{contribution_id}", response_model=ContributionAdminListResponse)
@@ -320,16 +370,11 @@ async def admin_get_contribution(
     session: DBSession,
 ):
     """Chi tiết một đóng góp (admin)."""
-    contribution = await session.get(Contribution, contribution_id)
-    if not contribution:
+    stmt = contribution_detail_statement(with_user_email=True).where(Contribution.id == contribution_id)
+    row = (await session.execute(stmt)).first()
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contribution not found")
-    company = await session.get(Company, contribution.company_id)
-    user = await session.get(User, contribution.user_id)
-    return ContributionAdminListResponse(
-        **ContributionResponse.model_validate(contribution).model_dump(),
-        company_name=company.name if company else "",
-        user_email=user.email if user else "",
-    )
+    return ContributionAdminListResponse.model_validate(row)
 
 
 @router.patch("/contributions/{contribution_id}/approve", response_model=ContributionResponse)
@@ -380,3 +425,21 @@ async def admin_reject_contribution(
     await session.commit()
     await session.refresh(contribution)
     return ContributionResponse.model_validate(contribution)
+
+
+@router.get("/llm/stats")
+async def admin_llm_stats(admin: AdminUser) -> dict:
+    """LLM client metrics for this worker process (HTTP pool usage, connection reuse, response cache)."""
+    return {"http_pool": get_openai_pool_stats(), "cache": get_llm_cache_stats()}
+
+
+@router.get("/parser/stats")
+async def admin_parser_stats(admin: AdminUser) -> dict:
+    """File parser pool metrics for this worker process (queue depth, parse times, timeouts)."""
+    return get_parser_stats()
+
+
+@router.get("/user-cache/stats")
+async def admin_user_cache_stats(admin: AdminUser) -> dict:
+    """Authenticated-user cache metrics for this worker process (hit ratio, invalidations)."""
+    return get_user_cache_stats()
@@ -0,0 +1,282 @@
+"""
+Text extraction for uploaded JD/CV files, off the event loop.
+
+pypdf and python-docx are CPU-bound and hold the GIL, so parsing inline blocks
+every request of the worker. Files are parsed in a per-process
+ProcessPoolExecutor (PARSER_WORKERS processes, spawn start method) with:
+
+- admission control: at most PARSER_MAX_QUEUE tasks queued or running, else ParserBusyError;
+- a time limit per file (PARSER_TIMEOUT_SECONDS); pending tasks are cancelled, and a
+  pool whose process is still busy with an abandoned task is terminated and recreated;
+- a page limit (PARSER_MAX_PDF_PAGES) and page-level fan-out: a long PDF is split
+  into tasks of PARSER_PDF_PAGES_PER_TASK pages parsed in parallel.
+
+Parser processes get the path of the uploaded file (see app/utils/uploads.py), never
+its bytes: PDFs are read through a read-only memory map, DOCX through zipfile.
+
+get_parser_stats() reports parse times and queue depth for this worker.
+"""
+
+import asyncio
+import logging
+import mmap
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+from docx import Document as DocxDocument
+from fastapi import HTTPException, status
+from pypdf import PdfReader
+
+from app.config import settings
+from app.modules.analysis.services import ALLOWED_JD_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentParseError(ValueError):
+    """The file could not be read (corrupt or unsupported content)."""
+
+
+class ParserBusyError(DocumentParseError):
+    """Too many parse tasks queued in this worker; retry later."""
+
+
+class ParseTimeoutError(DocumentParseError):
+    """Text extraction exceeded PARSER_TIMEOUT_SECONDS."""
+
+
+_executor: ProcessPoolExecutor | None = None
+_queue_depth = 0
+_stats: dict[str, Any] = {
+    "files_total": 0,
+    "pdf_pages_total": 0,
+    "pdf_truncated_total": 0,
+    "rejected_total": 0,
+    "timeouts_total": 0,
+    "failures_total": 0,
+    "pool_restarts_total": 0,
+    "parse_ms_total": 0.0,
+    "parse_ms_max": 0.0,
+    "parse_ms_last": None,
+}
+
+
+# ---- run inside parser processes (module-level so they pickle) ----
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> tuple[int, list[str]]:
+    """(page count of the PDF, text of pages [start, stop))."""
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return 0, []
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            reader = PdfReader(data)
+            total = len(reader.pages)
+            return total, [reader.pages[i].extract_text() or "" for i in range(start, min(stop, total))]
+
+
+def _extract_docx(path: str) -> str:
+    doc = DocxDocument(path)
+    return "\n".join(p.text for p in doc.paragraphs).strip()
+
+
+# ---- pool management ----
+
+
+def _get_executor() -> Executor | None:
+    """Process pool of this worker (created lazily), or None when PARSER_WORKERS=0 (thread mode)."""
+    global _executor
+    if settings.parser.workers == 0:
+        return None
+    if _executor is None:
+        # spawn: never fork a process that runs an event loop and DB/HTTP pools
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.parser.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=200,
+        )
+    return _executor
+
+
+def _recycle_executor(executor: ProcessPoolExecutor) -> None:
+    """Terminate a pool whose process is stuck on an abandoned task; the next parse creates a new one."""
+    global _executor
+    if _executor is executor:
+        _executor = None
+    _stats["pool_restarts_total"] += 1
+    # ProcessPoolExecutor cannot cancel a running task; terminating its processes is the only way
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    logger.warning("Parser pool terminated (%d processes) after an abandoned task", len(processes))
+
+
+def _noop() -> None:
+    return None
+
+
+def start_parser_pool() -> None:
+    """Spawn the parser processes at startup so the first upload does not pay for process start."""
+    executor = _get_executor()
+    if executor is not None:
+        for _ in range(settings.parser.workers):
+            executor.submit(_noop)
+
+
+def _drop_broken_executor() -> None:
+    global _executor
+    if _executor is not None and getattr(_executor, "_broken", False):
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def shutdown_parser_pool() -> None:
+    """Stop the parser processes of this worker (app shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _submit(fn, *args):
+    """Run fn(*args) in the parser pool; cancelling the await cancels or abandons the task."""
+    global _queue_depth
+    executor = _get_executor()
+    _queue_depth += 1
+    try:
+        if executor is None:
+            return await asyncio.to_thread(fn, *args)
+        future = executor.submit(fn, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # wrap_future cancelled it if still queued; a running task keeps its process busy
+            if future.running():
+                _recycle_executor(executor)
+            raise
+    finally:
+        _queue_depth -= 1
+
+
+async def _parse_pdf(path: str) -> str:
+    per_task = settings.parser.pdf_pages_per_task
+    max_pages = settings.parser.max_pdf_pages
+    total, texts = await _submit(_extract_pdf_pages, path, 0, min(per_task, max_pages))
+    pages = min(total, max_pages)
+    if total > max_pages:
+        _stats["pdf_truncated_total"] += 1
+        logger.info("PDF has %d pages; extracting the first %d", total, max_pages)
+    if pages > per_task:
+        chunks = await asyncio.gather(
+            *(
+                _submit(_extract_pdf_pages, path, start, min(start + per_task, pages))
+                for start in range(per_task, pages, per_task)
+            )
+        )
+        for _, chunk in chunks:
+            texts.extend(chunk)
+    _stats["pdf_pages_total"] += pages
+    return "\n".join(texts).strip()
+
+
+async def extract_text_in_pool(*, path: Path, filename: str) -> str:
+    """
+    Text of the file at path (PDF, DOCX, TXT): PDF/DOCX parsed in the parser pool, TXT read on a thread.
+
+    Args:
+        path: Uploaded file on disk
+        filename: Original filename (used for extension)
+
+    Raises:
+        ValueError: If file type is not supported
+        ParserBusyError: PARSER_MAX_QUEUE tasks already queued in this worker
+        ParseTimeoutError: Extraction took longer than PARSER_TIMEOUT_SECONDS
+        DocumentParseError: The file could not be parsed
+    """
+    ext = Path(filename).suffix.lower()
+    if ext not in ALLOWED_JD_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {ext}. Allowed: {ALLOWED_JD_EXTENSIONS}")
+    if ext == ".txt":
+        raw = await asyncio.to_thread(path.read_bytes)
+        return raw.decode("utf-8", errors="replace").strip()
+
+    if _queue_depth >= settings.parser.max_queue:
+        _stats["rejected_total"] += 1
+        raise ParserBusyError("File parser is busy, please retry shortly")
+
+    started = time.monotonic()
+    try:
+        async with asyncio.timeout(settings.parser.timeout_seconds):
+            if ext == ".pdf":
+                text = await _parse_pdf(str(path))
+            else:
+                text = await _submit(_extract_docx, str(path))
+    except TimeoutError:
+        _stats["timeouts_total"] += 1
+        raise ParseTimeoutError(
+            f"Could not extract text within {settings.parser.timeout_seconds:g}s"
+        ) from None
+    except BrokenProcessPool:
+        # Pool recycled under this task (another parse timed out) or a parser process crashed
+        _stats["failures_total"] += 1
+        _drop_broken_executor()
+        raise ParserBusyError("File parser restarted, please retry") from None
+    except Exception as e:
+        _stats["failures_total"] += 1
+        logger.warning("Failed to parse %s: %s", ext, e)
+        raise DocumentParseError("Could not read the uploaded file") from e
+
+    elapsed_ms = (time.monotonic() - started) * 1000
+    _stats["files_total"] += 1
+    _stats["parse_ms_total"] += elapsed_ms
+    _stats["parse_ms_max"] = max(_stats["parse_ms_max"], elapsed_ms)
+    _stats["parse_ms_last"] = round(elapsed_ms, 1)
+    return text
+
+
+async def extract_upload_text(*, path: Path, filename: str) -> str:
+    """
+    extract_text_in_pool for request handlers: parse errors become HTTP errors.
+
+    Raises:
+        HTTPException: 503 when the parser is busy, 422 on timeout, 400 for unreadable files
+    """
+    try:
+        return await extract_text_in_pool(path=path, filename=filename)
+    except ParserBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        )
+    except ParseTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"{e}. Try a shorter file or paste the text instead.",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def get_parser_stats() -> dict[str, Any]:
+    """Parser pool metrics for this worker process (queue depth, parse times, failures)."""
+    files = _stats["files_total"]
+    return {
+        "mode": "thread" if settings.parser.workers == 0 else "process",
+        "workers": settings.parser.workers,
+        "pool_started": _executor is not None,
+        "queue_depth": _queue_depth,
+        "max_queue": settings.parser.max_queue,
+        "timeout_seconds": settings.parser.timeout_seconds,
+        "max_pdf_pages": settings.parser.max_pdf_pages,
+        **{k: v for k, v in _stats.items() if k != "parse_ms_total"},
+        "parse_ms_max": round(_stats["parse_ms_max"], 1),
+        "parse_ms_avg": round(_stats["parse_ms_total"] / files, 1) if files else None,
+    }
@@ -1,24 +1,21 @@
-"""JD analysis services: file parsing and LLM keyword extraction."""
+"""JD analysis services: URL fetching and LLM keyword extraction (file parsing: parsing.py)."""
 
-import io
 import json
 import logging
 import re
-from pathlib import Path
 from typing import Any
 
-from docx import Document as DocxDocument
-from pypdf import PdfReader
 import httpx
 
 from app.config import settings
 from app.utils.llm_language import get_language_instruction
-from app.utils.openai_client import get_openai_client
+from app.utils.llm_cache import cached_chat_completion
 
 logger = logging.getLogger(__name__)
 
 ALLOWED_JD_EXTENSIONS = {".pdf", ".docx", ".txt"}
 MAX_JD_TEXT_LENGTH = 50_000  # truncate for LLM context
+JD_LLM_TIMEOUT = 60.0  # seconds; keyword and JD content extraction
 LINKEDIN_JD_URL_PATTERN = re.compile(
     r"^https?://(www\.)?linkedin\.com/jobs/view/\d+",
     re.IGNORECASE,
@@ -52,41 +49,6 @@ async def fetch_text_from_url(url: str) -> str:
     return text[:MAX_JD_TEXT_LENGTH] if text else ""
 
 
-def extract_text_from_file(*, content: bytes, filename: str) -> str:
-    """
-    Extract plain text from uploaded file (PDF, DOCX, TXT).
-
-    Args:
-        content: Raw file bytes.
-        filename: Original filename (used for extension).
-
-    Returns:
-        Extracted text.
-
-    Raises:
-        ValueError: If file type is not supported.
-    """
-    ext = Path(filename).suffix.lower()
-    if ext not in ALLOWED_JD_EXTENSIONS:
-        raise ValueError(f"Unsupported file type: {ext}. Allowed: {ALLOWED_JD_EXTENSIONS}")
-
-    if ext == ".pdf":
-        reader = PdfReader(io.BytesIO(content))
-        parts = []
-        for page in reader.pages:
-            parts.append(page.extract_text() or "")
-        return "\n".join(parts).strip()
-
-    if ext == ".docx":
-        doc = DocxDocument(io.BytesIO(content))
-        return "\n".join(p.text for p in doc.paragraphs).strip()
-
-    if ext == ".txt":
-        return content.decode("utf-8", errors="replace").strip()
-
-    raise ValueError(f"Unsupported file type: {ext}")
-
-
 def _normalize_item_to_name(item: Any) -> str:
     """From extracted_keywords entry (string or object with name/term), return display name."""
     if isinstance(item, str):
@@ -129,9 +91,11 @@ async def extract_keywords_with_llm(
     text: str,
     preferred_language: str | None = None,
     user_profile: dict[str, Any] | None = None,
+    cache: bool = True,
 ) -> dict[str, Any]:
     """
     Use OpenAI to extract structured job requirements from JD text.
+    Identical JD/profile/language inputs are served from the LLM cache unless cache=False.
 
     Returns a dict with:
     - skills, domains, keywords, requirements_summary (as before)
@@ -163,7 +127,6 @@ async def extract_keywords_with_llm(
         "All text fields (skill names, domain names, keyword terms, constraints, notes, descriptions, context, requirements_summary) "
         "must be in that language. If the job description is in a different language, translate the extracted information to the user's preferred language. "
     )
-    client = get_openai_client()
     prompt = f"""Analyze the following job description and extract structured information.
 
 {lang_instruction}
@@ -204,13 +167,13 @@ Job description:
     prompt += truncated
 
     try:
-        response = await client.chat.completions.create(
-            model=settings.openai.model,
+        content = await cached_chat_completion(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
             max_tokens=settings.openai.max_tokens,
+            timeout=JD_LLM_TIMEOUT,
+            cache=cache,
         )
-        content = response.choices[0].message.content
         if not content:
             return {"skills": [], "domains": [], "keywords": []}
 
@@ -305,7 +268,7 @@ Job description:
         return {"skills": [], "domains": [], "keywords": [], "error": str(e)}
 
 
-async def extract_jd_content_with_llm(raw_text: str, source: str = "generic") -> str:
+async def extract_jd_content_with_llm(raw_text: str, source: str = "generic", cache: bool = True) -> str:
     """
     Use LLM to extract or clean job description content from raw text.
 
@@ -313,6 +276,7 @@ async def extract_jd_content_with_llm(raw_text: str, source: str = "generic") ->
     - For file: raw text from PDF/DOCX/TXT may contain only JD or JD + other content; LLM isolates the JD.
 
     Returns cleaned JD text. If LLM is unavailable or fails, returns raw_text (truncated).
+    Repeated inputs are served from the LLM cache unless cache=False.
     """
     if not raw_text or not raw_text.strip():
         return raw_text
@@ -349,19 +313,18 @@ async def extract_jd_content_with_llm(raw_text: str, source: str = "generic") ->
         user = f"Extract the job description from this document:\n\n{truncated}"
 
     try:
-        client = get_openai_client()
-        response = await client.chat.completions.create(
-            model=settings.openai.model,
+        content = await cached_chat_completion(
             messages=[
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
             ],
             temperature=0.2,
             max_tokens=settings.openai.max_tokens,
+            timeout=JD_LLM_TIMEOUT,
+            cache=cache,
         )
-        content = response.choices[0].message.content
-        if content and content.strip():
-            return content.strip()
+        if content:
+            return content
         return truncated.strip()
     except Exception as e:
         logger.exception("LLM JD extraction failed: %s", e)
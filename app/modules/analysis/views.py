@@ -1,5 +1,6 @@
 """JD analysis API views."""
 
+import os
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -14,16 +15,17 @@ from app.modules.analysis.models import (
     ExtractTextResponse,
 )
 from app.modules.preparation.models import Preparation, PreparationStatus
+from app.modules.analysis.parsing import extract_upload_text
 from app.modules.analysis.services import (
     ALLOWED_JD_EXTENSIONS,
     LINKEDIN_JD_URL_PATTERN,
     extract_jd_content_with_llm,
     extract_keywords_with_llm,
-    extract_text_from_file,
     fetch_text_from_url,
 )
 from app.utils.auth import CurrentUser
-from app.utils.db import DBSession
+from app.utils.db import DBSession, release_connection
+from app.utils.uploads import upload_to_temp_file
 
 router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 
@@ -37,6 +39,7 @@ def _ensure_jd_dir() -> Path:
 
 @router.post("/extract-text", response_model=ExtractTextResponse)
 async def extract_jd_text(
+    session: DBSession,
     current_user: CurrentUser,
     text: str | None = Form(None),
     file: UploadFile | None = File(None),
@@ -46,6 +49,8 @@ async def extract_jd_text(
     Chỉ trích xuất nội dung JD (text) từ: dán text, file (PDF/DOCX/TXT), hoặc LinkedIn job URL.
     Không tạo preparation hay lưu analysis. Dùng cho form đóng góp (contribution).
     """
+    # Only the auth lookup touches the DB; release its connection before fetching/LLM calls
+    await release_connection(session)
     raw_text = ""
 
     if linkedin_url and linkedin_url.strip():
@@ -68,8 +73,8 @@ async def extract_jd_text(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Allowed file types: {', '.join(ALLOWED_JD_EXTENSIONS)}",
             )
-        content = await file.read()
-        raw_text = extract_text_from_file(content=content, filename=file.filename)
+        async with upload_to_temp_file(file, max_bytes=settings.storage.max_jd_size_bytes) as upload_path:
+            raw_text = await extract_upload_text(path=upload_path, filename=file.filename)
         if not raw_text.strip():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -99,6 +104,8 @@ async def submit_jd_analysis(
     Submit a job description via pasted text, file upload, or LinkedIn job URL.
     AI extracts keywords (skills, domains).
     """
+    # Release the auth lookup's connection; the DB is only written after fetching/LLM calls
+    await release_connection(session)
     raw_text = ""
     file_path = None
 
@@ -126,20 +133,22 @@ async def submit_jd_analysis(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Allowed file types: {', '.join(ALLOWED_JD_EXTENSIONS)}",
             )
-        content = await file.read()
-        raw_text = extract_text_from_file(content=content, filename=file.filename)
-        if not raw_text.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not extract text from the uploaded file",
-            )
-        # Save file for reference
         jd_dir = _ensure_jd_dir()
         user_dir = jd_dir / str(current_user.id)
         user_dir.mkdir(parents=True, exist_ok=True)
-        safe_name = f"{uuid.uuid4().hex}_{Path(file.filename).name}"
-        save_path = user_dir / safe_name
-        save_path.write_bytes(content)
+        async with upload_to_temp_file(
+            file, max_bytes=settings.storage.max_jd_size_bytes, directory=user_dir
+        ) as upload_path:
+            raw_text = await extract_upload_text(path=upload_path, filename=file.filename)
+            if not raw_text.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Could not extract text from the uploaded file",
+                )
+            # Keep the file for reference (rename within the same directory, no copy)
+            safe_name = f"{uuid.uuid4().hex}_{Path(file.filename).name}"
+            save_path = user_dir / safe_name
+            os.replace(upload_path, save_path)
         file_path = str(save_path.relative_to(Path(settings.storage.upload_dir)))
     elif text and text.strip():
         raw_text = text.strip()
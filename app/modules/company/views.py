@@ -5,14 +5,14 @@ from sqlmodel import col, select
 
 from app.modules.company.models import Company, CompanyCreate, CompanyResponse
 from app.utils.auth import CurrentUser
-from app.utils.db import DBSession
+from app.utils.db import DBSession, ReadDBSession
 
 router = APIRouter(prefix="/api/companies", tags=["companies"])
 
 
 @router.get("", response_model=list[CompanyResponse])
 async def list_companies(
-    session: DBSession,
+    session: ReadDBSession,
     current_user: CurrentUser,
     q: str | None = Query(None, description="Search by name"),
     limit: int = Query(50, ge=1, le=100),
@@ -53,7 +53,7 @@ async def create_company(
 @router.get("/{company_id}", response_model=CompanyResponse)
 async def get_company(
     company_id: int,
-    session: DBSession,
+    session: ReadDBSession,
     current_user: CurrentUser,
 ):
     """Lấy thông tin một công ty theo id."""
@@ -93,6 +93,42 @@ class ContributionWithCompanyResponse(ContributionResponse):
 
 
 class ContributionAdminListResponse(ContributionWithCompanyResponse):
-    """Contribution cho admin list: thêm email người đóng góp."""
+    """Contribution cho admin (chi tiết): thêm email người đóng góp."""
 
     user_email: str = ""
+
+
+class ContributionSummaryResponse(BaseModel):
+    """
+    Contribution rút gọn cho list: không có jd_content, question_info, candidate_responses
+    (lấy qua endpoint chi tiết). jd_excerpt và question_count được tính trong SQL.
+    """
+
+    id: int
+    user_id: int
+    company_id: int
+    preparation_id: int | None
+    job_position: str | None
+    status: str
+    approved_at: datetime | None
+    created_at: datetime
+    company_name: str = ""
+    jd_excerpt: str = ""
+    question_count: int = 0
+
+    model_config = {"from_attributes": True}
+
+
+class ContributionAdminSummaryResponse(ContributionSummaryResponse):
+    """Contribution rút gọn cho admin list: thêm email người đóng góp."""
+
+    user_email: str = ""
+
+
+class ContributionAdminPageResponse(BaseModel):
+    """Một trang admin list contribution; next_cursor = None ở trang cuối."""
+
+    page: int
+    page_size: int
+    next_cursor: str | None = None
+    items: list[ContributionAdminSummaryResponse]
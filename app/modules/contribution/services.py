@@ -0,0 +1,70 @@
+"""
+Truy vấn đóng góp cho list / chi tiết: một câu SELECT join công ty / người đóng góp,
+chỉ lấy cột cần cho response.
+"""
+
+from sqlalchemy import case, func, literal
+from sqlmodel import select
+
+from app.modules.account.models import User
+from app.modules.company.models import Company
+from app.modules.contribution.models import (
+    Contribution,
+    ContributionResponse,
+    ContributionSummaryResponse,
+)
+
+# Số ký tự JD trả về trong list (phần còn lại không rời khỏi DB)
+JD_EXCERPT_CHARS = 200
+
+# Cột của Contribution mà ContributionResponse cần (không tải approved_by_admin_id, ...)
+_DETAIL_COLUMNS = tuple(getattr(Contribution, name) for name in ContributionResponse.model_fields)
+# Cột nhẹ cho list: bỏ jd_content, question_info, candidate_responses
+_SUMMARY_COLUMNS = tuple(
+    getattr(Contribution, name)
+    for name in ContributionSummaryResponse.model_fields
+    if name in Contribution.model_fields
+)
+
+
+def _with_names(columns, with_user_email: bool):
+    stmt = (
+        select(*columns, func.coalesce(Company.name, literal("")).label("company_name"))
+        .select_from(Contribution)
+        .outerjoin(Company, Company.id == Contribution.company_id)
+    )
+    if with_user_email:
+        stmt = stmt.add_columns(func.coalesce(User.email, literal("")).label("user_email")).outerjoin(
+            User, User.id == Contribution.user_id
+        )
+    return stmt
+
+
+def contribution_detail_statement(*, with_user_email: bool = False):
+    """
+    select các cột của ContributionResponse + company_name (+ user_email) bằng LEFT JOIN.
+
+    Dòng trả về validate thẳng được bằng ContributionWithCompanyResponse /
+    ContributionAdminListResponse.model_validate(row) (from_attributes).
+    Công ty / user đã bị xoá cho chuỗi rỗng, như trước.
+    """
+    return _with_names(_DETAIL_COLUMNS, with_user_email)
+
+
+def contribution_summary_statement(*, with_user_email: bool = False):
+    """
+    Như contribution_detail_statement nhưng cho list: không đọc các cột text/JSON lớn,
+    chỉ trả jd_excerpt (JD_EXCERPT_CHARS ký tự đầu) và question_count.
+
+    Dòng trả về validate bằng ContributionSummaryResponse / ContributionAdminSummaryResponse.
+    """
+    return _with_names(_SUMMARY_COLUMNS, with_user_email).add_columns(
+        func.left(Contribution.jd_content, JD_EXCERPT_CHARS).label("jd_excerpt"),
+        case(
+            (
+                func.json_typeof(Contribution.question_info) == "array",
+                func.json_array_length(Contribution.question_info),
+            ),
+            else_=0,
+        ).label("question_count"),
+    )
@@ -1,15 +1,19 @@
 """Contribution API: tạo và liệt kê đóng góp của user."""
 
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlmodel import select
 
 from app.modules.company.models import Company
 from app.modules.contribution.models import (
     Contribution,
     ContributionCreate,
     ContributionResponse,
+    ContributionSummaryResponse,
     ContributionWithCompanyResponse,
 )
+from app.modules.contribution.services import (
+    contribution_detail_statement,
+    contribution_summary_statement,
+)
 from app.modules.preparation.models import Preparation
 from app.utils.auth import CurrentUser
 from app.utils.db import DBSession
@@ -58,7 +62,7 @@ async def create_contribution(
     return ContributionResponse.model_validate(contribution)
 
 
-@router.get("", response_model=list[ContributionWithCompanyResponse])
+@router.get("", response_model=list[ContributionSummaryResponse])
 async def list_my_contributions(
     session: DBSession,
     current_user: CurrentUser,
@@ -67,40 +71,36 @@ async def list_my_contributions(
 ):
     """
     Danh sách đóng góp của user (mới nhất trước).
-    Có thể lọc theo preparation_id. Trả về kèm tên công ty.
+    Có thể lọc theo preparation_id. Trả về bản rút gọn kèm tên công ty;
+    nội dung đầy đủ lấy qua GET /{contribution_id}.
     """
     stmt = (
-        select(Contribution)
+        contribution_summary_statement()
         .where(Contribution.user_id == current_user.id)
-        .order_by(Contribution.created_at.desc())
+        .order_by(Contribution.created_at.desc(), Contribution.id.desc())
         .limit(limit)
     )
     if preparation_id is not None:
         stmt = stmt.where(Contribution.preparation_id == preparation_id)
-    result = await session.exec(stmt)
-    items = result.all()
-    out = []
-    for c in items:
-        company = await session.get(Company, c.company_id)
-        data = ContributionWithCompanyResponse(
-            **ContributionResponse.model_validate(c).model_dump(),
-            company_name=company.name if company else "",
-        )
-        out.append(data)
-    return out
+    result = await session.execute(stmt)
+    return [ContributionSummaryResponse.model_validate(row) for row in result.all()]
 
 
-@router.get("/{contribution_id}", response_model=ContributionResponse)
+@router.get("/{contribution_id}", response_model=ContributionWithCompanyResponse)
 async def get_contribution(
     contribution_id: int,
     session: DBSession,
     current_user: CurrentUser,
 ):
-    """Lấy chi tiết một contribution (chỉ của user)."""
-    contribution = await session.get(Contribution, contribution_id)
-    if not contribution or contribution.user_id != current_user.id:
+    """Lấy chi tiết một contribution (chỉ của user), kèm tên công ty."""
+    stmt = contribution_detail_statement().where(
+        Contribution.id == contribution_id,
+        Contribution.user_id == current_user.id,
+    )
+    row = (await session.execute(stmt)).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contribution not found",
         )
-    return ContributionResponse.model_validate(contribution)
+    return ContributionWithCompanyResponse.model_validate(row)
@@ -0,0 +1,318 @@
+"""Background jobs của preparation: các bước gọi LLM lâu (phân tích JD, sinh trước câu hỏi memory scan, báo cáo memory scan, tạo roadmap)."""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import select
+
+from app.config import settings
+from app.modules.account.models import User
+from app.modules.analysis.models import AnalysisSubmitResponse, JDAnalysis
+from app.modules.analysis.services import (
+    extract_jd_content_with_llm,
+    extract_keywords_with_llm,
+    fetch_text_from_url,
+    normalize_extracted_keyword_names,
+)
+from app.modules.preparation.models import MemoryScanReportStatus, Preparation, PreparationStatus
+from app.modules.preparation.services import (
+    evaluate_memory_scan_with_llm,
+    generate_roadmap_items,
+    get_or_generate_memory_scan_questions,
+    roadmap_claim_is_stale,
+    save_roadmap,
+)
+from app.modules.questions.models import AssessmentSession, UserQuestionAnswer
+from app.models.job import Job
+from app.utils.db import database, release_connection
+from app.utils.jobs import (
+    PermanentJobError,
+    enqueue_job,
+    register_job_failure_handler,
+    register_job_handler,
+)
+
+logger = logging.getLogger(__name__)
+
+SUBMIT_JD_JOB = "preparation.submit_jd"
+PREGENERATE_MEMORY_SCAN_JOB = "preparation.pregenerate_memory_scan"
+MEMORY_SCAN_REPORT_JOB = "preparation.memory_scan_report"
+CREATE_ROADMAP_JOB = "preparation.create_roadmap"
+
+# Khoảng thời gian poll khi chờ stream request đang sinh roadmap
+ROADMAP_CLAIM_WAIT_POLL_INTERVAL = 2.0
+
+
+def build_user_profile(user: User) -> dict[str, Any]:
+    """Profile rút gọn của user để so khớp với JD (profile_fit)."""
+    user_profile: dict[str, Any] = {}
+    if user.role:
+        user_profile["role"] = user.role
+    if user.experience_years is not None:
+        user_profile["experience_years"] = user.experience_years
+    if user.skills_summary:
+        user_profile["skills_summary"] = user.skills_summary
+    if user.current_company:
+        user_profile["current_company"] = user.current_company
+    return user_profile
+
+
+async def _load_preparation_and_user(session, job: Job) -> tuple[Preparation, User]:
+    prep = await session.get(Preparation, job.preparation_id)
+    if not prep or prep.user_id != job.user_id:
+        raise PermanentJobError("Preparation not found")
+    user = await session.get(User, job.user_id)
+    if not user:
+        raise PermanentJobError("User not found")
+    return prep, user
+
+
+def _roadmap_claim_active(prep: Preparation) -> bool:
+    """Một stream request đang giữ claim sinh roadmap (roadmap_id đã gán, chưa sinh xong, chưa quá hạn)."""
+    return (
+        prep.roadmap_id is not None
+        and prep.roadmap_generation_started_at is not None
+        and not roadmap_claim_is_stale(prep)
+    )
+
+
+@register_job_handler(SUBMIT_JD_JOB)
+async def run_submit_jd(job: Job) -> dict[str, Any]:
+    """
+    Bước 1 (nền): lấy nội dung JD (fetch LinkedIn / làm sạch file bằng LLM), trích keywords, lưu JDAnalysis.
+    Payload: {"linkedin_url"} hoặc {"raw_text", "source": "file" | "text", "file_path"?}.
+    """
+    payload = job.payload or {}
+    async with database.session_maker() as session:
+        prep, user = await _load_preparation_and_user(session, job)
+        if prep.status != PreparationStatus.JD_PENDING:
+            raise PermanentJobError("Preparation already has JD. Use a new preparation to submit another JD.")
+        await release_connection(session)
+
+        linkedin_url = payload.get("linkedin_url")
+        if linkedin_url:
+            raw_text = await fetch_text_from_url(linkedin_url)
+            if not raw_text or len(raw_text) < 100:
+                raise PermanentJobError(
+                    "Could not extract enough text from the URL. Try pasting the JD text instead."
+                )
+            raw_text = await extract_jd_content_with_llm(raw_text, source="linkedin")
+        elif payload.get("source") == "file":
+            raw_text = await extract_jd_content_with_llm(payload.get("raw_text") or "", source="file")
+        else:
+            raw_text = payload.get("raw_text") or ""
+
+        user_profile = build_user_profile(user)
+        keywords = await extract_keywords_with_llm(
+            raw_text,
+            preferred_language=user.preferred_language,
+            user_profile=user_profile if user_profile else None,
+        )
+
+        # Khoá lại preparation trước khi ghi: job khác có thể đã nộp JD trong lúc gọi LLM
+        await session.refresh(prep, with_for_update=True)
+        if prep.status != PreparationStatus.JD_PENDING:
+            raise PermanentJobError("Preparation already has JD. Use a new preparation to submit another JD.")
+        jd = await session.get(JDAnalysis, prep.jd_analysis_id)
+        if not jd:
+            raise PermanentJobError("JD analysis record not found")
+        jd.raw_text = raw_text
+        jd.file_path = payload.get("file_path")
+        jd.extracted_keywords = keywords
+        prep.status = PreparationStatus.MEMORY_SCAN_READY
+        prep.updated_at = datetime.utcnow()
+        session.add(jd)
+        session.add(prep)
+        if settings.jobs.pregenerate_memory_scan:
+            # User mở memory scan ngay sau bước này: sinh trước vùng kiến thức + câu hỏi ở nền
+            await enqueue_job(
+                session,
+                kind=PREGENERATE_MEMORY_SCAN_JOB,
+                user_id=user.id,
+                preparation_id=prep.id,
+                dedupe=True,
+            )
+        await session.commit()
+
+        return AnalysisSubmitResponse(
+            id=jd.id,
+            raw_text=jd.raw_text,
+            extracted_keywords=jd.extracted_keywords or {},
+            created_at=jd.created_at,
+            preparation_id=prep.id,
+        ).model_dump(mode="json")
+
+
+@register_job_handler(PREGENERATE_MEMORY_SCAN_JOB)
+async def run_pregenerate_memory_scan(job: Job) -> dict[str, Any]:
+    """
+    Sinh trước vùng kiến thức + bộ câu hỏi memory scan ngay sau khi JD được lưu.
+    GET memory-scan-questions đến sau sẽ đọc luôn kết quả, hoặc chờ lần sinh đang chạy (không sinh lần hai).
+    """
+    async with database.session_maker() as session:
+        prep, user = await _load_preparation_and_user(session, job)
+        if prep.memory_scan_questions:
+            return {"preparation_id": prep.id, "questions": len(prep.memory_scan_questions)}
+        jd = await session.get(JDAnalysis, prep.jd_analysis_id)
+        if not jd or not jd.extracted_keywords:
+            raise PermanentJobError("JD analysis not found")
+
+    questions = await get_or_generate_memory_scan_questions(
+        preparation_id=prep.id,
+        jd_analysis=jd,
+        user_role=user.role,
+        user_experience_years=user.experience_years,
+        preferred_language=user.preferred_language,
+    )
+    return {"preparation_id": prep.id, "questions": len(questions)}
+
+
+async def _save_memory_scan_report(session, preparation_id: int, session_id: int, **values: Any) -> None:
+    """Ghi trạng thái báo cáo vào kết quả của đúng lần nộp này (user có thể đã làm lại scan trong lúc chờ)."""
+    prep = await session.get(Preparation, preparation_id, with_for_update=True, populate_existing=True)
+    last_result = (prep.last_memory_scan_result if prep else None) or {}
+    if last_result.get("session_id") != session_id:
+        logger.info("Memory scan session %s superseded; report not saved to preparation", session_id)
+        return
+
+    prep.last_memory_scan_result = {**last_result, **values}
+    prep.updated_at = datetime.utcnow()
+    session.add(prep)
+    await session.commit()
+
+
+@register_job_handler(MEMORY_SCAN_REPORT_JOB)
+async def run_memory_scan_report(job: Job) -> dict[str, Any]:
+    """
+    Bước 2 (nền): báo cáo LLM cho một lần nộp memory scan; điểm + knowledge_assessment đã được lưu lúc nộp.
+    Payload: {"session_id", "answers", "result_flags", "score_percent", "correct_count", "total_questions",
+    "knowledge_assessment"}.
+    """
+    payload = job.payload or {}
+    session_id = payload["session_id"]
+    knowledge_assessment: list[dict] = payload.get("knowledge_assessment") or []
+
+    async with database.session_maker() as session:
+        prep, user = await _load_preparation_and_user(session, job)
+        jd = await session.get(JDAnalysis, prep.jd_analysis_id)
+        await release_connection(session)
+
+        jd_summary = ""
+        if jd:
+            kw = jd.extracted_keywords or {}
+            skills, domains, keywords = normalize_extracted_keyword_names(kw)
+            jd_summary = f"Skills: {skills}. Domains: {domains}. Keywords: {keywords}."
+            if kw.get("requirements_summary"):
+                jd_summary += f" Key requirements: {kw.get('requirements_summary')}"
+
+        llm_report = await evaluate_memory_scan_with_llm(
+            memory_scan_questions=prep.memory_scan_questions,
+            answers=payload.get("answers") or [],
+            result_flags=payload.get("result_flags") or [],
+            score_percent=payload.get("score_percent", 0.0),
+            correct_count=payload.get("correct_count", 0),
+            total_questions=payload.get("total_questions", 0),
+            knowledge_assessment=knowledge_assessment,
+            jd_summary=jd_summary,
+            preferred_language=user.preferred_language,
+        )
+
+        if not llm_report:
+            # LLM lỗi / quá thời gian (evaluate trả về rỗng): thử lại; hết lượt thì fail_memory_scan_report ghi failed
+            if not settings.openai.api_key:
+                raise PermanentJobError("OpenAI API key is not configured")
+            raise RuntimeError("LLM returned an empty memory scan report")
+
+        await _save_memory_scan_report(
+            session,
+            job.preparation_id,
+            session_id,
+            llm_report=llm_report,
+            llm_report_status=MemoryScanReportStatus.DONE,
+        )
+        return {"session_id": session_id, "llm_report": llm_report}
+
+
+@register_job_failure_handler(MEMORY_SCAN_REPORT_JOB)
+async def fail_memory_scan_report(job: Job, error: str) -> None:
+    """Báo cáo LLM không sinh được (hết lượt thử, quá thời gian, lỗi vĩnh viễn): ghi failed để client ngừng poll."""
+    session_id = (job.payload or {}).get("session_id")
+    async with database.session_maker() as session:
+        await _save_memory_scan_report(
+            session,
+            job.preparation_id,
+            session_id,
+            llm_report_status=MemoryScanReportStatus.FAILED,
+        )
+
+
+@register_job_handler(CREATE_ROADMAP_JOB)
+async def run_create_roadmap(job: Job) -> dict[str, Any]:
+    """Bước 3 (nền): tạo roadmap từ lần memory scan mới nhất."""
+    async with database.session_maker() as session:
+        prep, user = await _load_preparation_and_user(session, job)
+        # Stream request đang sinh roadmap: chờ nó xong (hoặc trả claim / quá hạn) thay vì trả roadmap dở dang
+        while _roadmap_claim_active(prep):
+            await release_connection(session)
+            await asyncio.sleep(ROADMAP_CLAIM_WAIT_POLL_INTERVAL)
+            await session.refresh(prep)
+        if prep.roadmap_id and not roadmap_claim_is_stale(prep):
+            return {"roadmap_id": prep.roadmap_id, "preparation_id": prep.id}
+        if not prep.memory_scan_questions:
+            raise PermanentJobError("No memory scan data. Complete memory scan first.")
+
+        result = await session.exec(
+            select(AssessmentSession)
+            .where(AssessmentSession.preparation_id == prep.id)
+            .where(AssessmentSession.session_type == "memory_scan")
+            .order_by(AssessmentSession.created_at.desc())
+            .limit(1)
+        )
+        last_session = result.first()
+        if not last_session:
+            raise PermanentJobError("No memory scan session found.")
+        ans_result = await session.exec(
+            select(UserQuestionAnswer)
+            .where(UserQuestionAnswer.session_id == last_session.id)
+            .order_by(UserQuestionAnswer.id)
+        )
+        result_flags = [a.is_correct for a in ans_result.all()]
+
+        jd = await session.get(JDAnalysis, prep.jd_analysis_id)
+        if not jd:
+            raise PermanentJobError("JD analysis not found")
+        await release_connection(session)
+
+        _, items = await generate_roadmap_items(
+            jd_analysis=jd,
+            memory_scan_questions=prep.memory_scan_questions,
+            answer_results=result_flags,
+            user_role=user.role,
+            user_experience_years=user.experience_years,
+            preferred_language=user.preferred_language,
+            preparation_knowledge_areas=prep.knowledge_areas or None,
+        )
+
+        # Khoá lại preparation trước khi ghi: roadmap có thể đã được tạo trong lúc gọi LLM
+        await session.refresh(prep, with_for_update=True)
+        if _roadmap_claim_active(prep):
+            # Stream request claim trong lúc gọi LLM: lần thử lại sẽ chờ nó sinh xong
+            raise RuntimeError("Roadmap is being generated by a streaming request")
+        if prep.roadmap_id and not roadmap_claim_is_stale(prep):
+            return {"roadmap_id": prep.roadmap_id, "preparation_id": prep.id}
+        roadmap = await save_roadmap(
+            session,
+            preparation_id=prep.id,
+            user_id=user.id,
+            jd_analysis=jd,
+            items=items,
+        )
+        prep.roadmap_id = roadmap.id
+        prep.roadmap_generation_started_at = None
+        prep.status = PreparationStatus.ROADMAP_READY
+        prep.updated_at = datetime.utcnow()
+        session.add(prep)
+        await session.commit()
+        return {"roadmap_id": roadmap.id, "preparation_id": prep.id}
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any
 
 from pydantic import BaseModel
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Column, Field as SQLField, JSON, SQLModel
 
 
@@ -39,9 +40,15 @@ class Preparation(SQLModel, table=True):
         sa_column=Column(JSON), default_factory=list
     )
 
+    # Claim sinh bộ câu hỏi memory scan (single-flight giữa các worker); NULL khi không có ai đang sinh
+    memory_scan_generation_started_at: datetime | None = SQLField(default=None)
+
     # Bước 3: Roadmap tạo sau khi user chọn "Tiếp tục tạo roadmap"
     roadmap_id: int | None = SQLField(default=None, foreign_key="roadmaps.id", index=True)
 
+    # Claim sinh roadmap streaming (roadmap_id đã gán, đang sinh item); NULL khi đã xong hoặc không ai đang sinh
+    roadmap_generation_started_at: datetime | None = SQLField(default=None)
+
     # Kết quả memory scan lần cuối (để user xem lại và quyết định tạo roadmap hay làm lại)
     last_memory_scan_result: dict[str, Any] | None = SQLField(
         sa_column=Column(JSON), default=None
@@ -56,6 +63,34 @@ class Preparation(SQLModel, table=True):
     updated_at: datetime = SQLField(default_factory=datetime.utcnow)
 
 
+class SelfCheckSetStatus:
+    """Trạng thái bộ câu hỏi self-check."""
+
+    GENERATING = "generating"  # Đã claim, đang gọi LLM
+    READY = "ready"
+    FAILED = "failed"  # LLM lỗi / trả về rỗng; request sau sẽ claim lại
+
+
+class SelfCheckSet(SQLModel, table=True):
+    """
+    Bộ câu hỏi self-check đã sinh cho một preparation theo ngôn ngữ.
+    GET self-check-questions đọc từ đây; chỉ sinh lại khi ?regenerate=true.
+    Unique (preparation_id, language) dùng làm claim (INSERT ... ON CONFLICT) để mỗi bộ chỉ sinh một lần.
+    """
+
+    __tablename__ = "self_check_sets"
+    __table_args__ = (UniqueConstraint("preparation_id", "language", name="uq_self_check_sets_prep_lang"),)
+
+    id: int | None = SQLField(default=None, primary_key=True)
+    preparation_id: int = SQLField(foreign_key="preparations.id", index=True)
+    language: str = SQLField(max_length=10)
+    status: str = SQLField(max_length=20, default=SelfCheckSetStatus.GENERATING)
+    questions: list[dict[str, Any]] = SQLField(sa_column=Column(JSON), default_factory=list)
+    claimed_at: datetime | None = SQLField(default=None)
+    created_at: datetime = SQLField(default_factory=datetime.utcnow)
+    updated_at: datetime = SQLField(default_factory=datetime.utcnow)
+
+
 class PreparationResponse(BaseModel):
     """Preparation cho API response."""
 
@@ -74,6 +109,22 @@ class PreparationResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PreparationSummaryResponse(BaseModel):
+    """
+    Preparation rút gọn cho list: không có knowledge_areas / last_memory_scan_result
+    (lấy qua GET /{preparation_id}).
+    """
+
+    id: int
+    user_id: int
+    jd_analysis_id: int
+    status: str
+    roadmap_id: int | None
+    created_at: datetime
+    company_name: str | None = None
+    job_title: str | None = None
+
+
 class MemoryScanQuestionDisplay(BaseModel):
     """Một câu hỏi memory scan (không có correct_answer khi trả về client)."""
 
@@ -94,3 +145,26 @@ class MemoryScanSubmitRequest(BaseModel):
     """Request nộp đáp án memory scan."""
 
     answers: list[dict[str, Any]]  # [ {"question_id": "0", "selected_answer": "A" }, ... ]
+
+
+class MemoryScanReportStatus:
+    """Trạng thái báo cáo LLM trong last_memory_scan_result (sinh nền sau khi nộp)."""
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"  # Job hết lượt thử / quá thời gian / LLM trả về rỗng; client ngừng poll
+
+
+class MemoryScanSubmitResponse(BaseModel):
+    """Kết quả nộp memory scan: điểm + đánh giá theo vùng kiến thức; llm_report sinh nền (poll GET /{id})."""
+
+    session_id: int
+    score_percent: float
+    total_questions: int
+    correct_count: int
+    preparation_id: int
+    roadmap_ready: bool = False
+    knowledge_assessment: list[dict[str, Any]] = []
+    llm_report: str | None = None
+    llm_report_status: str = MemoryScanReportStatus.PENDING
+    llm_report_job_id: int | None = None
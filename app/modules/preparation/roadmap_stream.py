@@ -0,0 +1,324 @@
+"""
+Sinh roadmap dạng streaming (SSE): mỗi DailyTask được lưu và gửi cho client ngay khi xong.
+
+Việc sinh chạy trong một asyncio task riêng (không gắn với connection của client), nên client
+ngắt kết nối giữa chừng thì roadmap vẫn được tạo đủ. Các request stream khác cùng preparation
+trên cùng worker sẽ replay các event đã có rồi nhận tiếp event mới (không sinh lần hai).
+
+Event SSE:
+- start: {"roadmap_id", "knowledge_areas"}
+- delta: {"index", "title", "delta"}  — token mới của item index
+- task:  DailyTaskResponse            — item đã lưu vào DB
+- done:  {"roadmap_id"}
+- error: {"detail"}
+
+Khi roadmap đang được sinh bởi job nền (POST /roadmap), stream chờ job xong rồi replay từ DB
+thay vì gọi LLM lần hai.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import select
+
+from app.config import settings
+from app.modules.account.models import User
+from app.modules.analysis.models import JDAnalysis
+from app.modules.preparation.models import Preparation, PreparationStatus
+from app.modules.preparation.services import (
+    _fallback_roadmap_item_markdown,
+    _roadmap_item_semaphore,
+    extract_markdown_references,
+    resolve_roadmap_knowledge_areas,
+    roadmap_claim_is_stale,
+    save_roadmap,
+    stream_roadmap_item_markdown,
+)
+from app.modules.questions.models import AssessmentSession, UserQuestionAnswer
+from app.modules.roadmap.models import DailyTask, DailyTaskResponse
+from app.models.job import Job, JobStatus
+from app.utils.db import database, release_connection
+
+logger = logging.getLogger(__name__)
+
+# Khoảng thời gian poll DB khi roadmap đang được sinh ở worker khác
+_DB_POLL_INTERVAL = 1.0
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Một event SSE (data là JSON trên một dòng)."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class RoadmapBroadcast:
+    """Các event của một lần sinh roadmap; subscriber đến muộn được replay từ đầu."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, Any]] = []
+        self.finished = False
+        self._subscribers: set[asyncio.Queue] = set()
+
+    def publish(self, event: str, data: Any) -> None:
+        self.events.append((event, data))
+        for queue in self._subscribers:
+            queue.put_nowait((event, data))
+
+    def finish(self) -> None:
+        self.finished = True
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+
+    async def follow(self) -> AsyncIterator[tuple[str, Any]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        replay = list(self.events)
+        finished = self.finished
+        self._subscribers.add(queue)
+        try:
+            for item in replay:
+                yield item
+            if finished:
+                return
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            self._subscribers.discard(queue)
+
+
+# preparation_id -> lần sinh đang chạy trên worker này
+_active_streams: dict[int, RoadmapBroadcast] = {}
+# Giữ reference tới task nền để không bị garbage-collect giữa chừng
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _save_task(roadmap_id: int, index: int, title: str, content: str) -> DailyTaskResponse:
+    refs = extract_markdown_references(content)
+    async with database.session_maker() as session:
+        task = DailyTask(
+            roadmap_id=roadmap_id,
+            day_index=index,
+            title=title,
+            content=content,
+            content_type="markdown",
+            sort_order=index,
+            meta={"references": refs} if refs else {},
+        )
+        session.add(task)
+        await session.commit()
+        return DailyTaskResponse.model_validate(task)
+
+
+async def _release_claim(preparation_id: int, roadmap_id: int) -> None:
+    """Sinh lỗi / bị huỷ giữa chừng: bỏ gán roadmap dở dang để user có thể tạo lại."""
+    try:
+        async with database.session_maker() as session:
+            prep = await session.get(Preparation, preparation_id, with_for_update=True)
+            if prep and prep.roadmap_id == roadmap_id and prep.status != PreparationStatus.ROADMAP_READY:
+                prep.roadmap_id = None
+                prep.roadmap_generation_started_at = None
+                prep.updated_at = datetime.utcnow()
+                session.add(prep)
+                await session.commit()
+    except Exception:
+        logger.exception("Could not release roadmap claim for preparation %s", preparation_id)
+
+
+async def _generate(preparation_id: int, user_id: int, broadcast: RoadmapBroadcast) -> None:
+    """Claim preparation (gán roadmap_id), sinh từng item song song và lưu ngay khi xong."""
+    roadmap_id: int | None = None
+    completed = False
+    try:
+        async with database.session_maker() as session:
+            prep = await session.get(Preparation, preparation_id, with_for_update=True)
+            if not prep or prep.user_id != user_id:
+                broadcast.publish("error", {"detail": "Preparation not found"})
+                return
+            if prep.roadmap_id and not roadmap_claim_is_stale(prep):
+                broadcast.publish("error", {"detail": "Roadmap already created for this preparation."})
+                return
+            user = await session.get(User, user_id)
+            jd = await session.get(JDAnalysis, prep.jd_analysis_id)
+            last_session = (
+                await session.exec(
+                    select(AssessmentSession)
+                    .where(AssessmentSession.preparation_id == preparation_id)
+                    .where(AssessmentSession.session_type == "memory_scan")
+                    .order_by(AssessmentSession.created_at.desc())
+                    .limit(1)
+                )
+            ).first()
+            if not jd or not last_session or not prep.memory_scan_questions:
+                broadcast.publish("error", {"detail": "No memory scan data. Complete memory scan first."})
+                return
+            answers = await session.exec(
+                select(UserQuestionAnswer)
+                .where(UserQuestionAnswer.session_id == last_session.id)
+                .order_by(UserQuestionAnswer.id)
+            )
+            result_flags = [a.is_correct for a in answers.all()]
+
+            # Gán roadmap rỗng cho preparation ngay (claim) để request/job khác không sinh lần hai.
+            # Claim cũ quá hạn (worker chết giữa chừng) thì bị thay bằng roadmap mới.
+            roadmap = await save_roadmap(
+                session,
+                preparation_id=preparation_id,
+                user_id=user_id,
+                jd_analysis=jd,
+                items=[],
+            )
+            prep.roadmap_id = roadmap.id
+            prep.roadmap_generation_started_at = datetime.utcnow()
+            prep.updated_at = datetime.utcnow()
+            session.add(prep)
+            await session.commit()
+            roadmap_id = roadmap.id
+
+        knowledge_areas, jd_skills_summary = await resolve_roadmap_knowledge_areas(
+            jd_analysis=jd,
+            memory_scan_questions=prep.memory_scan_questions,
+            answer_results=result_flags,
+            user_role=user.role if user else None,
+            user_experience_years=user.experience_years if user else None,
+            preferred_language=user.preferred_language if user else None,
+            preparation_knowledge_areas=prep.knowledge_areas or None,
+        )
+        areas = knowledge_areas[:10]
+        broadcast.publish("start", {"roadmap_id": roadmap_id, "knowledge_areas": areas})
+
+        request_semaphore = asyncio.Semaphore(settings.openai.roadmap_concurrency)
+
+        async def _generate_item(index: int, area: str) -> None:
+            async with request_semaphore, _roadmap_item_semaphore:
+                parts: list[str] = []
+                try:
+                    async for delta in stream_roadmap_item_markdown(
+                        knowledge_area=area,
+                        jd_skills_summary=jd_skills_summary,
+                        preferred_language=user.preferred_language if user else None,
+                    ):
+                        parts.append(delta)
+                        broadcast.publish("delta", {"index": index, "title": area, "delta": delta})
+                    content = "".join(parts).strip()
+                except Exception as e:
+                    logger.error("Roadmap item streaming failed for %r: %s", area, e)
+                    content = ""
+                if not content:
+                    content = _fallback_roadmap_item_markdown(area)
+            task = await _save_task(roadmap_id, index, area, content)
+            broadcast.publish("task", task.model_dump(mode="json"))
+
+        # TaskGroup: một item lỗi (vd. lưu DB) huỷ các item còn lại trước khi trả claim ở finally,
+        # để không còn task nào ghi DailyTask vào roadmap đã bị bỏ
+        try:
+            async with asyncio.TaskGroup() as group:
+                for i, area in enumerate(areas):
+                    group.create_task(_generate_item(i, area))
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0] from eg
+
+        async with database.session_maker() as session:
+            prep = await session.get(Preparation, preparation_id)
+            prep.status = PreparationStatus.ROADMAP_READY
+            prep.roadmap_generation_started_at = None
+            prep.updated_at = datetime.utcnow()
+            session.add(prep)
+            await session.commit()
+        completed = True
+        broadcast.publish("done", {"roadmap_id": roadmap_id})
+    except Exception as e:
+        logger.exception("Roadmap streaming generation failed for preparation %s", preparation_id)
+        broadcast.publish("error", {"detail": str(e) or "Roadmap generation failed"})
+    finally:
+        # Lỗi hoặc bị huỷ (CancelledError khi worker tắt): trả claim ngay; worker bị kill thì claim hết hạn sau TTL
+        if roadmap_id is not None and not completed:
+            await _release_claim(preparation_id, roadmap_id)
+        broadcast.finish()
+        _active_streams.pop(preparation_id, None)
+
+
+def start_roadmap_stream(preparation_id: int, user_id: int) -> RoadmapBroadcast:
+    """Bắt đầu sinh roadmap streaming (hoặc trả về lần sinh đang chạy trên worker này)."""
+    broadcast = _active_streams.get(preparation_id)
+    if broadcast is None:
+        broadcast = RoadmapBroadcast()
+        _active_streams[preparation_id] = broadcast
+        task = asyncio.create_task(_generate(preparation_id, user_id, broadcast))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    return broadcast
+
+
+def get_active_roadmap_stream(preparation_id: int) -> RoadmapBroadcast | None:
+    """Lần sinh streaming đang chạy trên worker này, nếu có."""
+    return _active_streams.get(preparation_id)
+
+
+async def follow_broadcast(broadcast: RoadmapBroadcast) -> AsyncIterator[str]:
+    """Chuyển event của broadcast thành SSE."""
+    async for event, data in broadcast.follow():
+        yield format_sse(event, data)
+
+
+async def replay_roadmap_job(preparation_id: int, job_id: int) -> AsyncIterator[str]:
+    """
+    Roadmap đang được sinh bởi job nền: chờ job xong rồi replay roadmap từ DB
+    (job chỉ lưu roadmap khi đã sinh đủ item, nên không có task nào để gửi trước đó).
+    """
+    while True:
+        async with database.session_maker() as session:
+            job = await session.get(Job, job_id)
+            prep = await session.get(Preparation, preparation_id)
+            await release_connection(session)
+        if not job or not prep:
+            yield format_sse("error", {"detail": "Roadmap generation failed. Please try again."})
+            return
+        if job.status == JobStatus.FAILED:
+            yield format_sse("error", {"detail": job.error or "Roadmap generation failed"})
+            return
+        if job.status == JobStatus.SUCCEEDED:
+            break
+        await asyncio.sleep(_DB_POLL_INTERVAL)
+    if not prep.roadmap_id:
+        yield format_sse("error", {"detail": "Roadmap generation failed. Please try again."})
+        return
+    async for event in replay_roadmap_from_db(preparation_id, prep.roadmap_id):
+        yield event
+
+
+async def replay_roadmap_from_db(preparation_id: int, roadmap_id: int) -> AsyncIterator[str]:
+    """
+    Roadmap đã có (hoặc đang được sinh ở worker khác): gửi các task đã lưu,
+    poll thêm task mới cho tới khi claim sinh roadmap kết thúc (sinh xong, bị trả hoặc quá hạn).
+    """
+    yield format_sse("start", {"roadmap_id": roadmap_id})
+    sent: set[int] = set()
+    while True:
+        async with database.session_maker() as session:
+            result = await session.exec(
+                select(DailyTask)
+                .where(DailyTask.roadmap_id == roadmap_id)
+                .order_by(DailyTask.sort_order, DailyTask.day_index)
+            )
+            tasks = [t for t in result.all() if t.id not in sent]
+            prep = await session.get(Preparation, preparation_id)
+            await release_connection(session)
+        for task in tasks:
+            sent.add(task.id)
+            yield format_sse("task", DailyTaskResponse.model_validate(task).model_dump(mode="json"))
+        if not prep or prep.roadmap_id != roadmap_id:
+            # Lần sinh lỗi và đã trả claim (hoặc bị claim lại): client gọi stream lại để sinh mới
+            yield format_sse("error", {"detail": "Roadmap generation failed. Please try again."})
+            return
+        if prep.roadmap_generation_started_at is None:
+            break
+        if roadmap_claim_is_stale(prep):
+            yield format_sse("error", {"detail": "Timed out waiting for roadmap generation"})
+            return
+        await asyncio.sleep(_DB_POLL_INTERVAL)
+    yield format_sse("done", {"roadmap_id": roadmap_id})
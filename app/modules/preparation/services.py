@@ -1,29 +1,68 @@
 """Preparation services: tạo bộ câu hỏi memory scan (warehouse hoặc AI), pathfinder sau khi có đáp án."""
 
+import asyncio
 import json
 import logging
 import re
+from collections.abc import AsyncIterator
 from copy import deepcopy
+from datetime import datetime, timedelta
 from typing import Any
 
-from sqlmodel import col, select
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
 
 from app.config import settings
 from app.utils.openai_client import get_openai_client
+from app.utils.llm_cache import cached_chat_completion, stream_chat_completion
 from app.modules.analysis.models import JDAnalysis
 from app.utils.llm_language import get_language_instruction
 from app.modules.analysis.services import normalize_extracted_keyword_names
-from app.modules.preparation.models import Preparation, PreparationStatus
+from app.modules.preparation.models import (
+    Preparation,
+    PreparationStatus,
+    SelfCheckSet,
+    SelfCheckSetStatus,
+)
 from app.modules.questions.models import (
-    ContentStatus,
     Question,
     QuestionSkill,
 )
+from app.modules.questions.catalog import get_question_catalog
+from app.modules.questions.services import sample_approved_questions
 from app.modules.roadmap.models import DailyTask, Roadmap
+from app.utils.db import database
+from app.utils.single_flight import SingleFlight
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# Giới hạn số roadmap item đang sinh đồng thời trên toàn worker process (dùng chung giữa các request)
+_roadmap_item_semaphore = asyncio.Semaphore(settings.openai.roadmap_max_concurrency)
+
+# Timeout (giây) cho từng loại lời gọi LLM: prompt ngắn fail nhanh, nội dung dài được chờ lâu hơn
+KNOWLEDGE_AREAS_LLM_TIMEOUT = 30.0
+QUESTIONS_LLM_TIMEOUT = 60.0
+ROADMAP_ITEM_LLM_TIMEOUT = 90.0
+EVALUATION_LLM_TIMEOUT = 45.0
+
+# Claim sinh self-check quá thời gian này (giây) coi như bỏ dở (worker chết) và được claim lại
+SELF_CHECK_CLAIM_TTL = QUESTIONS_LLM_TIMEOUT * 2
+SELF_CHECK_WAIT_POLL_INTERVAL = 1.0
+
+# Gộp các request sinh self-check đồng thời trong cùng worker
+_self_check_flight = SingleFlight()
+
+# Claim sinh câu hỏi memory scan quá thời gian này (giây) coi như bỏ dở: knowledge areas + questions,
+# mỗi lời gọi có thể bị OpenAI SDK thử lại max_retries lần với cùng timeout
+MEMORY_SCAN_CLAIM_TTL = (KNOWLEDGE_AREAS_LLM_TIMEOUT + QUESTIONS_LLM_TIMEOUT * 2) * (settings.openai.max_retries + 1)
+MEMORY_SCAN_WAIT_POLL_INTERVAL = 1.0
+_memory_scan_flight = SingleFlight()
+
+# Claim sinh roadmap streaming quá thời gian này (giây) coi như bỏ dở (worker chết / bị kill) và được claim lại
+ROADMAP_CLAIM_TTL = settings.jobs.timeout_seconds
+
 
 async def derive_knowledge_areas_from_jd_and_profile(
     *,
@@ -70,6 +109,7 @@ Return ONLY a valid JSON array of short topic names (strings). No explanation.""
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
             max_tokens=500,
+            timeout=KNOWLEDGE_AREAS_LLM_TIMEOUT,
         )
         content = (response.choices[0].message.content or "").strip()
         if not content:
@@ -155,6 +195,7 @@ No explanation, only the JSON array."""
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
             max_tokens=500,
+            timeout=KNOWLEDGE_AREAS_LLM_TIMEOUT,
         )
         content = (response.choices[0].message.content or "").strip()
         if not content:
@@ -176,23 +217,15 @@ No explanation, only the JSON array."""
         return []
 
 
-async def generate_roadmap_item_markdown(
+def _roadmap_item_prompt(
     *,
     knowledge_area: str,
     jd_skills_summary: str,
     preferred_language: str | None = None,
-) -> tuple[str, list[dict[str, Any]]]:
-    """
-    Gọi LLM tạo 1 roadmap item: nội dung markdown chi tiết + danh sách reference (blog, youtube, course).
-    Trả về (markdown_content, references).
-    """
-    if not settings.openai.api_key:
-        fallback = f"# {knowledge_area}\n\nÔn và nâng cấp kiến thức về **{knowledge_area}**. Tìm tài liệu chính thức hoặc khóa học phù hợp."
-        return fallback, []
-
+) -> str:
+    """Prompt cho 1 roadmap item (dùng chung cho bản thường và bản streaming)."""
     lang_instruction = get_language_instruction(preferred_language)
-    client = get_openai_client()
-    prompt = f"""You are a technical coach. Write a substantive learning note (roadmap item) for: "{knowledge_area}".
+    return f"""You are a technical coach. Write a substantive learning note (roadmap item) for: "{knowledge_area}".
 Job context: {jd_skills_summary}
 
 The note must provide CLEAR, USEFUL INFORMATION — not just keywords for the reader to search. Structure it as follows:
@@ -213,25 +246,95 @@ Requirements:
 - Length: 250-500 words so the reader gets real value without having to "go research" blindly.
 - Return ONLY the markdown content, no JSON wrapper or commentary."""
 
+
+def extract_markdown_references(content: str) -> list[dict[str, Any]]:
+    """Parse [Title](URL) trong nội dung markdown thành meta.references (tối đa 6)."""
+    refs: list[dict[str, Any]] = []
+    for m in re.finditer(r"\[([^\]]+)\]\((https?://[^\)]+)\)", content):
+        refs.append({"type": "link", "title": m.group(1), "url": m.group(2)})
+    return refs[:6]
+
+
+async def generate_roadmap_item_markdown(
+    *,
+    knowledge_area: str,
+    jd_skills_summary: str,
+    preferred_language: str | None = None,
+    cache: bool = True,
+) -> tuple[str, list[dict[str, Any]]]:
+    """
+    Gọi LLM tạo 1 roadmap item: nội dung markdown chi tiết + danh sách reference (blog, youtube, course).
+    Cùng (knowledge_area, jd_skills_summary, ngôn ngữ) sẽ lấy từ LLM cache, trừ khi cache=False.
+    Trả về (markdown_content, references).
+    """
+    if not settings.openai.api_key:
+        fallback = f"# {knowledge_area}\n\nÔn và nâng cấp kiến thức về **{knowledge_area}**. Tìm tài liệu chính thức hoặc khóa học phù hợp."
+        return fallback, []
+
+    prompt = _roadmap_item_prompt(
+        knowledge_area=knowledge_area,
+        jd_skills_summary=jd_skills_summary,
+        preferred_language=preferred_language,
+    )
     try:
-        response = await client.chat.completions.create(
-            model=settings.openai.model,
+        content = await cached_chat_completion(
             messages=[{"role": "user", "content": prompt}],
             temperature=0.5,
             max_tokens=2500,
+            timeout=ROADMAP_ITEM_LLM_TIMEOUT,
+            cache=cache,
         )
-        content = (response.choices[0].message.content or "").strip()
         if not content:
-            content = f"# {knowledge_area}\n\nÔn và nâng cấp kiến thức về **{knowledge_area}**."
-        # Parse [Title](URL) from content for meta.references (optional)
-        refs: list[dict[str, Any]] = []
-        for m in re.finditer(r"\[([^\]]+)\]\((https?://[^\)]+)\)", content):
-            refs.append({"type": "link", "title": m.group(1), "url": m.group(2)})
-        return content, refs[:6]
+            content = _fallback_roadmap_item_markdown(knowledge_area)
+        return content, extract_markdown_references(content)
     except Exception as e:
         logger.exception("generate_roadmap_item_markdown failed: %s", e)
-        fallback = f"# {knowledge_area}\n\nÔn và nâng cấp kiến thức về **{knowledge_area}**."
-        return fallback, []
+        return _fallback_roadmap_item_markdown(knowledge_area), []
+
+
+async def stream_roadmap_item_markdown(
+    *,
+    knowledge_area: str,
+    jd_skills_summary: str,
+    preferred_language: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Như generate_roadmap_item_markdown nhưng trả về từng đoạn (token delta) ngay khi LLM sinh ra.
+    Nối các đoạn lại là nội dung đầy đủ; cache hit thì trả về toàn bộ nội dung trong một đoạn.
+    Lỗi LLM được raise để caller chuyển sang nội dung mặc định.
+    """
+    if not settings.openai.api_key:
+        yield f"# {knowledge_area}\n\nÔn và nâng cấp kiến thức về **{knowledge_area}**. Tìm tài liệu chính thức hoặc khóa học phù hợp."
+        return
+
+    prompt = _roadmap_item_prompt(
+        knowledge_area=knowledge_area,
+        jd_skills_summary=jd_skills_summary,
+        preferred_language=preferred_language,
+    )
+    async for delta in stream_chat_completion(
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.5,
+        max_tokens=2500,
+        timeout=ROADMAP_ITEM_LLM_TIMEOUT,
+    ):
+        yield delta
+
+
+def roadmap_claim_is_stale(prep: Preparation) -> bool:
+    """
+    roadmap_id đã được một stream claim nhưng không sinh xong trong ROADMAP_CLAIM_TTL:
+    coi như chưa có roadmap, request/job sau được claim lại.
+    """
+    started_at = prep.roadmap_generation_started_at
+    if not prep.roadmap_id or started_at is None:
+        return False
+    return started_at < datetime.utcnow() - timedelta(seconds=ROADMAP_CLAIM_TTL)
+
+
+def _fallback_roadmap_item_markdown(knowledge_area: str) -> str:
+    """Nội dung mặc định khi LLM lỗi hoặc trả về rỗng."""
+    return f"# {knowledge_area}\n\nÔn và nâng cấp kiến thức về **{knowledge_area}**."
 
 
 async def get_questions_from_warehouse(
@@ -241,30 +344,33 @@ async def get_questions_from_warehouse(
     tags: list[str],
     limit: int = 8,
 ) -> list[dict[str, Any]]:
-    """Lấy câu hỏi từ question warehouse theo skills/tags từ JD."""
-    skills_lower = [s.lower() for s in skills] if skills else []
-    tags_lower = [t.lower() for t in tags] if tags else []
-
-    query = (
-        select(Question)
-        .where(col(Question.deleted_at).is_(None))
-        .where(Question.status == ContentStatus.APPROVED.value)
-    )
-    result = await session.exec(query)
-    questions = list(result.unique().all())
-
-    if tags_lower or skills_lower:
-        filtered = []
-        for q in questions:
-            q_tags = [t.lower() for t in (q.tags or [])]
-            if tags_lower and any(t in q_tags for t in tags_lower):
-                filtered.append(q)
-            elif skills_lower and any(s in " ".join(q_tags).lower() for s in skills_lower):
-                filtered.append(q)
-        questions = filtered if filtered else questions
-
-    import random
-    selected = random.sample(questions, min(limit, len(questions))) if questions else []
+    """Lấy câu hỏi từ question warehouse theo skills/tags từ JD (khớp đúng tên tag, không phân biệt hoa thường)."""
+    # Skill cũng so khớp như tag: cùng điều kiện && trên GIN index (không LIKE '%skill%' quét cả bảng)
+    match_tags = [*tags, *skills]
+    if settings.question_catalog.enabled:
+        # Chọn từ catalog trong process (inverted index tag/skill), không cần round trip DB
+        catalog = await get_question_catalog()
+        entries = catalog.sample(limit, tags=match_tags) if match_tags else []
+        if not entries:
+            entries = catalog.sample(limit)
+        return [
+            {
+                "id": str(i),
+                "question_text": e.content,
+                "title": e.title,
+                "question_type": e.question_type,
+                "options": deepcopy(e.scan_options),
+                "correct_answer": e.correct_answer,
+            }
+            for i, e in enumerate(entries)
+        ]
+
+    # Lọc tags/skills và lấy ngẫu nhiên ngay trong Postgres (không load cả warehouse)
+    selected: list[Question] = []
+    if match_tags:
+        selected = await sample_approved_questions(session, limit=limit, tags=match_tags)
+    if not selected:
+        selected = await sample_approved_questions(session, limit=limit)
 
     out = []
     for i, q in enumerate(selected):
@@ -282,7 +388,6 @@ async def get_questions_from_warehouse(
 
 
 async def generate_questions_with_ai(
-    session: AsyncSession,
     *,
     jd_analysis: JDAnalysis,
     user_role: str | None,
@@ -342,6 +447,7 @@ Example: [{{"question_text": "What is REST?", "question_type": "multiple_choice"
             messages=[{"role": "user", "content": prompt}],
             temperature=0.5,
             max_tokens=settings.openai.max_tokens,
+            timeout=QUESTIONS_LLM_TIMEOUT,
         )
         content = response.choices[0].message.content
         if not content:
@@ -388,6 +494,183 @@ Example: [{{"question_text": "What is REST?", "question_type": "multiple_choice"
         return []
 
 
+class MemoryScanGenerationError(Exception):
+    """Không sinh được bộ câu hỏi memory scan (warehouse trống và LLM lỗi); preparation vẫn chưa có câu hỏi."""
+
+
+async def _claim_memory_scan_generation(preparation_id: int) -> bool:
+    """
+    Claim quyền sinh bộ câu hỏi memory scan bằng UPDATE có điều kiện (RETURNING): True nếu request này được sinh.
+    Chỉ claim được khi preparation chưa có câu hỏi và không ai đang sinh (hoặc claim cũ đã quá hạn).
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=MEMORY_SCAN_CLAIM_TTL)
+    stmt = (
+        update(Preparation)
+        .where(Preparation.id == preparation_id)
+        .where(func.coalesce(func.json_array_length(Preparation.memory_scan_questions), 0) == 0)
+        .where(
+            or_(
+                Preparation.memory_scan_generation_started_at.is_(None),
+                Preparation.memory_scan_generation_started_at < stale_before,
+            )
+        )
+        .values(memory_scan_generation_started_at=now)
+        .returning(Preparation.id)
+    )
+    async with database.session_maker() as session:
+        result = await session.execute(stmt)
+        claimed = result.scalar_one_or_none() is not None
+        await session.commit()
+    return claimed
+
+
+async def _generate_memory_scan_questions(
+    *,
+    preparation_id: int,
+    jd_analysis: JDAnalysis,
+    user_role: str | None,
+    user_experience_years: int | None,
+    preferred_language: str | None,
+    source: str,
+) -> list[dict[str, Any]]:
+    """
+    Sinh bộ câu hỏi (đã claim) và lưu vào preparation; lỗi thì bỏ claim để request sau sinh lại.
+    Không lưu bộ rỗng: raise MemoryScanGenerationError, cột memory_scan_questions giữ nguyên để claim lại được.
+    """
+    saved = False
+    try:
+        keywords = jd_analysis.extracted_keywords or {}
+        skills, _, keywords_list = normalize_extracted_keyword_names(keywords)
+        tags = list(keywords_list) + list(skills)
+
+        # Đọc warehouse (DB) bằng session ngắn, không giữ connection trong lúc gọi LLM
+        async with database.session_maker() as session:
+            prep = await session.get(Preparation, preparation_id)
+            warehouse_questions: list[dict[str, Any]] = []
+            if source != "ai":
+                warehouse_questions = await get_questions_from_warehouse(
+                    session, skills=skills, tags=tags, limit=8
+                )
+
+        # Xác định vùng kiến thức từ JD + profile trước (dùng thống nhất cho memory scan, roadmap, self-check)
+        knowledge_areas = prep.knowledge_areas or []
+        if not knowledge_areas:
+            knowledge_areas = await derive_knowledge_areas_from_jd_and_profile(
+                jd_analysis=jd_analysis,
+                user_role=user_role,
+                user_experience_years=user_experience_years,
+                preferred_language=preferred_language,
+            )
+
+        async def _generate_with_ai() -> list[dict[str, Any]]:
+            return await generate_questions_with_ai(
+                jd_analysis=jd_analysis,
+                user_role=user_role,
+                limit=8,
+                preferred_language=preferred_language,
+                knowledge_areas=knowledge_areas if knowledge_areas else None,
+            )
+
+        if source == "warehouse":
+            questions = warehouse_questions
+        elif source == "ai":
+            questions = await _generate_with_ai()
+        else:
+            questions = warehouse_questions
+            if len(questions) < 5:
+                questions = await _generate_with_ai()
+        if not questions:
+            questions = await _generate_with_ai()
+        if not questions:
+            raise MemoryScanGenerationError("Could not generate memory scan questions")
+
+        async with database.session_maker() as session:
+            prep = await session.get(Preparation, preparation_id, with_for_update=True)
+            if prep.memory_scan_questions:
+                # Claim đã quá hạn và request khác đã lưu trước: giữ bộ câu hỏi đó
+                return prep.memory_scan_questions
+            prep.knowledge_areas = knowledge_areas
+            prep.memory_scan_questions = questions
+            prep.memory_scan_generation_started_at = None
+            prep.updated_at = datetime.utcnow()
+            session.add(prep)
+            await session.commit()
+            saved = True
+        return questions
+    finally:
+        if not saved:
+            async with database.session_maker() as session:
+                await session.execute(
+                    update(Preparation)
+                    .where(Preparation.id == preparation_id)
+                    .values(memory_scan_generation_started_at=None)
+                )
+                await session.commit()
+
+
+async def _load_or_generate_memory_scan_questions(
+    *,
+    preparation_id: int,
+    jd_analysis: JDAnalysis,
+    user_role: str | None,
+    user_experience_years: int | None,
+    preferred_language: str | None,
+    source: str,
+) -> list[dict[str, Any]]:
+    deadline = asyncio.get_running_loop().time() + MEMORY_SCAN_CLAIM_TTL
+    while True:
+        if await _claim_memory_scan_generation(preparation_id):
+            return await _generate_memory_scan_questions(
+                preparation_id=preparation_id,
+                jd_analysis=jd_analysis,
+                user_role=user_role,
+                user_experience_years=user_experience_years,
+                preferred_language=preferred_language,
+                source=source,
+            )
+        # Worker khác đang sinh (hoặc đã sinh xong): chờ và đọc kết quả
+        async with database.session_maker() as session:
+            prep = await session.get(Preparation, preparation_id)
+        if prep is None:
+            return []
+        if prep.memory_scan_questions:
+            return prep.memory_scan_questions
+        if asyncio.get_running_loop().time() > deadline:
+            return []
+        if prep.memory_scan_generation_started_at is not None:
+            await asyncio.sleep(MEMORY_SCAN_WAIT_POLL_INTERVAL)
+
+
+async def get_or_generate_memory_scan_questions(
+    *,
+    preparation_id: int,
+    jd_analysis: JDAnalysis,
+    user_role: str | None = None,
+    user_experience_years: int | None = None,
+    preferred_language: str | None = None,
+    source: str = "auto",
+) -> list[dict[str, Any]]:
+    """
+    Bộ câu hỏi memory scan của preparation; chưa có thì sinh (warehouse hoặc AI theo source) và lưu vào preparation.
+    Mỗi preparation chỉ sinh một lần khi có nhiều request đồng thời: single-flight trong process
+    + claim memory_scan_generation_started_at trong DB; request thua chờ và đọc kết quả.
+    Không dùng session của request (caller nhả connection trước khi gọi).
+    Trả [] nếu hết thời gian chờ lần sinh ở worker khác; raise MemoryScanGenerationError nếu sinh lỗi.
+    """
+    return await _memory_scan_flight.do(
+        preparation_id,
+        lambda: _load_or_generate_memory_scan_questions(
+            preparation_id=preparation_id,
+            jd_analysis=jd_analysis,
+            user_role=user_role,
+            user_experience_years=user_experience_years,
+            preferred_language=preferred_language,
+            source=source,
+        ),
+    )
+
+
 async def generate_self_check_questions(
     *,
     jd_analysis: JDAnalysis,
@@ -434,6 +717,7 @@ Example: [{{"question_text": "Kể về một lần bạn xử lý conflict tron
             messages=[{"role": "user", "content": prompt}],
             temperature=0.6,
             max_tokens=settings.openai.max_tokens,
+            timeout=QUESTIONS_LLM_TIMEOUT,
         )
         content = response.choices[0].message.content
         if not content:
@@ -464,6 +748,133 @@ Example: [{{"question_text": "Kể về một lần bạn xử lý conflict tron
         return []
 
 
+def _self_check_language(preferred_language: str | None) -> str:
+    return (preferred_language or "en").strip().lower()[:10] or "en"
+
+
+async def _claim_self_check_set(preparation_id: int, language: str, *, regenerate: bool) -> bool:
+    """
+    Claim quyền sinh bộ self-check (INSERT ... ON CONFLICT DO UPDATE ... WHERE): True nếu request này được sinh.
+    Claim được khi chưa có bộ, bộ trước lỗi, claim cũ quá hạn (worker chết giữa chừng), hoặc regenerate bộ đã xong.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=SELF_CHECK_CLAIM_TTL)
+    claimable = or_(
+        SelfCheckSet.status == SelfCheckSetStatus.FAILED,
+        and_(SelfCheckSet.status == SelfCheckSetStatus.GENERATING, SelfCheckSet.claimed_at < stale_before),
+    )
+    if regenerate:
+        claimable = or_(claimable, SelfCheckSet.status == SelfCheckSetStatus.READY)
+    stmt = pg_insert(SelfCheckSet).values(
+        preparation_id=preparation_id,
+        language=language,
+        status=SelfCheckSetStatus.GENERATING,
+        questions=[],
+        claimed_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_self_check_sets_prep_lang",
+        set_={"status": SelfCheckSetStatus.GENERATING, "claimed_at": now, "updated_at": now},
+        where=claimable,
+    ).returning(SelfCheckSet.id)
+    async with database.session_maker() as session:
+        result = await session.execute(stmt)
+        claimed = result.scalar_one_or_none() is not None
+        await session.commit()
+    return claimed
+
+
+async def _read_self_check_set(preparation_id: int, language: str) -> SelfCheckSet | None:
+    async with database.session_maker() as session:
+        result = await session.exec(
+            select(SelfCheckSet)
+            .where(SelfCheckSet.preparation_id == preparation_id)
+            .where(SelfCheckSet.language == language)
+        )
+        return result.first()
+
+
+async def _load_or_generate_self_check_set(
+    *,
+    preparation_id: int,
+    language: str,
+    jd_analysis: JDAnalysis,
+    knowledge_areas: list[str] | None,
+    regenerate: bool,
+    limit: int,
+) -> list[dict[str, Any]]:
+    if not regenerate:
+        row = await _read_self_check_set(preparation_id, language)
+        if row and row.status == SelfCheckSetStatus.READY and row.questions:
+            return row.questions
+
+    if not await _claim_self_check_set(preparation_id, language, regenerate=regenerate):
+        # Worker khác đang sinh: chờ kết quả của nó thay vì gọi LLM lần nữa
+        deadline = asyncio.get_running_loop().time() + SELF_CHECK_CLAIM_TTL
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(SELF_CHECK_WAIT_POLL_INTERVAL)
+            row = await _read_self_check_set(preparation_id, language)
+            if not row or row.status != SelfCheckSetStatus.GENERATING:
+                return row.questions if row and row.status == SelfCheckSetStatus.READY else []
+        return []
+
+    questions: list[dict[str, Any]] = []
+    try:
+        questions = await generate_self_check_questions(
+            jd_analysis=jd_analysis,
+            limit=limit,
+            preferred_language=language,
+            knowledge_areas=knowledge_areas,
+        )
+    finally:
+        # Lưu kết quả (kể cả khi lỗi/bị huỷ: đánh dấu failed để request sau claim lại)
+        async with database.session_maker() as session:
+            result = await session.exec(
+                select(SelfCheckSet)
+                .where(SelfCheckSet.preparation_id == preparation_id)
+                .where(SelfCheckSet.language == language)
+            )
+            row = result.first()
+            if row:
+                row.questions = questions
+                row.status = SelfCheckSetStatus.READY if questions else SelfCheckSetStatus.FAILED
+                row.updated_at = datetime.utcnow()
+                session.add(row)
+                await session.commit()
+    return questions
+
+
+async def get_or_generate_self_check_set(
+    *,
+    preparation_id: int,
+    jd_analysis: JDAnalysis,
+    preferred_language: str | None = None,
+    knowledge_areas: list[str] | None = None,
+    regenerate: bool = False,
+    limit: int = 12,
+) -> list[dict[str, Any]]:
+    """
+    Bộ câu hỏi self-check đã lưu của preparation (theo ngôn ngữ); chưa có thì sinh bằng LLM và lưu lại.
+    regenerate=True: sinh bộ mới thay bộ cũ.
+    Sinh tối đa một lần khi có nhiều request đồng thời: single-flight trong process + claim trong DB giữa các worker.
+    Không dùng session của request (caller nhả connection trước khi gọi).
+    """
+    language = _self_check_language(preferred_language)
+    return await _self_check_flight.do(
+        (preparation_id, language, regenerate),
+        lambda: _load_or_generate_self_check_set(
+            preparation_id=preparation_id,
+            language=language,
+            jd_analysis=jd_analysis,
+            knowledge_areas=knowledge_areas,
+            regenerate=regenerate,
+            limit=limit,
+        ),
+    )
+
+
 def _get_correct_answer_values_for_scoring(q: dict[str, Any]) -> tuple[str | None, str | None]:
     """
     Trả về (canonical_value, index_as_string) để so sánh với selected_answer.
@@ -533,6 +944,44 @@ def _knowledge_level_from_percent(percent: float) -> int:
     return 1
 
 
+def _compute_knowledge_assessment(
+    knowledge_areas: list[str],
+    result_flags: list[bool],
+    memory_scan_questions: list[dict] | None = None,
+) -> list[dict]:
+    """
+    Compute per-area level (5-scale).
+    Nếu câu hỏi có knowledge_area_index thì nhóm theo index; không thì round-robin theo thứ tự câu.
+    """
+    if not knowledge_areas or not result_flags:
+        return []
+    n_areas = len(knowledge_areas)
+    area_correct: list[int] = [0] * n_areas
+    area_total: list[int] = [0] * n_areas
+    questions = memory_scan_questions or []
+    for i, is_correct in enumerate(result_flags):
+        idx = i % n_areas
+        if i < len(questions):
+            q = questions[i]
+            area_idx = q.get("knowledge_area_index")
+            if isinstance(area_idx, int) and 0 <= area_idx < n_areas:
+                idx = area_idx
+        area_total[idx] += 1
+        if is_correct:
+            area_correct[idx] += 1
+    return [
+        {
+            "knowledge_area": area_name,
+            "level": _knowledge_level_from_percent(
+                (100.0 * area_correct[idx] / area_total[idx]) if area_total[idx] else 0.0
+            ),
+            "correct_count": area_correct[idx],
+            "total_count": area_total[idx],
+        }
+        for idx, area_name in enumerate(knowledge_areas)
+    ]
+
+
 async def evaluate_memory_scan_with_llm(
     *,
     memory_scan_questions: list[dict[str, Any]],
@@ -600,6 +1049,7 @@ Be concise, supportive, and specific. Use bullet points or short paragraphs. Do
             messages=[{"role": "user", "content": prompt}],
             temperature=0.4,
             max_tokens=1000,
+            timeout=EVALUATION_LLM_TIMEOUT,
         )
         content = (response.choices[0].message.content or "").strip()
         return content if content else ""
@@ -635,17 +1085,19 @@ async def get_knowledge_areas_for_assessment(
         )
         if areas:
             return areas
+    return knowledge_areas_from_jd_keywords(jd_analysis)
+
+
+def knowledge_areas_from_jd_keywords(jd_analysis: JDAnalysis) -> list[str]:
+    """Vùng kiến thức lấy thẳng từ keywords JD (không gọi LLM)."""
     skills, domains, keywords = normalize_extracted_keyword_names(
         jd_analysis.extracted_keywords or {}
     )
     return skills[:5] + domains[:3] + keywords[:2] or ["Core concepts", "Technical skills", "Best practices"]
 
 
-async def create_roadmap_after_memory_scan(
-    session: AsyncSession,
+async def resolve_roadmap_knowledge_areas(
     *,
-    preparation_id: int,
-    user_id: int,
     jd_analysis: JDAnalysis,
     memory_scan_questions: list[dict[str, Any]],
     answer_results: list[bool],
@@ -653,11 +1105,11 @@ async def create_roadmap_after_memory_scan(
     user_experience_years: int | None = None,
     preferred_language: str | None = None,
     preparation_knowledge_areas: list[str] | None = None,
-) -> tuple[Roadmap, list[str]]:
+) -> tuple[list[str], str]:
     """
-    Bước 3: Sau khi user nộp memory scan.
-    Ưu tiên dùng preparation_knowledge_areas (đã xác định trước memory scan) để roadmap khớp với câu hỏi và self-check.
-    Với mỗi vùng kiến thức, tạo 1 roadmap item (markdown + references).
+    Vùng kiến thức cho roadmap (mỗi vùng = 1 item) + tóm tắt JD dùng làm ngữ cảnh cho prompt.
+    Ưu tiên preparation_knowledge_areas; nếu chưa có thì phân tích gap bằng LLM, cuối cùng lấy từ keywords JD.
+    Trả về (knowledge_areas, jd_skills_summary).
     """
     skills, domains, keywords = normalize_extracted_keyword_names(jd_analysis.extracted_keywords or {})
     kw = jd_analysis.extracted_keywords or {}
@@ -680,7 +1132,73 @@ async def create_roadmap_after_memory_scan(
         knowledge_areas = skills[:5] + domains[:3] + keywords[:2]
     if not knowledge_areas:
         knowledge_areas = ["Core concepts", "Technical skills", "Best practices"]
+    return knowledge_areas, jd_skills_summary
 
+
+async def generate_roadmap_items(
+    *,
+    jd_analysis: JDAnalysis,
+    memory_scan_questions: list[dict[str, Any]],
+    answer_results: list[bool],
+    user_role: str | None = None,
+    user_experience_years: int | None = None,
+    preferred_language: str | None = None,
+    preparation_knowledge_areas: list[str] | None = None,
+) -> tuple[list[str], list[dict[str, Any]]]:
+    """
+    Bước 3 (phần LLM): xác định vùng kiến thức và tạo nội dung cho từng roadmap item.
+    Ưu tiên dùng preparation_knowledge_areas (đã xác định trước memory scan) để roadmap khớp với câu hỏi và self-check.
+    Không dùng DB session: caller nhả connection trước khi gọi, sau đó lưu bằng save_roadmap.
+    Trả về (knowledge_areas, items); mỗi item là {"title", "content", "references"}.
+    """
+    knowledge_areas, jd_skills_summary = await resolve_roadmap_knowledge_areas(
+        jd_analysis=jd_analysis,
+        memory_scan_questions=memory_scan_questions,
+        answer_results=answer_results,
+        user_role=user_role,
+        user_experience_years=user_experience_years,
+        preferred_language=preferred_language,
+        preparation_knowledge_areas=preparation_knowledge_areas,
+    )
+
+    # Sinh các item song song, giới hạn theo request và theo process; gather giữ đúng thứ tự (sort_order)
+    request_semaphore = asyncio.Semaphore(settings.openai.roadmap_concurrency)
+
+    async def _generate_item(area: str) -> tuple[str, list[dict[str, Any]]]:
+        async with request_semaphore, _roadmap_item_semaphore:
+            return await generate_roadmap_item_markdown(
+                knowledge_area=area,
+                jd_skills_summary=jd_skills_summary,
+                preferred_language=preferred_language,
+            )
+
+    areas = knowledge_areas[:10]
+    results = await asyncio.gather(*(_generate_item(area) for area in areas), return_exceptions=True)
+
+    items: list[dict[str, Any]] = []
+    for area, result in zip(areas, results):
+        if isinstance(result, BaseException):
+            # Một item lỗi không huỷ các item còn lại: dùng nội dung mặc định
+            logger.error("Roadmap item generation failed for %r: %s", area, result)
+            content, refs = _fallback_roadmap_item_markdown(area), []
+        else:
+            content, refs = result
+        items.append({"title": area, "content": content, "references": refs})
+    return knowledge_areas, items
+
+
+async def save_roadmap(
+    session: AsyncSession,
+    *,
+    preparation_id: int,
+    user_id: int,
+    jd_analysis: JDAnalysis,
+    items: list[dict[str, Any]],
+) -> Roadmap:
+    """
+    Bước 3 (phần ghi DB): lưu roadmap và các DailyTask từ items của generate_roadmap_items.
+    Chỉ flush, caller commit.
+    """
     roadmap = Roadmap(
         user_id=user_id,
         preparation_id=preparation_id,
@@ -690,17 +1208,13 @@ async def create_roadmap_after_memory_scan(
     session.add(roadmap)
     await session.flush()
 
-    for sort_order, area in enumerate(knowledge_areas[:10]):
-        content, refs = await generate_roadmap_item_markdown(
-            knowledge_area=area,
-            jd_skills_summary=jd_skills_summary,
-            preferred_language=preferred_language,
-        )
+    for sort_order, item in enumerate(items):
+        refs = item.get("references") or []
         task = DailyTask(
             roadmap_id=roadmap.id,
             day_index=sort_order,
-            title=area,
-            content=content,
+            title=item["title"],
+            content=item["content"],
             content_type="markdown",
             sort_order=sort_order,
             meta={"references": refs} if refs else {},
@@ -708,4 +1222,4 @@ async def create_roadmap_after_memory_scan(
         session.add(task)
 
     await session.flush()
-    return roadmap, knowledge_areas
+    return roadmap
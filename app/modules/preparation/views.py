@@ -1,49 +1,63 @@
 """Preparation API: luồng 4 bước (JD → Memory Scan → Roadmap → Self-check)."""
 
+import os
 import uuid
 from copy import deepcopy
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import load_only
 from sqlmodel import select
 
 from app.config import settings
-from app.modules.account.models import User
 from app.modules.analysis.models import JDAnalysis, AnalysisSubmitResponse
+from app.modules.analysis.parsing import extract_upload_text
 from app.modules.analysis.services import (
     ALLOWED_JD_EXTENSIONS,
     LINKEDIN_JD_URL_PATTERN,
-    extract_jd_content_with_llm,
-    extract_keywords_with_llm,
-    extract_text_from_file,
-    fetch_text_from_url,
-    normalize_extracted_keyword_names,
+)
+from app.modules.preparation.jobs import (
+    CREATE_ROADMAP_JOB,
+    MEMORY_SCAN_REPORT_JOB,
+    SUBMIT_JD_JOB,
 )
 from app.modules.preparation.models import (
     MemoryScanQuestionDisplay,
+    MemoryScanReportStatus,
     MemoryScanSubmitRequest,
+    MemoryScanSubmitResponse,
     Preparation,
     PreparationResponse,
+    PreparationSummaryResponse,
     PreparationStatus,
     SelfCheckQuestionDisplay,
 )
+from app.modules.preparation.roadmap_stream import (
+    follow_broadcast,
+    get_active_roadmap_stream,
+    replay_roadmap_from_db,
+    replay_roadmap_job,
+    start_roadmap_stream,
+)
 from app.modules.preparation.services import (
-    create_roadmap_after_memory_scan,
-    derive_knowledge_areas_from_jd_and_profile,
-    evaluate_memory_scan_with_llm,
-    generate_questions_with_ai,
-    generate_self_check_questions,
-    get_questions_from_warehouse,
-    get_knowledge_areas_for_assessment,
-    _knowledge_level_from_percent,
+    MemoryScanGenerationError,
+    get_or_generate_memory_scan_questions,
+    get_or_generate_self_check_set,
+    knowledge_areas_from_jd_keywords,
+    roadmap_claim_is_stale,
+    _compute_knowledge_assessment,
     _score_memory_scan_answers,
 )
 from app.modules.questions.models import AssessmentSession, UserQuestionAnswer
 from app.modules.roadmap.models import DailyTask, DailyTaskResponse
+from app.models.job import Job, JobResponse, JobStatus
 from app.utils.auth import CurrentUser
-from app.utils.db import DBSession
+from app.utils.db import DBSession, ReadDBSession, read_primary_after_write, release_connection
+from app.utils.jobs import enqueue_job, get_active_job
+from app.utils.uploads import upload_to_temp_file
 
 router = APIRouter(prefix="/api/preparations", tags=["preparation"])
 
@@ -103,7 +117,7 @@ async def get_preparation_jd_analysis(
 @router.get("/{preparation_id}", response_model=PreparationResponse)
 async def get_preparation(
     preparation_id: int,
-    session: DBSession,
+    session: ReadDBSession,
     current_user: CurrentUser,
 ) -> Preparation:
     """Lấy thông tin một preparation (phải thuộc user)."""
@@ -133,118 +147,46 @@ async def get_memory_scan_questions(
     if not jd:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JD analysis not found")
 
-    keywords = jd.extracted_keywords or {}
-    skills, _, keywords_list = normalize_extracted_keyword_names(keywords)
-    tags = list(keywords_list) + list(skills)
-
     if prep.memory_scan_questions:
         return _questions_for_display(prep.memory_scan_questions)
 
-    # Xác định vùng kiến thức từ JD + profile trước (dùng thống nhất cho memory scan, roadmap, self-check)
-    if not prep.knowledge_areas:
-        prep.knowledge_areas = await derive_knowledge_areas_from_jd_and_profile(
+    # Sinh câu hỏi gọi LLM lâu: nhả connection; request đồng thời cùng preparation dùng chung một lần sinh
+    await release_connection(session)
+    try:
+        questions = await get_or_generate_memory_scan_questions(
+            preparation_id=preparation_id,
             jd_analysis=jd,
             user_role=current_user.role,
             user_experience_years=current_user.experience_years,
             preferred_language=current_user.preferred_language,
+            source=source,
         )
-        session.add(prep)
-        await session.flush()
-
-    knowledge_areas = prep.knowledge_areas or []
-
-    if source == "warehouse":
-        questions = await get_questions_from_warehouse(
-            session, skills=skills, tags=tags, limit=8
-        )
-    elif source == "ai":
-        questions = await generate_questions_with_ai(
-            session,
-            jd_analysis=jd,
-            user_role=current_user.role,
-            limit=8,
-            preferred_language=current_user.preferred_language,
-            knowledge_areas=knowledge_areas if knowledge_areas else None,
-        )
-    else:
-        questions = await get_questions_from_warehouse(
-            session, skills=skills, tags=tags, limit=8
+    except MemoryScanGenerationError:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Could not generate memory scan questions. Please try again.",
         )
-        if len(questions) < 5:
-            questions = await generate_questions_with_ai(
-                session,
-                jd_analysis=jd,
-                user_role=current_user.role,
-                limit=8,
-                preferred_language=current_user.preferred_language,
-                knowledge_areas=knowledge_areas if knowledge_areas else None,
-            )
     if not questions:
-        questions = await generate_questions_with_ai(
-            session,
-            jd_analysis=jd,
-            user_role=current_user.role,
-            limit=8,
-            preferred_language=current_user.preferred_language,
-            knowledge_areas=knowledge_areas if knowledge_areas else None,
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Memory scan questions are still being generated. Please try again.",
         )
 
-    prep.memory_scan_questions = questions
-    prep.updated_at = datetime.utcnow()
-    session.add(prep)
-    await session.commit()
-
     return _questions_for_display(questions)
 
 
-def _compute_knowledge_assessment(
-    knowledge_areas: list[str],
-    result_flags: list[bool],
-    memory_scan_questions: list[dict] | None = None,
-) -> list[dict]:
-    """
-    Compute per-area level (5-scale).
-    Nếu câu hỏi có knowledge_area_index thì nhóm theo index; không thì round-robin theo thứ tự câu.
-    """
-    if not knowledge_areas or not result_flags:
-        return []
-    n_areas = len(knowledge_areas)
-    area_correct: list[int] = [0] * n_areas
-    area_total: list[int] = [0] * n_areas
-    questions = memory_scan_questions or []
-    for i, is_correct in enumerate(result_flags):
-        idx = i % n_areas
-        if i < len(questions):
-            q = questions[i]
-            area_idx = q.get("knowledge_area_index")
-            if isinstance(area_idx, int) and 0 <= area_idx < n_areas:
-                idx = area_idx
-        area_total[idx] += 1
-        if is_correct:
-            area_correct[idx] += 1
-    return [
-        {
-            "knowledge_area": area_name,
-            "level": _knowledge_level_from_percent(
-                (100.0 * area_correct[idx] / area_total[idx]) if area_total[idx] else 0.0
-            ),
-            "correct_count": area_correct[idx],
-            "total_count": area_total[idx],
-        }
-        for idx, area_name in enumerate(knowledge_areas)
-    ]
-
-
-@router.post("/{preparation_id}/memory-scan/submit")
+@router.post("/{preparation_id}/memory-scan/submit", response_model=MemoryScanSubmitResponse)
 async def submit_memory_scan(
     preparation_id: int,
     body: MemoryScanSubmitRequest,
     session: DBSession,
     current_user: CurrentUser,
-):
+) -> MemoryScanSubmitResponse:
     """
-    Nộp đáp án memory scan: chấm điểm, lưu kết quả. User xem kết quả rồi quyết định
-    "Tiếp tục tạo roadmap" hoặc "Làm lại scan". Không tự tạo roadmap.
+    Nộp đáp án memory scan: chấm điểm, đánh giá theo vùng kiến thức và lưu kết quả ngay (không gọi LLM).
+    Báo cáo LLM (llm_report) chạy nền và được ghi vào last_memory_scan_result khi xong
+    (llm_report_status: pending → done | failed); client poll GET /{id} hoặc GET /{id}/jobs/{llm_report_job_id}.
+    User xem kết quả rồi quyết định "Tiếp tục tạo roadmap" hoặc "Làm lại scan". Không tự tạo roadmap.
     """
     prep = await session.get(Preparation, preparation_id)
     if not prep or prep.user_id != current_user.id:
@@ -261,6 +203,16 @@ async def submit_memory_scan(
     )
     score_percent = round(100.0 * correct_count / total, 1) if total else 0.0
 
+    # Vùng kiến thức đã xác định cùng bộ câu hỏi; thiếu thì lấy từ keywords JD (không chờ LLM)
+    knowledge_areas = prep.knowledge_areas or []
+    if not knowledge_areas:
+        jd = await session.get(JDAnalysis, prep.jd_analysis_id)
+        if jd:
+            knowledge_areas = knowledge_areas_from_jd_keywords(jd)
+    knowledge_assessment = _compute_knowledge_assessment(
+        knowledge_areas, result_flags, prep.memory_scan_questions
+    )
+
     assessment = AssessmentSession(
         user_id=current_user.id,
         preparation_id=preparation_id,
@@ -280,40 +232,6 @@ async def submit_memory_scan(
         )
         session.add(answer_row)
 
-    knowledge_assessment: list[dict] = []
-    jd = await session.get(JDAnalysis, prep.jd_analysis_id)
-    jd_summary = ""
-    if jd:
-        knowledge_areas = await get_knowledge_areas_for_assessment(
-            jd_analysis=jd,
-            memory_scan_questions=prep.memory_scan_questions,
-            answer_results=result_flags,
-            user_role=current_user.role,
-            user_experience_years=current_user.experience_years,
-            preferred_language=current_user.preferred_language,
-            preparation_knowledge_areas=prep.knowledge_areas or None,
-        )
-        knowledge_assessment = _compute_knowledge_assessment(
-            knowledge_areas, result_flags, prep.memory_scan_questions
-        )
-        kw = jd.extracted_keywords or {}
-        skills, domains, keywords = normalize_extracted_keyword_names(kw)
-        jd_summary = f"Skills: {skills}. Domains: {domains}. Keywords: {keywords}."
-        if kw.get("requirements_summary"):
-            jd_summary += f" Key requirements: {kw.get('requirements_summary')}"
-
-    llm_report = await evaluate_memory_scan_with_llm(
-        memory_scan_questions=prep.memory_scan_questions,
-        answers=body.answers,
-        result_flags=result_flags,
-        score_percent=score_percent,
-        correct_count=correct_count,
-        total_questions=total,
-        knowledge_assessment=knowledge_assessment,
-        jd_summary=jd_summary,
-        preferred_language=current_user.preferred_language,
-    )
-
     prep.status = PreparationStatus.MEMORY_SCAN_DONE
     prep.last_memory_scan_result = {
         "score_percent": score_percent,
@@ -321,32 +239,57 @@ async def submit_memory_scan(
         "total_questions": total,
         "knowledge_assessment": knowledge_assessment,
         "session_id": assessment.id,
-        "llm_report": llm_report,
+        "llm_report": None,
+        "llm_report_status": MemoryScanReportStatus.PENDING,
     }
     prep.updated_at = datetime.utcnow()
     session.add(prep)
+
+    job = await enqueue_job(
+        session,
+        kind=MEMORY_SCAN_REPORT_JOB,
+        user_id=current_user.id,
+        preparation_id=preparation_id,
+        payload={
+            "session_id": assessment.id,
+            "answers": body.answers,
+            "result_flags": result_flags,
+            "score_percent": score_percent,
+            "correct_count": correct_count,
+            "total_questions": total,
+            "knowledge_assessment": knowledge_assessment,
+        },
+    )
     await session.commit()
 
-    return {
-        "session_id": assessment.id,
-        "score_percent": score_percent,
-        "total_questions": total,
-        "correct_count": correct_count,
-        "preparation_id": preparation_id,
-        "roadmap_ready": False,
-        "knowledge_assessment": knowledge_assessment,
-        "llm_report": llm_report,
-    }
+    return MemoryScanSubmitResponse(
+        session_id=assessment.id,
+        score_percent=score_percent,
+        total_questions=total,
+        correct_count=correct_count,
+        preparation_id=preparation_id,
+        roadmap_ready=False,
+        knowledge_assessment=knowledge_assessment,
+        llm_report=None,
+        llm_report_status=MemoryScanReportStatus.PENDING,
+        llm_report_job_id=job.id,
+    )
 
 
-@router.post("/{preparation_id}/create-roadmap")
+@router.post(
+    "/{preparation_id}/create-roadmap",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def create_roadmap(
     preparation_id: int,
     session: DBSession,
     current_user: CurrentUser,
-):
+) -> JobResponse:
     """
     Tạo roadmap từ kết quả memory scan lần cuối (user bấm "Tiếp tục tạo roadmap").
+    Sinh roadmap chạy nền: trả về 202 + job (result: {roadmap_id, preparation_id}).
+    Gọi lại khi job đang chạy sẽ trả về đúng job đó.
     """
     prep = await session.get(Preparation, preparation_id)
     if not prep or prep.user_id != current_user.id:
@@ -356,60 +299,33 @@ async def create_roadmap(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No memory scan data. Complete memory scan first.",
         )
-    if prep.roadmap_id:
+    if prep.roadmap_id and not roadmap_claim_is_stale(prep):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Roadmap already created for this preparation.",
         )
 
-    # Lấy session memory scan mới nhất và đáp án
-    stmt = (
-        select(AssessmentSession)
+    result = await session.exec(
+        select(AssessmentSession.id)
         .where(AssessmentSession.preparation_id == preparation_id)
         .where(AssessmentSession.session_type == "memory_scan")
-        .order_by(AssessmentSession.created_at.desc())
         .limit(1)
     )
-    result = await session.exec(stmt)
-    last_session = result.first()
-    if not last_session:
+    if not result.first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No memory scan session found.",
         )
 
-    ans_stmt = (
-        select(UserQuestionAnswer)
-        .where(UserQuestionAnswer.session_id == last_session.id)
-        .order_by(UserQuestionAnswer.id)
-    )
-    ans_result = await session.exec(ans_stmt)
-    answers = list(ans_result.all())
-    result_flags = [a.is_correct for a in answers]
-
-    jd = await session.get(JDAnalysis, prep.jd_analysis_id)
-    if not jd:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JD analysis not found")
-
-    roadmap, _ = await create_roadmap_after_memory_scan(
+    job = await enqueue_job(
         session,
-        preparation_id=preparation_id,
+        kind=CREATE_ROADMAP_JOB,
         user_id=current_user.id,
-        jd_analysis=jd,
-        memory_scan_questions=prep.memory_scan_questions,
-        answer_results=result_flags,
-        user_role=current_user.role,
-        user_experience_years=current_user.experience_years,
-        preferred_language=current_user.preferred_language,
-        preparation_knowledge_areas=prep.knowledge_areas or None,
+        preparation_id=preparation_id,
+        dedupe=True,
     )
-    prep.roadmap_id = roadmap.id
-    prep.status = PreparationStatus.ROADMAP_READY
-    prep.updated_at = datetime.utcnow()
-    session.add(prep)
     await session.commit()
-
-    return {"roadmap_id": roadmap.id, "preparation_id": preparation_id}
+    return JobResponse.model_validate(job)
 
 
 @router.post("/{preparation_id}/memory-scan/reset")
@@ -461,14 +377,55 @@ async def get_preparation_roadmap(
     }
 
 
+@router.get("/{preparation_id}/roadmap/stream")
+async def stream_preparation_roadmap(
+    preparation_id: int,
+    session: DBSession,
+    current_user: CurrentUser,
+) -> StreamingResponse:
+    """
+    Bước 3 (SSE): tạo roadmap và gửi từng item ngay khi xong (event delta/task/done, xem roadmap_stream).
+    Roadmap đã có thì replay các task đã lưu; đang được sinh thì nhận tiếp các item mới.
+    """
+    prep = await session.get(Preparation, preparation_id)
+    if not prep or prep.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preparation not found")
+
+    broadcast = get_active_roadmap_stream(preparation_id)
+    if broadcast is not None:
+        events = follow_broadcast(broadcast)
+    elif prep.roadmap_id and not roadmap_claim_is_stale(prep):
+        events = replay_roadmap_from_db(preparation_id, prep.roadmap_id)
+    elif job := await get_active_job(session, kind=CREATE_ROADMAP_JOB, preparation_id=preparation_id):
+        # POST /roadmap đã đưa job vào hàng đợi: chờ job thay vì sinh lần hai
+        events = replay_roadmap_job(preparation_id, job.id)
+    else:
+        if not prep.memory_scan_questions:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No memory scan data. Complete memory scan first.",
+            )
+        events = follow_broadcast(start_roadmap_stream(preparation_id, current_user.id))
+    # Stream có thể kéo dài: không giữ connection DB của request
+    await release_connection(session)
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{preparation_id}/self-check-questions", response_model=list[SelfCheckQuestionDisplay])
 async def get_self_check_questions(
     preparation_id: int,
     session: DBSession,
     current_user: CurrentUser,
+    regenerate: bool = Query(False, description="Sinh bộ câu hỏi mới thay cho bộ đã lưu"),
 ):
     """
     Bước 4: Câu hỏi giả lập phỏng vấn (LLM). Không phải trắc nghiệm/chấm điểm — để user tự luyện trả lời.
+    Bộ câu hỏi được lưu theo preparation + ngôn ngữ; các lần GET sau đọc từ DB, chỉ sinh lại khi regenerate=true.
     """
     prep = await session.get(Preparation, preparation_id)
     if not prep or prep.user_id != current_user.id:
@@ -477,24 +434,43 @@ async def get_self_check_questions(
     jd = await session.get(JDAnalysis, prep.jd_analysis_id)
     if not jd:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JD analysis not found")
+    await release_connection(session)
 
-    questions = await generate_self_check_questions(
+    questions = await get_or_generate_self_check_set(
+        preparation_id=preparation_id,
         jd_analysis=jd,
-        limit=12,
         preferred_language=current_user.preferred_language,
         knowledge_areas=prep.knowledge_areas or None,
+        regenerate=regenerate,
     )
     return [SelfCheckQuestionDisplay(id=q["id"], question_text=q["question_text"]) for q in questions]
 
 
-@router.get("")
+@router.get("", response_model=list[PreparationSummaryResponse])
 async def list_my_preparations(
-    session: DBSession,
+    session: ReadDBSession,
     current_user: CurrentUser,
 ):
-    """Danh sách preparations của user (mới nhất trước). Trả về kèm company_name, job_title từ JD analysis nếu có."""
+    """
+    Danh sách preparations của user (mới nhất trước), bản rút gọn kèm company_name, job_title
+    từ JD analysis nếu có.
+
+    Chỉ đọc các cột nhẹ của Preparation (load_only) và mục meta của extracted_keywords;
+    JD gốc, bộ câu hỏi memory scan, kết quả/report không rời khỏi DB. Chi tiết qua GET /{id}.
+    """
     result = await session.exec(
-        select(Preparation, JDAnalysis)
+        select(Preparation, JDAnalysis.extracted_keywords["meta"].label("jd_meta"))
+        .options(
+            load_only(
+                Preparation.id,
+                Preparation.user_id,
+                Preparation.jd_analysis_id,
+                Preparation.status,
+                Preparation.roadmap_id,
+                Preparation.created_at,
+                raiseload=True,
+            )
+        )
         .join(JDAnalysis, Preparation.jd_analysis_id == JDAnalysis.id)
         .where(Preparation.user_id == current_user.id)
         .order_by(Preparation.created_at.desc())
@@ -502,19 +478,17 @@ async def list_my_preparations(
     )
     rows = result.all()
     out = []
-    for prep, jd in rows:
-        meta = (jd.extracted_keywords or {}).get("meta") or {}
+    for prep, meta in rows:
+        meta = meta if isinstance(meta, dict) else {}
         company_name = meta.get("company_name") if isinstance(meta.get("company_name"), str) else None
         job_title = meta.get("job_title") if isinstance(meta.get("job_title"), str) else None
         out.append(
-            PreparationResponse(
+            PreparationSummaryResponse(
                 id=prep.id,
                 user_id=prep.user_id,
                 jd_analysis_id=prep.jd_analysis_id,
                 status=prep.status,
                 roadmap_id=prep.roadmap_id,
-                knowledge_areas=prep.knowledge_areas or [],
-                last_memory_scan_result=prep.last_memory_scan_result,
                 created_at=prep.created_at,
                 company_name=company_name,
                 job_title=job_title,
@@ -550,7 +524,11 @@ async def create_preparation(
     return PreparationResponse.model_validate(prep)
 
 
-@router.post("/{preparation_id}/submit-jd", response_model=AnalysisSubmitResponse)
+@router.post(
+    "/{preparation_id}/submit-jd",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def submit_jd_for_preparation(
     preparation_id: int,
     session: DBSession,
@@ -558,8 +536,11 @@ async def submit_jd_for_preparation(
     text: str | None = Form(None),
     file: UploadFile | None = File(None),
     linkedin_url: str | None = Form(None),
-):
-    """Nộp JD cho preparation (đã tạo trước bằng POST /). Cập nhật JDAnalysis tại chỗ."""
+) -> JobResponse:
+    """
+    Nộp JD cho preparation (đã tạo trước bằng POST /). Input được kiểm tra ngay; fetch LinkedIn,
+    làm sạch JD và trích keywords bằng LLM chạy nền: trả về 202 + job (result giống AnalysisSubmitResponse).
+    """
     prep = await session.get(Preparation, preparation_id)
     if not prep or prep.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preparation not found")
@@ -568,23 +549,17 @@ async def submit_jd_for_preparation(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Preparation already has JD. Use a new preparation to submit another JD.",
         )
+    # Upload + parse có thể lâu: không giữ connection DB trong lúc chờ
+    await release_connection(session)
 
-    raw_text = ""
-    file_path = None
-
+    payload: dict[str, Any]
     if linkedin_url and linkedin_url.strip():
         if not LINKEDIN_JD_URL_PATTERN.match(linkedin_url.strip()):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid LinkedIn job URL. Example: https://www.linkedin.com/jobs/view/4375191000/",
             )
-        raw_text = await fetch_text_from_url(linkedin_url.strip())
-        if not raw_text or len(raw_text) < 100:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not extract enough text from the URL. Try pasting the JD text instead.",
-            )
-        raw_text = await extract_jd_content_with_llm(raw_text, source="linkedin")
+        payload = {"linkedin_url": linkedin_url.strip()}
     elif file and file.filename:
         ext = Path(file.filename).suffix.lower()
         if ext not in ALLOWED_JD_EXTENSIONS:
@@ -592,62 +567,80 @@ async def submit_jd_for_preparation(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Allowed file types: {', '.join(ALLOWED_JD_EXTENSIONS)}",
             )
-        content = await file.read()
-        raw_text = extract_text_from_file(content=content, filename=file.filename)
-        if not raw_text.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not extract text from the uploaded file",
-            )
-        raw_text = await extract_jd_content_with_llm(raw_text, source="file")
         jd_dir = _ensure_jd_dir()
         user_dir = jd_dir / str(current_user.id)
         user_dir.mkdir(parents=True, exist_ok=True)
-        safe_name = f"{uuid.uuid4().hex}_{Path(file.filename).name}"
-        save_path = user_dir / safe_name
-        save_path.write_bytes(content)
-        file_path = str(save_path.relative_to(Path(settings.storage.upload_dir)))
+        async with upload_to_temp_file(
+            file, max_bytes=settings.storage.max_jd_size_bytes, directory=user_dir
+        ) as upload_path:
+            raw_text = await extract_upload_text(path=upload_path, filename=file.filename)
+            if not raw_text.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Could not extract text from the uploaded file",
+                )
+            safe_name = f"{uuid.uuid4().hex}_{Path(file.filename).name}"
+            save_path = user_dir / safe_name
+            os.replace(upload_path, save_path)
+        payload = {
+            "source": "file",
+            "raw_text": raw_text,
+            "file_path": str(save_path.relative_to(Path(settings.storage.upload_dir))),
+        }
     elif text and text.strip():
-        raw_text = text.strip()
+        payload = {"source": "text", "raw_text": text.strip()}
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Provide 'text', 'file', or 'linkedin_url'",
         )
 
-    user_profile: dict[str, Any] = {}
-    if current_user.role:
-        user_profile["role"] = current_user.role
-    if current_user.experience_years is not None:
-        user_profile["experience_years"] = current_user.experience_years
-    if current_user.skills_summary:
-        user_profile["skills_summary"] = current_user.skills_summary
-    if current_user.current_company:
-        user_profile["current_company"] = current_user.current_company
-
-    keywords = await extract_keywords_with_llm(
-        raw_text,
-        preferred_language=current_user.preferred_language,
-        user_profile=user_profile if user_profile else None,
+    job = await enqueue_job(
+        session,
+        kind=SUBMIT_JD_JOB,
+        user_id=current_user.id,
+        preparation_id=preparation_id,
+        payload=payload,
+        dedupe=True,
     )
-
-    jd = await session.get(JDAnalysis, prep.jd_analysis_id)
-    if not jd:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JD analysis record not found")
-    jd.raw_text = raw_text
-    jd.file_path = file_path
-    jd.extracted_keywords = keywords
-    prep.status = PreparationStatus.MEMORY_SCAN_READY
-    session.add(jd)
-    session.add(prep)
     await session.commit()
-    await session.refresh(jd)
-    await session.refresh(prep)
+    return JobResponse.model_validate(job)
 
-    return AnalysisSubmitResponse(
-        id=jd.id,
-        raw_text=jd.raw_text,
-        extracted_keywords=jd.extracted_keywords or {},
-        created_at=jd.created_at,
-        preparation_id=prep.id,
+
+@router.get("/{preparation_id}/jobs", response_model=list[JobResponse])
+async def list_preparation_jobs(
+    preparation_id: int,
+    session: DBSession,
+    current_user: CurrentUser,
+    limit: int = Query(20, ge=1, le=100),
+) -> list[JobResponse]:
+    """Các background job gần nhất của preparation (mới nhất trước)."""
+    prep = await session.get(Preparation, preparation_id)
+    if not prep or prep.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preparation not found")
+    result = await session.exec(
+        select(Job)
+        .where(Job.preparation_id == preparation_id)
+        .order_by(Job.id.desc())
+        .limit(limit)
     )
+    return [JobResponse.model_validate(j) for j in result.all()]
+
+
+@router.get("/{preparation_id}/jobs/{job_id}", response_model=JobResponse)
+async def get_preparation_job(
+    preparation_id: int,
+    job_id: int,
+    request: Request,
+    response: Response,
+    session: DBSession,
+    current_user: CurrentUser,
+) -> JobResponse:
+    """Trạng thái + kết quả một job (client poll tới khi status là succeeded/failed)."""
+    job = await session.get(Job, job_id)
+    if not job or job.preparation_id != preparation_id or job.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job.status not in JobStatus.ACTIVE:
+        # Job đã ghi kết quả lên primary: client sắp refetch preparation/roadmap, đọc từ primary (read-your-writes)
+        read_primary_after_write(request, response)
+    return JobResponse.model_validate(job)
@@ -0,0 +1,360 @@
+"""
+In-process catalog of approved questions for the memory scan hot path.
+
+Each worker keeps a read-only snapshot of approved, non-deleted questions with
+client-safe options precomputed, plus inverted indexes from lowercase tag and
+skill id to compact arrays of question ids. Selecting questions is then a set
+union/intersection plus random.sample, with no DB round trip.
+
+Freshness: every write in questions/views.py records the touched question ids in
+question_catalog_changes (same transaction), stamped with the writer's transaction
+id (txid). The catalog version is a watermark: the oldest transaction still running
+(xmin of the snapshot) when the catalog last read the log. Every transaction below
+it has finished, so each check (at most every QUESTION_CATALOG_CHECK_INTERVAL
+seconds) reads the rows with txid >= watermark, skips those already applied, and
+reloads only the questions they name. Unlike max(id), this never skips a change
+whose id was assigned before, but committed after, one already seen.
+
+As a backstop the snapshot is rebuilt every QUESTION_CATALOG_REBUILD_INTERVAL
+seconds; rebuilds also prune log rows older than QUESTION_CATALOG_CHANGE_RETENTION_SECONDS.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from array import array
+from copy import deepcopy
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Integer, delete, func, insert, literal, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.modules.questions.models import (
+    ContentStatus,
+    Question,
+    QuestionCatalogChange,
+    QuestionSkill,
+)
+from app.utils.db import database
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogQuestion:
+    """Immutable view of an approved question as served to memory scan clients."""
+
+    __slots__ = (
+        "id",
+        "title",
+        "content",
+        "question_type",
+        "difficulty",
+        "estimated_time_seconds",
+        "tags",
+        "tags_lower",
+        "skill_ids",
+        "display_options",
+        "scan_options",
+        "correct_answer",
+    )
+
+    def __init__(self, question: Question, skill_ids: tuple[int, ...]):
+        options = question.options or {}
+        self.id: int = question.id
+        self.title: str = question.title or ""
+        self.content: str = question.content
+        self.question_type: str = question.question_type
+        self.difficulty: str = question.difficulty
+        self.estimated_time_seconds: int | None = question.estimated_time_seconds
+        self.tags: tuple[str, ...] = tuple(question.tags or ())
+        self.tags_lower: frozenset[str] = frozenset(t.lower() for t in self.tags)
+        self.skill_ids = skill_ids
+        # Client-safe options (user question API): no answer fields at all
+        display = deepcopy(options)
+        display.pop("correct_answer", None)
+        display.pop("correct_index", None)
+        self.display_options: dict[str, Any] = display
+        # Memory scan set stored on the preparation: answer kept separately as correct_answer
+        scan = deepcopy(options)
+        self.correct_answer = scan.pop("correct_answer", scan.get("correct_index"))
+        self.scan_options: dict[str, Any] = scan
+
+
+def _add_posting(index: dict, key, question_id: int) -> None:
+    posting = index.get(key)
+    if posting is None:
+        index[key] = array("i", (question_id,))
+    else:
+        posting.append(question_id)
+
+
+def _remove_postings(index: dict, keys: set, removed: set[int]) -> None:
+    """Drop removed ids from the postings of keys, rebuilding each touched posting once."""
+    for key in keys:
+        posting = index.get(key)
+        if posting is None:
+            continue
+        kept = array("i", (qid for qid in posting if qid not in removed))
+        if kept:
+            index[key] = kept
+        else:
+            del index[key]
+
+
+class QuestionCatalog:
+    """Snapshot of approved questions with inverted tag/skill indexes (one per worker process)."""
+
+    def __init__(self) -> None:
+        # txid watermark: every change from a transaction below it is applied
+        self.version: int | None = None
+        # Change ids with txid >= version that are already applied (re-read until the watermark passes them)
+        self._applied_recent: set[int] = set()
+        self._rebuilt_at = 0.0
+        self.questions: dict[int, CatalogQuestion] = {}
+        self.ids = array("i")
+        self.by_tag: dict[str, array] = {}
+        self.by_skill: dict[int, array] = {}
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
+    def mark_stale(self) -> None:
+        """Check the version stamp on the next access (used after local writes)."""
+        self._checked_at = 0.0
+
+    # ---- selection (no awaits: safe to call while other requests refresh) ----
+
+    def candidate_ids(
+        self,
+        *,
+        tags: list[str] | None = None,
+        skill_ids: list[int] | None = None,
+    ) -> set[int] | None:
+        """
+        Ids matching the filters; None when no filter is given (= every question).
+
+        tags: exact, case-insensitive tag match (any of them); skill_ids is AND-ed
+        with the result.
+        """
+        result: set[int] | None = None
+        if tags:
+            result = set()
+            for tag in tags:
+                result.update(self.by_tag.get(tag.lower(), ()))
+        if skill_ids:
+            by_skill: set[int] = set()
+            for skill_id in skill_ids:
+                by_skill.update(self.by_skill.get(skill_id, ()))
+            result = by_skill if result is None else result & by_skill
+        return result
+
+    def sample(
+        self,
+        limit: int,
+        *,
+        tags: list[str] | None = None,
+        skill_ids: list[int] | None = None,
+    ) -> list[CatalogQuestion]:
+        """Random sample of up to limit questions matching the filters."""
+        candidates = self.candidate_ids(tags=tags, skill_ids=skill_ids)
+        pool = self.ids if candidates is None else list(candidates)
+        chosen = random.sample(pool, min(limit, len(pool))) if pool else []
+        return [self.questions[qid] for qid in chosen]
+
+    # ---- maintenance ----
+
+    def _add(self, entry: CatalogQuestion) -> None:
+        self.questions[entry.id] = entry
+        self.ids.append(entry.id)
+        for tag in entry.tags_lower:
+            _add_posting(self.by_tag, tag, entry.id)
+        for skill_id in entry.skill_ids:
+            _add_posting(self.by_skill, skill_id, entry.id)
+
+    def _remove_many(self, question_ids: list[int]) -> None:
+        """Drop questions, filtering ids and each touched posting once (array.remove is O(n) per id)."""
+        removed: set[int] = set()
+        tags: set[str] = set()
+        skill_ids: set[int] = set()
+        for question_id in question_ids:
+            entry = self.questions.pop(question_id, None)
+            if entry is None:
+                continue
+            removed.add(question_id)
+            tags.update(entry.tags_lower)
+            skill_ids.update(entry.skill_ids)
+        if not removed:
+            return
+        self.ids = array("i", (qid for qid in self.ids if qid not in removed))
+        _remove_postings(self.by_tag, tags, removed)
+        _remove_postings(self.by_skill, skill_ids, removed)
+
+    def _due(self) -> bool:
+        if not self.loaded:
+            return True
+        return time.monotonic() - self._checked_at >= settings.question_catalog.check_interval
+
+    def _rebuild_due(self) -> bool:
+        return (
+            not self.loaded
+            or time.monotonic() - self._rebuilt_at >= settings.question_catalog.rebuild_interval
+        )
+
+    async def refresh(self, force: bool = False) -> None:
+        """Apply changes committed since the watermark (rate-limited by check_interval); rebuild when due."""
+        if not force and not self._due():
+            return
+        async with self._lock:
+            # Another request may have refreshed while this one waited for the lock
+            if not force and not self._due():
+                return
+            async with database.session_maker() as session:
+                if self._rebuild_due():
+                    await self._rebuild(session)
+                else:
+                    await self._apply_changes(session)
+            self._checked_at = time.monotonic()
+
+    async def _rebuild(self, session: AsyncSession) -> None:
+        started = time.monotonic()
+        # Watermark first: changes from transactions still running now are re-read by the next check
+        version = (await session.execute(_WATERMARK_SQL)).scalar_one()
+        questions = (
+            await session.exec(
+                select(Question)
+                .where(col(Question.deleted_at).is_(None))
+                .where(Question.status == ContentStatus.APPROVED.value)
+            )
+        ).all()
+        skills = await _load_skill_ids(session, [q.id for q in questions])
+
+        self.questions = {}
+        self.ids = array("i")
+        self.by_tag = {}
+        self.by_skill = {}
+        for question in questions:
+            self._add(CatalogQuestion(question, skills.get(question.id, ())))
+        self.version = version
+        self._applied_recent = set()
+        self._rebuilt_at = time.monotonic()
+        logger.info(
+            "Question catalog built: %d questions, %d tags, version %s (%.0f ms)",
+            len(self.questions),
+            len(self.by_tag),
+            version,
+            (time.monotonic() - started) * 1000,
+        )
+        await _prune_changes(session)
+
+    async def _apply_changes(self, session: AsyncSession) -> None:
+        # One statement = one snapshot: the rows read and the new watermark are consistent
+        rows = (
+            await session.execute(_CHANGES_SINCE_SQL, {"watermark": str(self.version)})
+        ).all()
+        version = rows[0].watermark
+        new_rows = [r for r in rows if r.id is not None and r.id not in self._applied_recent]
+        changed_ids = list({r.question_id for r in new_rows})
+        if changed_ids:
+            questions = (
+                await session.exec(select(Question).where(col(Question.id).in_(changed_ids)))
+            ).all()
+            skills = await _load_skill_ids(session, changed_ids)
+
+            by_id = {q.id: q for q in questions}
+            self._remove_many(changed_ids)
+            for question_id in changed_ids:
+                question = by_id.get(question_id)
+                if question and question.deleted_at is None and question.status == ContentStatus.APPROVED.value:
+                    self._add(CatalogQuestion(question, skills.get(question_id, ())))
+            logger.info("Question catalog updated: %d changed questions, version %s", len(changed_ids), version)
+        # Rows below the new watermark are never read again; keep only the ids still at or above it
+        self._applied_recent = {r.id for r in rows if r.id is not None and r.txid >= version}
+        self.version = version
+
+
+# xmin of the statement snapshot: every transaction with a lower id has committed or aborted
+_WATERMARK_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+_CHANGES_SINCE_SQL = text("""
+    SELECT w.watermark, c.id, c.question_id, c.txid::text::bigint AS txid
+    FROM (SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS watermark) AS w
+    LEFT JOIN question_catalog_changes AS c ON c.txid >= CAST(:watermark AS text)::xid8
+""")
+
+
+async def _prune_changes(session: AsyncSession) -> None:
+    """Delete change-log rows older than the retention (every worker rebuilt from later data)."""
+    retention = max(
+        settings.question_catalog.change_retention_seconds,
+        2 * settings.question_catalog.rebuild_interval,
+    )
+    result = await session.execute(
+        delete(QuestionCatalogChange).where(
+            col(QuestionCatalogChange.changed_at) < datetime.utcnow() - timedelta(seconds=retention)
+        )
+    )
+    await session.commit()
+    if result.rowcount:
+        logger.info("Pruned %d question catalog change rows", result.rowcount)
+
+
+async def _load_skill_ids(session: AsyncSession, question_ids: list[int]) -> dict[int, tuple[int, ...]]:
+    if not question_ids:
+        return {}
+    rows = (
+        await session.exec(
+            select(QuestionSkill.question_id, QuestionSkill.skill_id).where(
+                col(QuestionSkill.question_id).in_(question_ids)
+            )
+        )
+    ).all()
+    out: dict[int, list[int]] = {}
+    for question_id, skill_id in rows:
+        out.setdefault(question_id, []).append(skill_id)
+    return {qid: tuple(ids) for qid, ids in out.items()}
+
+
+_catalog = QuestionCatalog()
+
+
+async def get_question_catalog() -> QuestionCatalog:
+    """Catalog snapshot of this worker, refreshed from the version stamp if due."""
+    try:
+        await _catalog.refresh()
+    except Exception:
+        if not _catalog.loaded:
+            raise
+        logger.exception("Question catalog refresh failed; serving version %s", _catalog.version)
+    return _catalog
+
+
+def record_question_changes(session: AsyncSession, question_ids: list[int]) -> None:
+    """
+    Bump the catalog version for question_ids (committed with the caller's transaction).
+
+    Call from every write that can change an approved question: create, edit,
+    approve/reject, delete, skill assignment.
+    """
+    for question_id in question_ids:
+        session.add(QuestionCatalogChange(question_id=question_id))
+    _catalog.mark_stale()
+
+
+async def record_question_changes_bulk(session: AsyncSession, question_ids: list[int]) -> None:
+    """Same as record_question_changes, as one INSERT ... SELECT unnest(...) for large id lists."""
+    if not question_ids:
+        return
+    await session.execute(
+        insert(QuestionCatalogChange).from_select(
+            ["question_id"],
+            select(func.unnest(literal(list(question_ids), ARRAY(Integer)))),
+        )
+    )
+    _catalog.mark_stale()
@@ -5,7 +5,8 @@ from datetime import datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field, field_validator
-from sqlmodel import Column, Field as SQLField, JSON, Relationship, SQLModel
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, Field as SQLField, JSON, Relationship, SQLModel, UniqueConstraint
 
 
 # Enums
@@ -112,7 +113,8 @@ class Question(SQLModel, table=True):
     source_type: str = SQLField(max_length=50, default=SourceType.ADMIN_CURATED.value, index=True)
     created_by_user_id: int = SQLField(foreign_key="users.id")
     approved_by_admin_id: int | None = SQLField(default=None, foreign_key="users.id")
-    tags: list[str] = SQLField(sa_column=Column(JSON), default_factory=list)
+    # JSONB + GIN index on question_tags_lower(tags) (see db migrations) for tag filtering in SQL
+    tags: list[str] = SQLField(sa_column=Column(JSONB), default_factory=list)
     version: int = SQLField(default=1)
     created_at: datetime = SQLField(default_factory=datetime.utcnow)
     updated_at: datetime = SQLField(default_factory=datetime.utcnow)
@@ -147,10 +149,28 @@ class Knowledge(SQLModel, table=True):
     deleted_at: datetime | None = SQLField(default=None)  # Soft delete
 
 
+class QuestionCatalogChange(SQLModel, table=True):
+    """
+    Change log of questions, read by the in-process question catalog.
+
+    The txid column (writer transaction id, xid8, added by migration 0010) is not
+    mapped; the catalog polls rows by txid so changes are seen in commit order.
+    """
+
+    __tablename__ = "question_catalog_changes"
+
+    id: int | None = SQLField(default=None, primary_key=True)
+    question_id: int = SQLField(index=True)
+    changed_at: datetime = SQLField(default_factory=datetime.utcnow)
+
+
 class QuestionSkill(SQLModel, table=True):
     """Many-to-many relationship between questions and skills."""
     
     __tablename__ = "question_skills"
+    __table_args__ = (
+        UniqueConstraint("question_id", "skill_id", name="uq_question_skills_question_skill"),
+    )
     
     id: int | None = SQLField(default=None, primary_key=True)
     question_id: int = SQLField(foreign_key="questions.id", index=True)
@@ -298,8 +318,10 @@ class QuestionListResponse(BaseModel):
     """Schema for paginated question list."""
     
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
+    next_cursor: str | None = None
     items: list[QuestionResponse]
 
 
@@ -357,16 +379,20 @@ class QuestionKnowledgeLinkCreate(BaseModel):
     relevance_score: float = Field(default=1.0, ge=0.0, le=1.0)
 
 
+# Max question ids per bulk moderation request (one UPDATE ... WHERE id = ANY(...) each)
+MAX_BULK_QUESTION_IDS = 10_000
+
+
 class BulkApproveRequest(BaseModel):
     """Schema for bulk approve operation."""
     
-    question_ids: list[int]
+    question_ids: list[int] = Field(..., max_length=MAX_BULK_QUESTION_IDS)
 
 
 class BulkRejectRequest(BaseModel):
     """Schema for bulk reject operation."""
     
-    question_ids: list[int]
+    question_ids: list[int] = Field(..., max_length=MAX_BULK_QUESTION_IDS)
     feedback: str | None = None
 
 
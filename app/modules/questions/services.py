@@ -0,0 +1,148 @@
+"""Question warehouse queries: tag/skill filtering, random sampling and full-text search done in Postgres."""
+
+import re
+
+from sqlalchemy import func, literal, literal_column, tablesample, text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import aliased
+from sqlalchemy.types import Text
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.questions.models import ContentStatus, Question, QuestionSkill
+
+
+def _tags_lower():
+    """
+    Lowercased tags of a question as text[].
+
+    question_tags_lower() is an IMMUTABLE SQL function created by the startup
+    migrations; the GIN index ix_questions_tags_lower is built on this exact
+    expression, so predicates written against it can use the index.
+    """
+    return func.question_tags_lower(Question.tags, type_=ARRAY(Text))
+
+
+def _lower_array(values: list[str]):
+    # One text[] parameter: varchar[] elements would not match text[] for the && operator
+    return literal([v.lower() for v in values], type_=ARRAY(Text))
+
+
+def tags_overlap(tags: list[str]):
+    """Question has at least one of tags (case-insensitive, exact tag match; GIN-indexed)."""
+    return _tags_lower().op("&&")(_lower_array(tags))
+
+
+def _search_vector():
+    """
+    questions.search_vector: generated tsvector over title (A), tags (A) and content (B).
+
+    Created by the startup migrations (not mapped on the model, so ORM inserts
+    never touch it). Text goes through immutable_unaccent(), so Vietnamese
+    matches with or without diacritics.
+    """
+    return literal_column("questions.search_vector", type_=TSVECTOR)
+
+
+def search_query(search: str):
+    """
+    tsquery for a free-text admin search, or None when search has no word characters.
+
+    Every word must match (AND) and each word also matches as a prefix, so partial
+    words keep working as they did with ILIKE.
+    """
+    words = re.findall(r"\w+", search)
+    if not words:
+        return None
+    return func.to_tsquery(
+        literal_column("'simple'::regconfig"),
+        func.immutable_unaccent(" & ".join(f"{w}:*" for w in words)),
+    )
+
+
+def search_match(tsquery):
+    """Full-text predicate on questions.search_vector (GIN-indexed)."""
+    return _search_vector().op("@@")(tsquery)
+
+
+def search_rank(tsquery):
+    """ts_rank of questions for tsquery (higher = more relevant)."""
+    return func.ts_rank(_search_vector(), tsquery)
+
+
+def approved_questions():
+    """Base query: approved, not deleted questions."""
+    return (
+        select(Question)
+        .where(col(Question.deleted_at).is_(None))
+        .where(Question.status == ContentStatus.APPROVED.value)
+    )
+
+
+# Rows read by TABLESAMPLE SYSTEM_ROWS per requested question (the sample also holds unapproved rows)
+_SAMPLE_ROWS_PER_QUESTION = 20
+_system_rows_available: bool | None = None
+
+
+async def _has_system_rows(session: AsyncSession) -> bool:
+    """Whether the tsm_system_rows extension is installed (migration 0012; checked once per worker)."""
+    global _system_rows_available
+    if _system_rows_available is None:
+        result = await session.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'tsm_system_rows'"))
+        _system_rows_available = result.first() is not None
+    return _system_rows_available
+
+
+async def sample_approved_questions(
+    session: AsyncSession,
+    *,
+    limit: int,
+    tags: list[str] | None = None,
+    skill_ids: list[int] | None = None,
+) -> list[Question]:
+    """
+    Random sample of approved questions matching the filters, selected in SQL.
+
+    With tag/skill filters the matches come from the GIN / question_skills
+    indexes and only that set is sorted by random(). Without filters the table
+    is first sampled with TABLESAMPLE SYSTEM_ROWS, so the sort never covers the
+    whole warehouse; it falls back to sorting every approved question when the
+    extension is missing or the sample holds too few approved rows.
+
+    Args:
+        session: Database session
+        limit: Max questions to return
+        tags: Keep questions having any of these tags (exact, case-insensitive; GIN-indexed)
+        skill_ids: Keep questions linked to any of these skills (AND with tags)
+
+    Returns:
+        Up to limit questions in random order
+    """
+    query = approved_questions()
+    if tags:
+        query = query.where(tags_overlap(tags))
+    if skill_ids:
+        query = query.where(
+            col(Question.id).in_(
+                select(QuestionSkill.question_id).where(col(QuestionSkill.skill_id).in_(skill_ids))
+            )
+        )
+
+    if not tags and not skill_ids and await _has_system_rows(session):
+        sampled = aliased(
+            Question,
+            tablesample(Question, func.system_rows(limit * _SAMPLE_ROWS_PER_QUESTION), name="sampled_questions"),
+        )
+        result = await session.exec(
+            select(sampled)
+            .where(col(sampled.deleted_at).is_(None))
+            .where(sampled.status == ContentStatus.APPROVED.value)
+            .order_by(func.random())
+            .limit(limit)
+        )
+        selected = list(result.all())
+        if len(selected) == limit:
+            return selected
+
+    result = await session.exec(query.order_by(func.random()).limit(limit))
+    return list(result.all())
@@ -1,23 +1,24 @@
 """User-facing question API: fetch questions for assessment/practice and submit answers."""
 
-import random
 from copy import deepcopy
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy import insert
 from sqlmodel import col, select
 
+from app.config import settings
 from app.modules.account.models import User
 from app.modules.questions.models import (
     AssessmentSession,
-    ContentStatus,
     Question,
-    QuestionSkill,
     SubmitAnswersRequest,
     SubmitAnswersResponse,
     UserQuestionAnswer,
     UserQuestionItem,
 )
+from app.modules.questions.catalog import get_question_catalog
+from app.modules.questions.services import sample_approved_questions
 from app.utils.auth import CurrentUser
 from app.utils.db import DBSession
 
@@ -32,9 +33,9 @@ def _options_for_display(options: dict) -> dict:
     return out
 
 
-def _get_correct_answer(question: Question) -> str | None:
-    """Get correct answer from question options (for scoring)."""
-    opts = question.options or {}
+def _correct_answer_from_options(options: dict | None) -> str | None:
+    """Correct answer from a question's options dict (correct_answer or choices[correct_index])."""
+    opts = options or {}
     if "correct_answer" in opts:
         return str(opts["correct_answer"]).strip()
     idx = opts.get("correct_index")
@@ -58,35 +59,28 @@ async def list_questions_for_user(
     Get questions for Memory Scan (adaptive) or Knowledge Check (practice).
     Only approved questions are returned. For memory_scan, 5-10 random questions.
     """
-    query = (
-        select(Question)
-        .where(col(Question.deleted_at).is_(None))
-        .where(Question.status == ContentStatus.APPROVED.value)
-    )
-
-    if skill_ids:
-        query = query.join(QuestionSkill).where(
-            col(QuestionSkill.skill_id).in_(skill_ids)
-        )
-
-    result = await session.exec(query)
-    questions = list(result.unique().all())
+    # Memory scan: 5-10, knowledge_check: up to limit
+    count = min(max(5, limit), 10) if mode == "memory_scan" else limit
 
-    if tags:
-        tag_set = set(t.lower() for t in tags)
-        questions = [
-            q for q in questions
-            if q.tags and any(t.lower() in tag_set for t in (q.tags or []))
+    if settings.question_catalog.enabled:
+        catalog = await get_question_catalog()
+        return [
+            UserQuestionItem(
+                id=e.id,
+                title=e.title,
+                content=e.content,
+                question_type=e.question_type,
+                options=e.display_options,
+                difficulty=e.difficulty,
+                estimated_time_seconds=e.estimated_time_seconds,
+                tags=list(e.tags),
+            )
+            for e in catalog.sample(count, tags=tags, skill_ids=skill_ids)
         ]
 
-    if not questions:
-        return []
-
-    # Memory scan: 5-10, knowledge_check: up to limit
-    count = min(limit, len(questions))
-    if mode == "memory_scan":
-        count = min(max(5, count), 10, len(questions))
-    selected = random.sample(questions, count)
+    selected = await sample_approved_questions(
+        session, limit=count, tags=tags, skill_ids=skill_ids
+    )
 
     items = []
     for q in selected:
@@ -123,36 +117,48 @@ async def submit_answers(
             detail="At least one answer is required",
         )
 
+    # One IN query for every answered question (constant round trips per submission)
+    question_ids = {item.question_id for item in body.answers}
+    result = await session.exec(
+        select(Question.id, Question.options)
+        .where(col(Question.id).in_(question_ids))
+        .where(col(Question.deleted_at).is_(None))
+    )
+    correct_answers = {qid: _correct_answer_from_options(options) for qid, options in result.all()}
+
+    correct_flags = []
+    for item in body.answers:
+        correct_ans = correct_answers.get(item.question_id)
+        correct_flags.append(
+            correct_ans is not None and str(item.selected_answer).strip() == correct_ans
+        )
+    correct_count = sum(correct_flags)
+    total = len(body.answers)
+    score_percent = round(100.0 * correct_count / total, 1) if total else 0.0
+
     assessment = AssessmentSession(
         user_id=current_user.id,
         session_type=body.session_type,
+        score_percent=score_percent,
     )
     session.add(assessment)
     await session.flush()
 
-    correct_count = 0
-    for item in body.answers:
-        question = await session.get(Question, item.question_id)
-        correct = False
-        if question and not question.deleted_at:
-            correct_ans = _get_correct_answer(question)
-            if correct_ans is not None:
-                correct = str(item.selected_answer).strip() == correct_ans
-        if correct:
-            correct_count += 1
-        answer_row = UserQuestionAnswer(
-            session_id=assessment.id,
-            question_id=item.question_id,
-            selected_answer=item.selected_answer,
-            is_correct=correct,
+    # Single multi-row INSERT for all answer rows
+    await session.execute(
+        insert(UserQuestionAnswer).values(
+            [
+                {
+                    "session_id": assessment.id,
+                    "question_id": item.question_id,
+                    "selected_answer": item.selected_answer,
+                    "is_correct": correct,
+                }
+                for item, correct in zip(body.answers, correct_flags)
+            ]
         )
-        session.add(answer_row)
-
-    total = len(body.answers)
-    score_percent = round(100.0 * correct_count / total, 1) if total else 0.0
-    assessment.score_percent = score_percent
+    )
     await session.commit()
-    await session.refresh(assessment)
 
     return SubmitAnswersResponse(
         session_id=assessment.id,
@@ -4,12 +4,17 @@ from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import Integer, any_, delete, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.modules.account.models import User
+from app.modules.questions.catalog import record_question_changes, record_question_changes_bulk
+from app.modules.questions.services import search_match, search_query, search_rank
 from app.utils.auth import AdminUser, CurrentUser
 from app.utils.db import DBSession
+from app.utils.pagination import count_rows, paginate
 
 from .models import (
     BulkApproveRequest,
@@ -30,6 +35,84 @@ from .models import (
 
 router = APIRouter(prefix="/api/admin/questions", tags=["questions"])
 
+# Columns accepted by sort_by in list_questions (non-null, so keyset cursors work)
+QUESTION_SORT_COLUMNS = (
+    "created_at",
+    "updated_at",
+    "title",
+    "difficulty",
+    "question_type",
+    "status",
+    "id",
+)
+
+
+async def _bulk_set_status(
+    session: AsyncSession,
+    question_ids: list[int],
+    values: dict[str, Any],
+) -> tuple[list[int], list[int]]:
+    """One UPDATE ... WHERE id = ANY(...) RETURNING id; returns (updated ids, skipped ids)."""
+    requested = list(dict.fromkeys(question_ids))
+    if not requested:
+        return [], []
+    stmt = (
+        update(Question)
+        .where(Question.id == any_(literal(requested, ARRAY(Integer))))
+        .where(col(Question.deleted_at).is_(None))
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(Question.id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    updated = set(result.scalars().all())
+    await record_question_changes_bulk(session, list(updated))
+    affected = [qid for qid in requested if qid in updated]
+    skipped = [qid for qid in requested if qid not in updated]
+    return affected, skipped
+
+
+async def _replace_question_skills(session: AsyncSession, question_id: int, skill_ids: list[int]) -> list[int]:
+    """
+    Set the skills of a question with set-based statements.
+
+    One SELECT validates every skill id, one DELETE drops links not in skill_ids,
+    one multi-row INSERT ... ON CONFLICT DO UPDATE upserts the rest, so every link
+    ends with relevance_score 1.0 as when the links were deleted and re-inserted.
+    """
+    wanted = list(dict.fromkeys(skill_ids))
+    if wanted:
+        result = await session.execute(
+            select(SkillTaxonomy.id).where(col(SkillTaxonomy.id).in_(wanted))
+        )
+        found = set(result.scalars().all())
+        missing = [skill_id for skill_id in wanted if skill_id not in found]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Skill with id {missing[0]} not found",
+            )
+
+    delete_stmt = delete(QuestionSkill).where(QuestionSkill.question_id == question_id)
+    if wanted:
+        delete_stmt = delete_stmt.where(col(QuestionSkill.skill_id).not_in(wanted))
+    await session.execute(delete_stmt)
+
+    if wanted:
+        insert_stmt = pg_insert(QuestionSkill).values(
+            [
+                {"question_id": question_id, "skill_id": skill_id, "relevance_score": 1.0}
+                for skill_id in wanted
+            ]
+        )
+        await session.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="uq_question_skills_question_skill",
+                set_={"relevance_score": insert_stmt.excluded.relevance_score},
+            )
+        )
+    return wanted
+
 
 @router.post("", response_model=QuestionResponse, status_code=status.HTTP_201_CREATED)
 async def create_question(
@@ -54,6 +137,8 @@ async def create_question(
     )
     
     session.add(question)
+    await session.flush()
+    record_question_changes(session, [question.id])
     await session.commit()
     await session.refresh(question)
     
@@ -75,6 +160,7 @@ async def create_question(
             )
             session.add(question_skill)
         
+        record_question_changes(session, [question.id])
         await session.commit()
     
     return question
@@ -93,12 +179,14 @@ async def list_questions(
     is_official: bool | None = Query(None),
     created_by_user_id: int | None = Query(None),
     search: str | None = Query(None),
-    sort_by: str = Query("created_at"),
+    sort_by: str | None = Query(None, description="Column to sort by, or relevance (default when searching)"),
     sort_order: str = Query("desc"),
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    exact_count: bool = Query(False, description="Always compute an exact total"),
 ) -> dict[str, Any]:
-    """List questions with filtering, sorting, and pagination."""
+    """List questions with filtering, sorting, and pagination (page number or keyset cursor)."""
     # Build query
     query = select(Question).where(col(Question.deleted_at).is_(None))
     
@@ -121,43 +209,55 @@ async def list_questions(
     if created_by_user_id:
         query = query.where(Question.created_by_user_id == created_by_user_id)
     
-    # Search in title, content, and tags
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                col(Question.title).ilike(search_pattern),
-                col(Question.content).ilike(search_pattern),
-            )
-        )
+    # Full-text search in title, content, and tags (accent-insensitive, GIN-indexed)
+    tsquery = search_query(search) if search else None
+    if tsquery is not None:
+        query = query.where(search_match(tsquery))
     
     # Filter by skills
     if skill_ids:
         query = query.join(QuestionSkill).where(col(QuestionSkill.skill_id).in_(skill_ids))
     
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await session.execute(count_query)
-    total = total_result.scalar_one()
+    # Count total (cached briefly): deleted_at IS NULL always filters, so pg_class.reltuples would overcount
+    total, total_is_estimate = await count_rows(
+        session, query, table="questions", filtered=True, exact=exact_count
+    )
     
-    # Apply sorting
-    if sort_order == "asc":
-        query = query.order_by(getattr(Question, sort_by).asc())
+    # Apply sorting (default: relevance when searching, otherwise newest first)
+    if sort_by is None:
+        sort_by = "relevance" if tsquery is not None else "created_at"
+    if sort_by == "relevance" and tsquery is None:
+        sort_by = "created_at"
+    if sort_by == "relevance":
+        sort_expr = search_rank(tsquery)
+        descending = True
+    elif sort_by in QUESTION_SORT_COLUMNS:
+        sort_expr = col(getattr(Question, sort_by))
+        descending = sort_order != "asc"
     else:
-        query = query.order_by(getattr(Question, sort_by).desc())
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot sort by {sort_by}",
+        )
     
-    # Execute query
-    result = await session.execute(query)
-    questions = result.scalars().all()
+    questions, next_cursor = await paginate(
+        session,
+        query,
+        sort_key=sort_by,
+        sort_expr=sort_expr,
+        id_column=col(Question.id),
+        descending=descending,
+        page_size=page_size,
+        cursor=cursor,
+        page=page,
+    )
     
     return {
         "total": total,
+        "total_is_estimate": total_is_estimate,
         "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
         "items": questions,
     }
 
@@ -213,29 +313,9 @@ async def update_question(
     
     # Update skills if provided
     if question_data.skill_ids is not None:
-        # Remove existing skills
-        delete_stmt = select(QuestionSkill).where(QuestionSkill.question_id == question_id)
-        result = await session.execute(delete_stmt)
-        existing_skills = result.scalars().all()
-        for skill in existing_skills:
-            await session.delete(skill)
-        
-        # Add new skills
-        for skill_id in question_data.skill_ids:
-            skill = await session.get(SkillTaxonomy, skill_id)
-            if not skill:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Skill with id {skill_id} not found"
-                )
-            
-            question_skill = QuestionSkill(
-                question_id=question_id,
-                skill_id=skill_id,
-                relevance_score=1.0,
-            )
-            session.add(question_skill)
+        await _replace_question_skills(session, question_id, question_data.skill_ids)
     
+    record_question_changes(session, [question_id])
     await session.commit()
     await session.refresh(question)
     
@@ -259,6 +339,7 @@ async def delete_question(
     
     # Soft delete
     question.deleted_at = datetime.utcnow()
+    record_question_changes(session, [question_id])
     await session.commit()
 
 
@@ -281,6 +362,7 @@ async def approve_question(
     question.approved_by_admin_id = current_user.id
     question.updated_at = datetime.utcnow()
     
+    record_question_changes(session, [question_id])
     await session.commit()
     await session.refresh(question)
     
@@ -309,6 +391,7 @@ async def reject_question(
     # Store feedback in user contribution record if exists
     # (Implementation depends on UserContribution tracking)
     
+    record_question_changes(session, [question_id])
     await session.commit()
     await session.refresh(question)
     
@@ -339,6 +422,7 @@ async def promote_to_official(
     question.is_official = True
     question.updated_at = datetime.utcnow()
     
+    record_question_changes(session, [question_id])
     await session.commit()
     await session.refresh(question)
     
@@ -399,22 +483,19 @@ async def bulk_approve_questions(
     session: DBSession,
     current_user: AdminUser,
 ) -> dict[str, Any]:
-    """Bulk approve multiple questions."""
-    approved_count = 0
-    
-    for question_id in request.question_ids:
-        question = await session.get(Question, question_id)
-        if question and not question.deleted_at:
-            question.status = ContentStatus.APPROVED.value
-            question.approved_by_admin_id = current_user.id
-            question.updated_at = datetime.utcnow()
-            approved_count += 1
-    
+    """Bulk approve multiple questions (up to 10k ids, single UPDATE)."""
+    approved_ids, skipped_ids = await _bulk_set_status(
+        session,
+        request.question_ids,
+        {"status": ContentStatus.APPROVED.value, "approved_by_admin_id": current_user.id},
+    )
     await session.commit()
     
     return {
-        "message": f"Successfully approved {approved_count} questions",
-        "approved_count": approved_count,
+        "message": f"Successfully approved {len(approved_ids)} questions",
+        "approved_count": len(approved_ids),
+        "approved_ids": approved_ids,
+        "skipped_ids": skipped_ids,
     }
 
 
@@ -424,21 +505,19 @@ async def bulk_reject_questions(
     session: DBSession,
     current_user: AdminUser,
 ) -> dict[str, Any]:
-    """Bulk reject multiple questions."""
-    rejected_count = 0
-    
-    for question_id in request.question_ids:
-        question = await session.get(Question, question_id)
-        if question and not question.deleted_at:
-            question.status = ContentStatus.REJECTED.value
-            question.updated_at = datetime.utcnow()
-            rejected_count += 1
-    
+    """Bulk reject multiple questions (up to 10k ids, single UPDATE)."""
+    rejected_ids, skipped_ids = await _bulk_set_status(
+        session,
+        request.question_ids,
+        {"status": ContentStatus.REJECTED.value},
+    )
     await session.commit()
     
     return {
-        "message": f"Successfully rejected {rejected_count} questions",
-        "rejected_count": rejected_count,
+        "message": f"Successfully rejected {len(rejected_ids)} questions",
+        "rejected_count": len(rejected_ids),
+        "rejected_ids": rejected_ids,
+        "skipped_ids": skipped_ids,
     }
 
 
@@ -448,8 +527,8 @@ async def assign_skills_to_question(
     skill_ids: list[int],
     session: DBSession,
     current_user: AdminUser,
-) -> dict[str, str]:
-    """Assign multiple skills to a question."""
+) -> dict[str, Any]:
+    """Assign multiple skills to a question (replaces the existing set)."""
     # Verify question exists
     question = await session.get(Question, question_id)
     if not question or question.deleted_at:
@@ -458,32 +537,11 @@ async def assign_skills_to_question(
             detail="Question not found"
         )
     
-    # Remove existing skills
-    delete_stmt = select(QuestionSkill).where(QuestionSkill.question_id == question_id)
-    result = await session.execute(delete_stmt)
-    existing_skills = result.scalars().all()
-    for skill in existing_skills:
-        await session.delete(skill)
-    
-    # Add new skills
-    for skill_id in skill_ids:
-        skill = await session.get(SkillTaxonomy, skill_id)
-        if not skill:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Skill with id {skill_id} not found"
-            )
-        
-        question_skill = QuestionSkill(
-            question_id=question_id,
-            skill_id=skill_id,
-            relevance_score=1.0,
-        )
-        session.add(question_skill)
-    
+    assigned = await _replace_question_skills(session, question_id, skill_ids)
+    record_question_changes(session, [question_id])
     await session.commit()
     
-    return {"message": "Skills assigned successfully"}
+    return {"message": "Skills assigned successfully", "skill_ids": assigned}
 
 
 @router.get("/{question_id}/skills", response_model=list[dict[str, Any]])
@@ -12,14 +12,14 @@ from app.modules.roadmap.models import (
     Roadmap,
 )
 from app.utils.auth import CurrentUser
-from app.utils.db import DBSession
+from app.utils.db import DBSession, ReadDBSession
 
 router = APIRouter(prefix="/api/roadmap", tags=["roadmap"])
 
 
 @router.get("/daily", response_model=DailyRoadmapResponse)
 async def get_daily_roadmap(
-    session: DBSession,
+    session: ReadDBSession,
     current_user: CurrentUser,
 ) -> DailyRoadmapResponse:
     """
@@ -1,5 +1,10 @@
 """Authentication utilities for password hashing and JWT token management."""
 
+import asyncio
+import hashlib
+import hmac
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Annotated
 
@@ -11,7 +16,9 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
 from app.modules.account.models import TokenData, User
+from app.utils.cache import TTLCache
 from app.utils.db import DBSession
+from app.utils.user_cache import get_user, invalidate_user
 
 # HTTP Bearer token scheme for FastAPI
 security = HTTPBearer()
@@ -22,9 +29,40 @@ def _truncate_password(password: str) -> bytes:
     return password.encode("utf-8")[:72]
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# bcrypt costs ~250 ms of CPU per call at 12 rounds; it releases the GIL, so running it
+# on a small dedicated pool keeps the event loop free and bounds CPU used by login bursts.
+_bcrypt_executor: ThreadPoolExecutor | None = None
+
+
+def _get_bcrypt_executor() -> ThreadPoolExecutor:
+    global _bcrypt_executor
+    if _bcrypt_executor is None:
+        _bcrypt_executor = ThreadPoolExecutor(
+            max_workers=settings.auth.bcrypt_threads, thread_name_prefix="bcrypt"
+        )
+    return _bcrypt_executor
+
+
+async def _run_bcrypt(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_get_bcrypt_executor(), fn, *args)
+
+
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(_truncate_password(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash (e.g. placeholder value): never matches
+        return False
+
+
+def _hashpw(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=settings.auth.bcrypt_rounds)
+    return bcrypt.hashpw(_truncate_password(password), salt).decode("utf-8")
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a plain password against a hashed password.
+    Verify a plain password against a hashed password (on the bcrypt thread pool).
 
     Args:
         plain_password: The plain text password
@@ -37,13 +75,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bcrypt has a 72-byte limit, so passwords are truncated to 72 bytes
         using UTF-8 encoding before verification.
     """
-    truncated = _truncate_password(plain_password)
-    return bcrypt.checkpw(truncated, hashed_password.encode("utf-8"))
+    return await _run_bcrypt(_checkpw, plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using bcrypt with BCRYPT_ROUNDS (on the bcrypt thread pool).
 
     Args:
         password: The plain text password to hash
@@ -55,9 +92,33 @@ def get_password_hash(password: str) -> str:
         bcrypt has a 72-byte limit, so passwords are truncated to 72 bytes
         using UTF-8 encoding before hashing.
     """
-    truncated = _truncate_password(password)
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(truncated, salt).decode("utf-8")
+    return await _run_bcrypt(_hashpw, password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a cost other than BCRYPT_ROUNDS ("$2b$<cost>$...")."""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return False
+    return int(parts[2]) != settings.auth.bcrypt_rounds
+
+
+async def authenticate_user(session: AsyncSession, user: User | None, password: str) -> bool:
+    """
+    Check password for a login; on success, rehash it if the stored cost is outdated.
+
+    The new hash is set on user.hashed_password and the user cache invalidation is
+    queued on session; the caller commits both together with the rest of the login update.
+
+    Returns:
+        bool: True if user exists and the password matches
+    """
+    if user is None or not await verify_password(password, user.hashed_password):
+        return False
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash(password)
+        await invalidate_user(session, user.id)
+    return True
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -122,19 +183,21 @@ def decode_refresh_token(token: str) -> TokenData:
         raise credentials_exception
 
 
-def decode_access_token(token: str) -> TokenData:
-    """
-    Decode and verify a JWT access token.
+# Verified access tokens of this worker: HMAC(secret, token) -> TokenData, kept until the token's exp.
+# Keying on the secret means rotating JWT_SECRET_KEY never serves a token verified with the old one.
+_token_cache: TTLCache[bytes, TokenData] = TTLCache(maxsize=settings.auth.token_cache_size, ttl=0)
 
-    Args:
-        token: The JWT token to decode
 
-    Returns:
-        TokenData: The decoded token data
+def _token_cache_key(token: str) -> bytes:
+    return hmac.new(
+        f"{settings.auth.jwt_algorithm}:{settings.auth.jwt_secret_key}".encode("utf-8"),
+        token.encode("utf-8"),
+        hashlib.sha256,
+    ).digest()
 
-    Raises:
-        HTTPException: If token is invalid or expired
-    """
+
+def _verify_access_token(token: str) -> tuple[TokenData, float]:
+    """Verify signature and claims of an access token; returns (token data, exp timestamp)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -151,12 +214,40 @@ def decode_access_token(token: str) -> TokenData:
         if user_id is None or email is None:
             raise credentials_exception
 
-        return TokenData(user_id=user_id, email=email)
+        return TokenData(user_id=user_id, email=email), float(payload.get("exp") or 0)
 
     except JWTError:
         raise credentials_exception
 
 
+def decode_access_token(token: str) -> TokenData:
+    """
+    Decode and verify a JWT access token.
+
+    A verified token is cached (TOKEN_CACHE_SIZE) until its exp, so repeated
+    requests with the same bearer token skip signature verification.
+
+    Args:
+        token: The JWT token to decode
+
+    Returns:
+        TokenData: The decoded token data
+
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    key = _token_cache_key(token)
+    token_data = _token_cache.get(key)
+    if token_data is not None:
+        return token_data
+
+    token_data, exp = _verify_access_token(token)
+    ttl = exp - time.time()
+    if ttl > 0:
+        _token_cache.set(key, token_data, ttl=ttl)
+    return token_data
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     session: DBSession,
@@ -179,7 +270,8 @@ async def get_current_user(
     token = credentials.credentials
     token_data = decode_access_token(token)
 
-    user = await session.get(User, token_data.user_id)
+    # Cached per worker for USER_CACHE_TTL_SECONDS (see app/utils/user_cache.py)
+    user = await get_user(session, token_data.user_id)
 
     if user is None:
         raise HTTPException(
@@ -198,17 +290,16 @@ async def get_current_user(
 
 
 async def get_current_admin(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    session: DBSession,
+    user: Annotated[User, Depends(get_current_user)],
 ) -> User:
     """
     Get the current authenticated admin user from JWT token.
 
     This is a FastAPI dependency that can be used to protect admin routes.
+    It reuses get_current_user's result (resolved once per request).
 
     Args:
-        credentials: HTTP Bearer token credentials
-        session: Database session
+        user: The authenticated user
 
     Returns:
         User: The authenticated admin user
@@ -216,7 +307,6 @@ async def get_current_admin(
     Raises:
         HTTPException: If authentication fails or user is not admin
     """
-    user = await get_current_user(credentials, session)
 
     if not user.is_admin:
         raise HTTPException(
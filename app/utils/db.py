@@ -15,17 +15,19 @@ Best Practices Implemented:
 - Type hints for better IDE support
 """
 
+import hashlib
 import logging
+import time
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
 
 from app.config import DatabaseSettings, get_settings
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,11 @@ class Database:
         self.config = config or get_settings().database
         self._engine: AsyncEngine | None = None
         self._session_maker: sessionmaker | None = None
+        # Replica engine (DATABASE_READ_URL); None when reads go to the primary
+        self._read_engine: AsyncEngine | None = None
+        # Read-only sessions (BEGIN READ ONLY): on the replica if any / on the primary
+        self._read_session_maker: sessionmaker | None = None
+        self._primary_read_session_maker: sessionmaker | None = None
 
     @property
     def engine(self) -> AsyncEngine:
@@ -64,15 +71,9 @@ class Database:
             )
         return self._session_maker
 
-    def init_db(self) -> None:
-        """
-        Initialize the database engine and session maker.
-
-        This should be called during application startup.
-        """
-        logger.info("Initializing database connection pool...")
-        self._engine = create_async_engine(
-            str(self.config.url),
+    def _create_engine(self, url: str, application_name: str) -> AsyncEngine:
+        return create_async_engine(
+            url,
             echo=self.config.echo,
             pool_size=self.config.pool_size,
             max_overflow=self.config.max_overflow,
@@ -82,19 +83,46 @@ class Database:
             # Additional PostgreSQL-specific settings
             connect_args={
                 "server_settings": {
-                    "application_name": "smart-interview-guideline",
+                    "application_name": application_name,
                     "jit": "off",  # Disable JIT for better connection performance
                 }
             },
         )
 
-        self._session_maker = sessionmaker(
-            bind=self._engine,
+    @staticmethod
+    def _create_session_maker(bind: AsyncEngine) -> sessionmaker:
+        return sessionmaker(
+            bind=bind,
             class_=SQLModelAsyncSession,
             expire_on_commit=False,
             autocommit=False,
             autoflush=False,
         )
+
+    def init_db(self) -> None:
+        """
+        Initialize the database engine and session maker.
+
+        This should be called during application startup.
+        """
+        logger.info("Initializing database connection pool...")
+        self._engine = self._create_engine(str(self.config.url), "smart-interview-guideline")
+
+        self._session_maker = self._create_session_maker(self._engine)
+        # postgresql_readonly: asyncpg starts transactions as BEGIN READ ONLY (no extra round trip)
+        self._primary_read_session_maker = self._create_session_maker(
+            self._engine.execution_options(postgresql_readonly=True)
+        )
+        if self.config.read_url:
+            self._read_engine = self._create_engine(
+                str(self.config.read_url), "smart-interview-guideline-read"
+            )
+            self._read_session_maker = self._create_session_maker(
+                self._read_engine.execution_options(postgresql_readonly=True)
+            )
+            logger.info("Read replica configured for read-only sessions")
+        else:
+            self._read_session_maker = self._primary_read_session_maker
         logger.info(
             f"Database initialized: pool_size={self.config.pool_size}, "
             f"max_overflow={self.config.max_overflow}"
@@ -102,164 +130,25 @@ class Database:
 
     async def create_db_and_tables(self) -> None:
         """
-        Create all database tables.
+        Make sure the schema is at the latest migration (app/migrations).
 
         This should be called during application startup after init_db().
-        Note: In production, use Alembic for migrations instead.
+        Normally migrations were already applied once per deploy (gunicorn
+        master, scripts/migrate.py), so this is a single version query. If the
+        database is behind, migrations run here (under the migration advisory
+        lock) unless DB_MIGRATE_ON_STARTUP=false, in which case startup fails.
         """
-        logger.info("Creating database tables...")
-        
-        # Import all models here to ensure they're registered with SQLModel
-        from app.models.example import ExampleModel  # noqa: F401
-        from app.modules.account.models import User  # noqa: F401
-        from app.modules.analysis.models import JDAnalysis  # noqa: F401
-        from app.modules.company.models import Company  # noqa: F401
-        from app.modules.contribution.models import Contribution  # noqa: F401
-        from app.modules.questions.models import (  # noqa: F401
-            AssessmentSession,
-            UserQuestionAnswer,
-        )
-        from app.modules.preparation.models import Preparation  # noqa: F401
-        from app.modules.roadmap.models import DailyTask, Roadmap  # noqa: F401
-        
-        async with self.engine.begin() as conn:
-            await conn.run_sync(SQLModel.metadata.create_all)
-            await self._run_migrations(conn)
-        logger.info("Database tables created successfully")
-
-    async def _run_migrations(self, conn) -> None:
-        """Add missing columns to existing tables (safe to run multiple times)."""
-        from sqlalchemy import text
-        # Add profile columns to users if missing (no bind params inside DO $$ - not supported by PostgreSQL)
-        for col, col_type in [
-            ("full_name", "VARCHAR(255)"),
-            ("phone", "VARCHAR(50)"),
-            ("linkedin_url", "VARCHAR(500)"),
-            ("current_company", "VARCHAR(255)"),
-            ("skills_summary", "TEXT"),
-            ("education_summary", "TEXT"),
-            ("preferred_language", "VARCHAR(10) DEFAULT 'en'"),
-        ]:
-            await conn.execute(text(f"""
-                DO $$
-                BEGIN
-                    IF NOT EXISTS (
-                        SELECT 1 FROM information_schema.columns
-                        WHERE table_name = 'users' AND column_name = '{col}'
-                    ) THEN
-                        ALTER TABLE users ADD COLUMN {col} {col_type};
-                    END IF;
-                END $$;
-            """))
-        # Add preparation_id to assessment_sessions if missing
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'assessment_sessions' AND column_name = 'preparation_id'
-                ) THEN
-                    ALTER TABLE assessment_sessions
-                    ADD COLUMN preparation_id INTEGER REFERENCES preparations(id);
-                END IF;
-            END $$;
-        """))
-        # Add preparation_id to roadmaps if missing
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'roadmaps' AND column_name = 'preparation_id'
-                ) THEN
-                    ALTER TABLE roadmaps
-                    ADD COLUMN preparation_id INTEGER REFERENCES preparations(id);
-                END IF;
-            END $$;
-        """))
-        # Make user_question_answers.question_id nullable if needed (PostgreSQL: alter column drop not null)
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'user_question_answers' AND column_name = 'question_id'
-                ) THEN
-                    ALTER TABLE user_question_answers ALTER COLUMN question_id DROP NOT NULL;
-                END IF;
-            EXCEPTION WHEN OTHERS THEN
-                NULL;
-            END $$;
-        """))
-        # Add moderation columns to contributions if missing
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'contributions' AND column_name = 'status'
-                ) THEN
-                    ALTER TABLE contributions ADD COLUMN status VARCHAR(20) DEFAULT 'pending';
-                END IF;
-            END $$;
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'contributions' AND column_name = 'approved_by_admin_id'
-                ) THEN
-                    ALTER TABLE contributions ADD COLUMN approved_by_admin_id INTEGER REFERENCES users(id);
-                END IF;
-            END $$;
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'contributions' AND column_name = 'approved_at'
-                ) THEN
-                    ALTER TABLE contributions ADD COLUMN approved_at TIMESTAMP;
-                END IF;
-            END $$;
-        """))
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'contributions' AND column_name = 'job_position'
-                ) THEN
-                    ALTER TABLE contributions ADD COLUMN job_position VARCHAR(255);
-                END IF;
-            END $$;
-        """))
-        # preparations.last_memory_scan_result (JSON) for viewing last scan result
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'preparations' AND column_name = 'last_memory_scan_result'
-                ) THEN
-                    ALTER TABLE preparations ADD COLUMN last_memory_scan_result JSONB;
-                END IF;
-            END $$;
-        """))
-        # preparations.knowledge_areas (JSON array): vùng kiến thức từ JD+profile, dùng cho memory scan / roadmap / self-check
-        await conn.execute(text("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'preparations' AND column_name = 'knowledge_areas'
-                ) THEN
-                    ALTER TABLE preparations ADD COLUMN knowledge_areas JSONB DEFAULT '[]';
-                END IF;
-            END $$;
-        """))
+        from app.migrations import check_schema_version, migrate
+
+        pending = await check_schema_version(self.engine)
+        if not pending:
+            return
+        if not self.config.migrate_on_startup:
+            raise RuntimeError(
+                f"Database schema is {pending} migration(s) behind; run scripts/migrate.py first"
+            )
+        logger.info("Database schema is %s migration(s) behind, migrating...", pending)
+        await migrate(self.engine)
 
     async def close(self) -> None:
         """
@@ -270,8 +159,13 @@ class Database:
         if self._engine:
             logger.info("Closing database connections...")
             await self._engine.dispose()
+            if self._read_engine:
+                await self._read_engine.dispose()
             self._engine = None
+            self._read_engine = None
             self._session_maker = None
+            self._read_session_maker = None
+            self._primary_read_session_maker = None
             logger.info("Database connections closed successfully")
 
     async def get_session(self) -> AsyncGenerator[SQLModelAsyncSession, None]:
@@ -296,6 +190,28 @@ class Database:
             finally:
                 await session.close()
 
+    async def get_read_session(self, *, primary: bool = False) -> AsyncGenerator[SQLModelAsyncSession, None]:
+        """
+        Get a read-only session for endpoints that only read.
+
+        Transactions are opened READ ONLY (a write raises an error) and are
+        never committed; closing the session ends them. The session uses the
+        replica (DATABASE_READ_URL) when one is configured, unless primary=True.
+
+        Yields:
+            AsyncSession: Read-only database session
+        """
+        maker = self._primary_read_session_maker if primary else self._read_session_maker
+        if maker is None:
+            raise RuntimeError("Session maker not initialized. Call init_db() first.")
+        async with maker() as session:
+            yield session
+
+    @property
+    def has_read_replica(self) -> bool:
+        """True if read-only sessions go to a replica."""
+        return self._read_engine is not None
+
 
 # Global database instance
 database = Database()
@@ -319,6 +235,92 @@ async def get_db_session() -> AsyncGenerator[SQLModelAsyncSession, None]:
 DBSession = Annotated[SQLModelAsyncSession, Depends(get_db_session)]
 
 
+# Read-your-writes: after a client's write, its reads stay on the primary for
+# DB_READ_STICKY_SECONDS (the replica may not have the write yet). The deadline is
+# returned in READ_PRIMARY_HEADER and echoed by the client on later requests, so
+# it holds whichever worker serves them; this worker also remembers it per token.
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+_recent_writers: TTLCache[str, float] = TTLCache(maxsize=10000, ttl=0)
+
+
+def _client_key(request: Request) -> str | None:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+def mark_client_write(request: Request) -> float:
+    """
+    Record that this request's client wrote; returns the time until which its reads use the primary.
+
+    Called for successful non-GET requests when a replica is configured.
+    """
+    sticky = database.config.read_sticky_seconds
+    until = time.time() + sticky
+    key = _client_key(request)
+    if key is not None and sticky > 0:
+        _recent_writers.set(key, until, ttl=sticky)
+    return until
+
+
+def read_primary_after_write(request: Request, response: Response) -> None:
+    """
+    Keep this client's next reads on the primary and tell it so in READ_PRIMARY_HEADER.
+
+    For successful writes (the read_your_writes middleware) and for responses
+    reporting that a background job finished writing on the client's behalf.
+    No-op without a replica.
+    """
+    if database.has_read_replica:
+        response.headers[READ_PRIMARY_HEADER] = f"{mark_client_write(request):.3f}"
+
+
+def _reads_from_primary(request: Request) -> bool:
+    if not database.has_read_replica:
+        return False
+    now = time.time()
+    echoed = request.headers.get(READ_PRIMARY_HEADER)
+    if echoed:
+        try:
+            # Ignore deadlines further ahead than the sticky window (client clock or tampering)
+            if now < float(echoed) <= now + database.config.read_sticky_seconds:
+                return True
+        except ValueError:
+            pass
+    key = _client_key(request)
+    return key is not None and _recent_writers.get(key) is not None
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[SQLModelAsyncSession, None]:
+    """
+    FastAPI dependency for a read-only session (replica when configured).
+
+    Use for endpoints that never write; requests from a client that wrote in the
+    last DB_READ_STICKY_SECONDS read from the primary instead.
+    """
+    async for session in database.get_read_session(primary=_reads_from_primary(request)):
+        yield session
+
+
+ReadDBSession = Annotated[SQLModelAsyncSession, Depends(get_read_db_session)]
+
+
+async def release_connection(session: SQLModelAsyncSession) -> None:
+    """
+    End the session's current transaction so its pooled connection is returned.
+
+    Call this before awaiting slow external work (LLM completions, URL fetches)
+    so the request does not pin a pool connection it is not using. Objects loaded
+    so far stay usable because sessions use expire_on_commit=False; the next query
+    on the session checks a connection out again.
+
+    Args:
+        session: Database session whose read phase is finished
+    """
+    await session.commit()
+
+
 
 
 
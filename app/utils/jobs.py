@@ -0,0 +1,268 @@
+"""
+Postgres-backed background job queue.
+
+Endpoints enqueue a Job row in their own transaction and return 202; worker
+coroutines (started in the app lifespan, or by scripts/run_worker.py) claim
+rows with SELECT ... FOR UPDATE SKIP LOCKED so several workers and processes
+never pick the same job. Failed attempts are retried with exponential backoff
+until max_attempts; handlers raise PermanentJobError for errors that retrying
+cannot fix (bad input). Jobs left "running" by a crashed worker are reclaimed
+once JOB_TIMEOUT_SECONDS has passed. A failure handler registered for a kind
+runs once when one of its jobs fails for good, to record the failure on the
+rows the job was meant to fill in.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.models.job import Job, JobStatus
+from app.utils.db import database
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Job], Awaitable[dict[str, Any] | None]]
+JobFailureHandler = Callable[[Job, str], Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+_failure_handlers: dict[str, JobFailureHandler] = {}
+_worker_tasks: list[asyncio.Task] = []
+_stop_event: asyncio.Event | None = None
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when the job must fail now without retrying."""
+
+
+def register_job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Decorator: register the coroutine that runs jobs of this kind."""
+
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def register_job_failure_handler(kind: str) -> Callable[[JobFailureHandler], JobFailureHandler]:
+    """Decorator: register the coroutine called with (job, error) when a job of this kind fails for good."""
+
+    def decorator(func: JobFailureHandler) -> JobFailureHandler:
+        _failure_handlers[kind] = func
+        return func
+
+    return decorator
+
+
+async def get_active_job(session: AsyncSession, *, kind: str, preparation_id: int) -> Job | None:
+    """The newest queued or running job of this kind for the preparation, if any."""
+    result = await session.exec(
+        select(Job)
+        .where(Job.kind == kind)
+        .where(Job.preparation_id == preparation_id)
+        .where(col(Job.status).in_(JobStatus.ACTIVE))
+        .order_by(col(Job.id).desc())
+        .limit(1)
+    )
+    return result.first()
+
+
+async def enqueue_job(
+    session: AsyncSession,
+    *,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    user_id: int | None = None,
+    preparation_id: int | None = None,
+    dedupe: bool = False,
+) -> Job:
+    """
+    Add a job to the queue (flushes; the caller commits).
+
+    Args:
+        session: Database session of the request
+        kind: Registered handler name
+        payload: JSON-serialisable handler input
+        user_id: Owner of the job
+        preparation_id: Preparation the job works on, if any
+        dedupe: Return the queued/running job of the same kind and preparation
+            instead of adding a second one
+
+    Returns:
+        The new (or existing, when deduped) job
+    """
+    if dedupe and preparation_id is not None:
+        existing = await get_active_job(session, kind=kind, preparation_id=preparation_id)
+        if existing:
+            return existing
+
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        user_id=user_id,
+        preparation_id=preparation_id,
+        max_attempts=settings.jobs.max_attempts,
+    )
+    session.add(job)
+    await session.flush()
+    return job
+
+
+async def _claim_job() -> Job | None:
+    """Lock the next runnable job, mark it running and return it (None if the queue is empty)."""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.jobs.timeout_seconds)
+    async with database.session_maker() as session:
+        result = await session.exec(
+            select(Job)
+            .where(
+                or_(
+                    and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                    and_(Job.status == JobStatus.RUNNING, Job.locked_at < stale_before),
+                )
+            )
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.first()
+        if not job:
+            return None
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.updated_at = now
+        session.add(job)
+        await session.commit()
+        return job
+
+
+async def _finish_job(job_id: int, **values: Any) -> None:
+    async with database.session_maker() as session:
+        job = await session.get(Job, job_id)
+        if not job:
+            return
+        for key, value in values.items():
+            setattr(job, key, value)
+        job.updated_at = datetime.utcnow()
+        session.add(job)
+        await session.commit()
+
+
+async def _run_failure_handler(job: Job, error: str) -> None:
+    failure_handler = _failure_handlers.get(job.kind)
+    if failure_handler is None:
+        return
+    try:
+        await failure_handler(job, error)
+    except Exception:
+        logger.exception("Failure handler of job %s (%s) failed", job.id, job.kind)
+
+
+async def run_job(job: Job) -> None:
+    """Run a claimed job and record success, a scheduled retry, or failure."""
+    handler = _handlers.get(job.kind)
+    if handler is None:
+        logger.error("No handler registered for job kind %r (job %s)", job.kind, job.id)
+        await _finish_job(
+            job.id,
+            status=JobStatus.FAILED,
+            error=f"Unknown job kind: {job.kind}",
+            finished_at=datetime.utcnow(),
+        )
+        return
+
+    try:
+        result = await asyncio.wait_for(handler(job), timeout=settings.jobs.timeout_seconds)
+    except asyncio.CancelledError:
+        # Worker shutting down: put the job back so another worker picks it up
+        await _finish_job(job.id, status=JobStatus.QUEUED, attempts=job.attempts - 1, locked_at=None)
+        raise
+    except Exception as e:
+        permanent = isinstance(e, PermanentJobError)
+        if permanent or job.attempts >= job.max_attempts:
+            logger.exception("Job %s (%s) failed after %s attempt(s)", job.id, job.kind, job.attempts)
+            error = str(e) or e.__class__.__name__
+            await _finish_job(
+                job.id,
+                status=JobStatus.FAILED,
+                error=error,
+                locked_at=None,
+                finished_at=datetime.utcnow(),
+            )
+            await _run_failure_handler(job, error)
+        else:
+            delay = settings.jobs.retry_backoff_seconds * (2 ** (job.attempts - 1))
+            logger.warning(
+                "Job %s (%s) attempt %s failed, retrying in %.0fs: %s",
+                job.id, job.kind, job.attempts, delay, e,
+            )
+            await _finish_job(
+                job.id,
+                status=JobStatus.QUEUED,
+                error=str(e) or e.__class__.__name__,
+                locked_at=None,
+                run_after=datetime.utcnow() + timedelta(seconds=delay),
+            )
+        return
+
+    await _finish_job(
+        job.id,
+        status=JobStatus.SUCCEEDED,
+        result=result,
+        error=None,
+        locked_at=None,
+        finished_at=datetime.utcnow(),
+    )
+
+
+async def _worker_loop(worker_index: int, stop_event: asyncio.Event) -> None:
+    logger.info("Job worker %s started", worker_index)
+    while not stop_event.is_set():
+        try:
+            job = await _claim_job()
+        except Exception as e:
+            logger.warning("Job worker %s could not claim a job: %s", worker_index, e)
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=settings.jobs.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await run_job(job)
+    logger.info("Job worker %s stopped", worker_index)
+
+
+def start_job_workers(count: int | None = None) -> None:
+    """Start worker coroutines on the running event loop (JOB_WORKERS by default)."""
+    global _stop_event
+    count = settings.jobs.workers if count is None else count
+    if count <= 0 or _worker_tasks:
+        return
+    _stop_event = asyncio.Event()
+    for i in range(count):
+        _worker_tasks.append(asyncio.create_task(_worker_loop(i, _stop_event)))
+    logger.info("Started %s job worker(s); handlers: %s", count, sorted(_handlers))
+
+
+async def stop_job_workers() -> None:
+    """Stop workers; a job still running is cancelled and re-queued."""
+    if _stop_event is not None:
+        _stop_event.set()
+    for task in _worker_tasks:
+        task.cancel()
+    await asyncio.gather(*_worker_tasks, return_exceptions=True)
+    _worker_tasks.clear()
+
+
+async def wait_for_job_workers() -> None:
+    """Block until the workers exit (used by scripts/run_worker.py)."""
+    await asyncio.gather(*_worker_tasks, return_exceptions=True)
@@ -0,0 +1,275 @@
+"""
+Content-addressed cache for LLM completions.
+
+Two tiers: an in-process LRU (per worker) in front of the llm_cache Postgres
+table (shared by all workers). Entries are keyed by a SHA-256 of the model,
+messages, temperature and max_tokens, so any change to the prompt is a miss.
+Call sites opt in with cache=True; OPENAI_CACHE_ENABLED=false bypasses both
+tiers globally. Cache failures are logged and never fail the LLM call.
+Expired rows are deleted in the background after a write, at most once per
+OPENAI_CACHE_PURGE_INTERVAL_SECONDS per worker.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Any
+
+from openai import NOT_GIVEN
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import col, select
+
+from app.config import settings
+from app.models.llm_cache import LLMCacheEntry
+from app.utils.cache import TTLCache
+from app.utils.db import database
+from app.utils.openai_client import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+_memory_cache: TTLCache[str, str] = TTLCache(
+    maxsize=settings.openai.cache_memory_entries,
+    ttl=settings.openai.cache_ttl_seconds,
+)
+
+_stats = {
+    "memory_hits": 0,
+    "db_hits": 0,
+    "misses": 0,
+    "writes": 0,
+    "errors": 0,
+    "bypassed": 0,
+    "purged": 0,
+}
+
+# Rows deleted per statement when purging expired entries (keeps each transaction short)
+_PURGE_BATCH_SIZE = 1000
+_last_purge = float("-inf")
+_purge_task: asyncio.Task | None = None
+
+
+def make_llm_cache_key(
+    *,
+    model: str,
+    messages: list[dict[str, Any]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """SHA-256 hex digest of the request parameters that determine the completion."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _db_get(key: str) -> str | None:
+    async with database.session_maker() as session:
+        result = await session.exec(
+            select(LLMCacheEntry.content).where(
+                LLMCacheEntry.key == key,
+                LLMCacheEntry.expires_at > datetime.utcnow(),
+            )
+        )
+        return result.first()
+
+
+async def _db_set(key: str, model: str, content: str) -> None:
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=settings.openai.cache_ttl_seconds)
+    stmt = pg_insert(LLMCacheEntry).values(
+        key=key, model=model, content=content, created_at=now, expires_at=expires_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LLMCacheEntry.key],
+        set_={"content": stmt.excluded.content, "created_at": now, "expires_at": expires_at},
+    )
+    async with database.session_maker() as session:
+        await session.execute(stmt)
+        await session.commit()
+
+
+async def _purge_expired() -> None:
+    """Delete expired llm_cache rows in batches (uses the expires_at index)."""
+    try:
+        while True:
+            expired = (
+                select(LLMCacheEntry.key)
+                .where(LLMCacheEntry.expires_at < datetime.utcnow())
+                .limit(_PURGE_BATCH_SIZE)
+            )
+            async with database.session_maker() as session:
+                result = await session.execute(delete(LLMCacheEntry).where(col(LLMCacheEntry.key).in_(expired)))
+                await session.commit()
+            _stats["purged"] += result.rowcount
+            if result.rowcount < _PURGE_BATCH_SIZE:
+                return
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("LLM cache purge failed: %s", e)
+
+
+def _maybe_purge_expired() -> None:
+    """Start a background purge when this worker has not run one for the purge interval."""
+    global _last_purge, _purge_task
+    interval = settings.openai.cache_purge_interval_seconds
+    now = time.monotonic()
+    if interval <= 0 or now - _last_purge < interval or (_purge_task and not _purge_task.done()):
+        return
+    _last_purge = now
+    _purge_task = asyncio.create_task(_purge_expired())
+
+
+async def get_cached_completion(key: str) -> str | None:
+    """Look up a completion in memory, then in Postgres (promoting DB hits to memory)."""
+    content = _memory_cache.get(key)
+    if content is not None:
+        _stats["memory_hits"] += 1
+        return content
+    try:
+        content = await _db_get(key)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("LLM cache read failed: %s", e)
+        content = None
+    if content is None:
+        _stats["misses"] += 1
+        return None
+    _stats["db_hits"] += 1
+    _memory_cache.set(key, content)
+    return content
+
+
+async def set_cached_completion(key: str, model: str, content: str) -> None:
+    """Store a completion in both tiers."""
+    _memory_cache.set(key, content)
+    try:
+        await _db_set(key, model, content)
+        _stats["writes"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("LLM cache write failed: %s", e)
+        return
+    _maybe_purge_expired()
+
+
+async def cached_chat_completion(
+    *,
+    messages: list[dict[str, Any]],
+    temperature: float,
+    max_tokens: int,
+    timeout: float | None = None,
+    model: str | None = None,
+    cache: bool = True,
+) -> str:
+    """
+    Return the completion text for messages, serving repeats from the cache.
+
+    Args:
+        messages: Chat messages sent to chat.completions.create
+        temperature: Sampling temperature (part of the cache key)
+        max_tokens: Completion token limit (part of the cache key)
+        timeout: Per-call HTTP timeout in seconds
+        model: Model name; defaults to OPENAI_MODEL
+        cache: False to bypass the cache for this call (always calls the LLM)
+
+    Returns:
+        The stripped message content ("" if the model returned nothing). Empty
+        completions are not cached. Errors from the LLM call propagate.
+    """
+    model = model or settings.openai.model
+    use_cache = cache and settings.openai.cache_enabled
+    key = None
+    if use_cache:
+        key = make_llm_cache_key(
+            model=model, messages=messages, temperature=temperature, max_tokens=max_tokens
+        )
+        cached = await get_cached_completion(key)
+        if cached is not None:
+            return cached
+    else:
+        _stats["bypassed"] += 1
+
+    client = get_openai_client()
+    response = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=timeout if timeout is not None else NOT_GIVEN,
+    )
+    content = (response.choices[0].message.content or "").strip()
+    if key is not None and content:
+        await set_cached_completion(key, model, content)
+    return content
+
+
+async def stream_chat_completion(
+    *,
+    messages: list[dict[str, Any]],
+    temperature: float,
+    max_tokens: int,
+    timeout: float | None = None,
+    model: str | None = None,
+    cache: bool = True,
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of cached_chat_completion: yield content deltas as they arrive.
+
+    Shares the cache key with cached_chat_completion, so a cache hit yields the
+    whole completion as one chunk and a fully streamed completion is stored for
+    later callers of either function. Errors from the LLM call propagate.
+    """
+    model = model or settings.openai.model
+    use_cache = cache and settings.openai.cache_enabled
+    key = None
+    if use_cache:
+        key = make_llm_cache_key(
+            model=model, messages=messages, temperature=temperature, max_tokens=max_tokens
+        )
+        cached = await get_cached_completion(key)
+        if cached is not None:
+            yield cached
+            return
+    else:
+        _stats["bypassed"] += 1
+
+    client = get_openai_client()
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=timeout if timeout is not None else NOT_GIVEN,
+        stream=True,
+    )
+    parts: list[str] = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    content = "".join(parts).strip()
+    if key is not None and content:
+        await set_cached_completion(key, model, content)
+
+
+def get_llm_cache_stats() -> dict[str, Any]:
+    """Hit/miss counters for this worker process."""
+    lookups = _stats["memory_hits"] + _stats["db_hits"] + _stats["misses"]
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    return {
+        "enabled": settings.openai.cache_enabled,
+        **_stats,
+        "hit_ratio": round(hits / lookups, 3) if lookups else None,
+        "memory_entries": len(_memory_cache),
+    }
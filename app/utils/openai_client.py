@@ -1,14 +1,129 @@
-"""Factory for OpenAI-compatible API client (supports custom base_url)."""
+"""Process-wide OpenAI-compatible API client (supports custom base_url).
 
+One AsyncOpenAI client (and one httpx connection pool) is shared by every call
+site in a worker, so TLS handshakes and keep-alive connections are reused.
+It is created in the app lifespan and closed on shutdown; scripts that never
+run the lifespan get it lazily on first use.
+"""
+
+import importlib.util
+import logging
+from typing import Any
+
+import httpx
 from openai import AsyncOpenAI
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+_client: AsyncOpenAI | None = None
+_http_client: httpx.AsyncClient | None = None
+_http2_enabled = False
+
+# Counters for connection reuse: requests sent vs. new TCP connections opened
+_requests_total = 0
+_connections_opened_total = 0
+
+
+async def _trace(event_name: str, info: dict[str, Any]) -> None:
+    """httpcore trace hook: count new connections."""
+    global _connections_opened_total
+    if event_name == "connection.connect_tcp.complete":
+        _connections_opened_total += 1
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """httpx request hook: count requests and attach the connection trace."""
+    global _requests_total
+    _requests_total += 1
+    request.extensions["trace"] = _trace
+
+
+def init_openai_client() -> AsyncOpenAI:
+    """
+    Create the shared AsyncOpenAI client for this process (idempotent).
+
+    Pool limits, keep-alive and HTTP/2 come from OpenAISettings. HTTP/2 is off by
+    default and only enabled when OPENAI_HTTP2=true and the optional 'h2' package
+    (httpx[http2], not a project dependency) is installed; httpx negotiates it via
+    ALPN and falls back to HTTP/1.1 for endpoints that do not support it.
+    """
+    global _client, _http_client, _http2_enabled
+    if _client is not None:
+        return _client
+
+    config = settings.openai
+    _http2_enabled = config.http2 and importlib.util.find_spec("h2") is not None
+    if config.http2 and not _http2_enabled:
+        logger.info("OPENAI_HTTP2 is on but the 'h2' package is not installed; using HTTP/1.1")
+
+    _http_client = httpx.AsyncClient(
+        http2=_http2_enabled,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        event_hooks={"request": [_on_request]},
+    )
+    base_url = (config.base_url or "").strip() or None
+    _client = AsyncOpenAI(
+        api_key=config.api_key,
+        base_url=base_url,
+        http_client=_http_client,
+        max_retries=config.max_retries,
+    )
+    logger.info(
+        "OpenAI client initialized: max_connections=%s, keepalive=%s, http2=%s",
+        config.max_connections,
+        config.max_keepalive_connections,
+        _http2_enabled,
+    )
+    return _client
+
+
+async def close_openai_client() -> None:
+    """Close the shared client and its connection pool (called on shutdown)."""
+    global _client, _http_client
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _http_client = None
+
 
 def get_openai_client() -> AsyncOpenAI:
     """
-    Return an AsyncOpenAI client with optional custom base_url.
+    Return the shared AsyncOpenAI client with optional custom base_url.
     Set OPENAI_BASE_URL in env for OpenAI-compatible endpoints (Azure, local, etc.).
+    Pass timeout=... per call (chat.completions.create) for call-site specific limits.
+    """
+    return _client or init_openai_client()
+
+
+def get_openai_pool_stats() -> dict[str, Any]:
+    """
+    Snapshot of the shared HTTP connection pool.
+
+    connection_reuse_ratio is the share of requests that did not need a new
+    TCP connection (1.0 = every request reused a pooled connection).
     """
-    base_url = (settings.openai.base_url or "").strip() or None
-    return AsyncOpenAI(api_key=settings.openai.api_key, base_url=base_url)
+    pool = getattr(getattr(_http_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", None) or [])
+    idle = sum(1 for conn in connections if conn.is_idle())
+    reuse_ratio = (
+        round(1 - _connections_opened_total / _requests_total, 3) if _requests_total else None
+    )
+    return {
+        "initialized": _client is not None,
+        "http2": _http2_enabled,
+        "max_connections": settings.openai.max_connections,
+        "max_keepalive_connections": settings.openai.max_keepalive_connections,
+        "connections_open": len(connections),
+        "connections_idle": idle,
+        "connections_active": len(connections) - idle,
+        "requests_total": _requests_total,
+        "connections_opened_total": _connections_opened_total,
+        "connection_reuse_ratio": reuse_ratio,
+    }
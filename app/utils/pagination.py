@@ -0,0 +1,172 @@
+"""
+Keyset (cursor) pagination and cheap totals for admin list endpoints.
+
+Cursors are opaque URL-safe strings encoding the sort key name, direction and
+the (sort value, id) of the last row of the page. The next page is fetched with
+WHERE (sort, id) < (value, id) (or > for ascending) on an index-friendly ORDER BY,
+so deep pages cost the same as the first one.
+
+Totals: exact count(*) on request; otherwise pg_class.reltuples for unfiltered
+lists of large tables and a short-TTL per-worker cache for filtered ones.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, literal, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import ColumnElement, Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.utils.cache import TTLCache
+
+# Tables smaller than this get an exact count even for unfiltered lists
+ESTIMATE_MIN_ROWS = 10_000
+# Filtered totals are reused for this many seconds per worker
+COUNT_CACHE_TTL_SECONDS = 30.0
+
+_count_cache: TTLCache[tuple[str, str], int] = TTLCache(maxsize=1024, ttl=COUNT_CACHE_TTL_SECONDS)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(sort_key: str, descending: bool, sort_value: Any, row_id: int) -> str:
+    """Opaque cursor pointing after the row (sort_value, row_id)."""
+    payload = {"s": sort_key, "d": descending, "v": _encode_value(sort_value), "i": row_id}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, sort_key: str, descending: bool) -> tuple[Any, int]:
+    """
+    (sort_value, row_id) from a cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for another sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != sort_key or payload["d"] != descending:
+            raise ValueError("cursor sort mismatch")
+        return _decode_value(payload["v"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor for this sort order",
+        )
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: Select,
+    *,
+    sort_key: str,
+    sort_expr: ColumnElement,
+    id_column: ColumnElement,
+    descending: bool,
+    page_size: int,
+    cursor: str | None = None,
+    page: int = 1,
+) -> tuple[list[Any], str | None]:
+    """
+    One page of statement ordered by (sort_expr, id_column).
+
+    With a cursor the page is selected by keyset; without one, page (1-indexed)
+    falls back to OFFSET so numbered jumps keep working. Either way the result
+    carries the cursor of the next page (None on the last page).
+
+    Args:
+        session: Database session
+        statement: select(Entity) (or select of columns) with filters applied, without ORDER BY/LIMIT
+        sort_key: Public name of the sort (bound into the cursor)
+        sort_expr: Column or expression to sort by (must not be NULL)
+        id_column: Unique tiebreaker column
+        descending: Sort direction
+        page_size: Rows per page
+        cursor: Cursor returned by the previous page
+        page: Page number, used only without a cursor
+
+    Returns:
+        (entities of the page, or result rows for a multi-column select; next cursor)
+    """
+    sort_label = sort_expr.label("_sort_value")
+    stmt = statement.add_columns(sort_label, id_column.label("_row_id"))
+    if cursor:
+        after_value, after_id = decode_cursor(cursor, sort_key, descending)
+        # Row comparison, so Postgres can range-scan an index on (sort, id)
+        key = tuple_(sort_expr, id_column)
+        after = tuple_(literal(after_value, sort_expr.type), literal(after_id, id_column.type))
+        stmt = stmt.where(key < after if descending else key > after)
+    elif page > 1:
+        stmt = stmt.offset((page - 1) * page_size)
+    if descending:
+        stmt = stmt.order_by(sort_expr.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_expr.asc(), id_column.asc())
+    # One extra row tells whether there is a next page
+    result = await session.execute(stmt.limit(page_size + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, descending, last._sort_value, last._row_id)
+    if len(statement.selected_columns) == 1:
+        return [row[0] for row in rows], next_cursor
+    return rows, next_cursor
+
+
+async def count_rows(
+    session: AsyncSession,
+    statement: Select,
+    *,
+    table: str,
+    filtered: bool,
+    exact: bool = False,
+) -> tuple[int, bool]:
+    """
+    Total rows of statement: (total, is_estimate).
+
+    exact: always run count(*). Unfiltered lists of tables with at least
+    ESTIMATE_MIN_ROWS rows use the planner estimate (pg_class.reltuples);
+    filtered counts are cached per worker for COUNT_CACHE_TTL_SECONDS.
+    """
+    count_statement = select(func.count()).select_from(statement.order_by(None).subquery())
+    if exact:
+        return (await session.execute(count_statement)).scalar_one(), False
+
+    if not filtered:
+        estimate = (
+            await session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": table},
+            )
+        ).scalar_one_or_none()
+        if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+            return int(estimate), True
+        return (await session.execute(count_statement)).scalar_one(), False
+
+    compiled = count_statement.compile(dialect=postgresql.dialect())
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    cached = _count_cache.get(key)
+    if cached is not None:
+        return cached, True
+    total = (await session.execute(count_statement)).scalar_one()
+    _count_cache.set(key, total)
+    return total, False
@@ -0,0 +1,61 @@
+"""
+Count SQL statements sent to the database, to pin query counts of endpoints.
+
+    with assert_max_queries(conn, 1):
+        await admin_list_contributions(...)
+
+Works with sync/async engines and connections (listens on before_cursor_execute).
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+
+
+@dataclass
+class QueryCounter:
+    """Statements executed inside a count_queries() block."""
+
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def _sync_target(target: Any) -> Any:
+    # AsyncConnection / AsyncEngine expose the sync object events are registered on
+    return getattr(target, "sync_connection", None) or getattr(target, "sync_engine", None) or target
+
+
+@contextmanager
+def count_queries(target: Any) -> Iterator[QueryCounter]:
+    """Record every statement executed on target (engine or connection) inside the block."""
+    counter = QueryCounter()
+    sync_target = _sync_target(target)
+
+    def _record(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        counter.statements.append(statement)
+
+    event.listen(sync_target, "before_cursor_execute", _record)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_target, "before_cursor_execute", _record)
+
+
+@contextmanager
+def assert_max_queries(target: Any, expected: int) -> Iterator[QueryCounter]:
+    """
+    Like count_queries, failing with AssertionError if more than expected statements ran.
+
+    The message lists the statements, so an N+1 regression is visible right away.
+    """
+    with count_queries(target) as counter:
+        yield counter
+    if counter.count > expected:
+        listing = "\n".join(f"  {i + 1}. {s.strip()[:200]}" for i, s in enumerate(counter.statements))
+        raise AssertionError(f"Expected at most {expected} queries, got {counter.count}:\n{listing}")
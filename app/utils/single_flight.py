@@ -0,0 +1,46 @@
+"""In-process single-flight: concurrent callers with the same key share one execution."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent work per key within one worker process.
+
+    The first caller starts func() as a task; callers arriving while it runs
+    await the same task. The task is shielded, so a caller that is cancelled
+    (e.g. client disconnect) does not cancel the work for the others. Once the
+    task finishes the key is forgotten and the next call starts fresh work.
+    Cross-process deduplication needs a DB-level claim on top of this.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func() for key, or join the run already in flight."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        return await asyncio.shield(future)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether work for key is currently running in this process."""
+        return key in self._inflight
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved when every caller has gone away
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
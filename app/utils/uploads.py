@@ -0,0 +1,76 @@
+"""
+Streamed, size-capped file uploads.
+
+UploadFile contents are copied to disk in UPLOAD_CHUNK_SIZE chunks with the
+blocking file I/O on a thread, so an upload never sits in memory as one bytes
+object and the copy stops as soon as the size cap is exceeded. (Starlette keeps
+at most 1 MB of each multipart file in memory and spools the rest to disk
+while parsing the request.)
+"""
+
+import asyncio
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"File too large. Maximum size is {round(max_bytes / (1024 * 1024), 1):g} MB",
+    )
+
+
+async def save_upload(upload: UploadFile, dest: Path, *, max_bytes: int) -> int:
+    """
+    Stream upload into dest; returns the number of bytes written.
+
+    Raises:
+        HTTPException: 413 as soon as more than max_bytes are read (dest is removed)
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+    fh = await asyncio.to_thread(open, dest, "wb")
+    written = 0
+    try:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_bytes:
+                raise _too_large(max_bytes)
+            await asyncio.to_thread(fh.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(fh.close)
+        dest.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(fh.close)
+    return written
+
+
+@asynccontextmanager
+async def upload_to_temp_file(
+    upload: UploadFile,
+    *,
+    max_bytes: int,
+    directory: Path | None = None,
+) -> AsyncIterator[Path]:
+    """
+    Stream upload into a temporary file and yield its path; the file is removed on exit.
+
+    To keep the file, move it inside the block (os.replace); pass the final
+    directory as directory so the move is a rename on the same filesystem.
+    """
+    suffix = Path(upload.filename or "").suffix.lower()
+    fd, name = tempfile.mkstemp(prefix=".upload-", suffix=suffix, dir=directory)
+    os.close(fd)
+    path = Path(name)
+    try:
+        await save_upload(upload, path, max_bytes=max_bytes)
+        yield path
+    finally:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,188 @@
+"""
+Per-worker cache of authenticated users, so get_current_user does not hit the DB per request.
+
+The row of each user seen by get_current_user is kept for USER_CACHE_TTL_SECONDS
+in a TTLCache, limited to _CACHED_FIELDS (never hashed_password); a hit builds a User from the cached values and attaches it to the
+request session with merge(load=False), which emits no SQL, so endpoints that need
+nothing else never check out a pooled connection. Fields left out are expired on
+that instance and must be loaded explicitly (session.refresh(user, [...])).
+
+Writes that change a user (profile, CV, ban/unban, admin flag) call
+invalidate_user() before committing: it drops the entry here and queues a
+pg_notify on USER_CACHE_CHANNEL inside the same transaction, so it is delivered
+only if the write commits. Every worker LISTENs on that channel on a dedicated
+asyncpg connection and drops the entry too. While that connection is down the
+cache is bypassed (and emptied), since invalidations could be missed.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.modules.account.models import User
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_CHANNEL = "user_cache_invalidate"
+# Seconds between keepalive queries on the LISTEN connection / before reconnecting
+_LISTENER_CHECK_SECONDS = 30.0
+_LISTENER_RETRY_SECONDS = 5.0
+
+# Columns endpoints read from current_user; credentials stay out of the cache
+_CACHED_FIELDS = (
+    "id",
+    "email",
+    "is_active",
+    "is_admin",
+    "full_name",
+    "phone",
+    "linkedin_url",
+    "current_company",
+    "skills_summary",
+    "education_summary",
+    "role",
+    "experience_years",
+    "cv_path",
+    "preferred_language",
+    "created_at",
+    "updated_at",
+)
+
+_cache: TTLCache[int, dict[str, Any]] = TTLCache(
+    maxsize=settings.auth.user_cache_size, ttl=settings.auth.user_cache_ttl_seconds
+)
+_listener_task: asyncio.Task | None = None
+_listening = False
+# Bumped on every invalidation: a row loaded before one is not cached (it may be stale)
+_generation = 0
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "listener_reconnects": 0}
+
+
+def _enabled() -> bool:
+    return _listening and settings.auth.user_cache_ttl_seconds > 0
+
+
+def _forget(user_id: int | None) -> None:
+    """Drop one user (or every user when user_id is None) from this worker's cache."""
+    global _generation
+    _generation += 1
+    _stats["invalidations"] += 1
+    if user_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(user_id)
+
+
+async def get_user(session: AsyncSession, user_id: int) -> User | None:
+    """
+    User by id: from this worker's cache when present, else from the DB (and cached).
+
+    The returned instance belongs to session, so handlers can modify and commit it.
+    """
+    values = _cache.get(user_id) if _enabled() else None
+    if values is not None:
+        _stats["hits"] += 1
+        cached = User(**values)
+        make_transient_to_detached(cached)
+        return await session.merge(cached, load=False)
+
+    _stats["misses"] += 1
+    generation = _generation
+    user = await session.get(User, user_id)
+    if user is not None and _enabled() and generation == _generation:
+        _cache.set(user_id, user.model_dump(include=set(_CACHED_FIELDS)))
+    return user
+
+
+async def invalidate_user(session: AsyncSession, user_id: int) -> None:
+    """
+    Drop user_id from the user cache of every worker once session commits.
+
+    Call before session.commit() in any write that changes a User row.
+    """
+    _forget(user_id)
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": USER_CACHE_CHANNEL, "payload": str(user_id)},
+    )
+
+
+def _on_notify(_conn, _pid: int, _channel: str, payload: str) -> None:
+    try:
+        _forget(int(payload))
+    except ValueError:
+        _forget(None)
+
+
+async def _listen_loop() -> None:
+    global _listening
+    url = make_url(str(settings.database.url)).set(drivername="postgresql")
+    dsn = url.render_as_string(hide_password=False)
+    while True:
+        try:
+            conn = await asyncpg.connect(dsn)
+        except Exception as e:
+            logger.warning("User cache listener cannot connect (cache bypassed): %s", e)
+            await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+            continue
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _c: lost.set())
+        try:
+            await conn.add_listener(USER_CACHE_CHANNEL, _on_notify)
+            _cache.clear()
+            _listening = True
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=_LISTENER_CHECK_SECONDS)
+                except TimeoutError:
+                    await conn.execute("SELECT 1")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("User cache listener connection lost: %s", e)
+        finally:
+            _listening = False
+            _cache.clear()
+            if not conn.is_closed():
+                conn.terminate()
+        _stats["listener_reconnects"] += 1
+        await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+
+def start_user_cache_listener() -> None:
+    """Start listening for invalidations on the running event loop (no-op when USER_CACHE_TTL_SECONDS=0)."""
+    global _listener_task
+    if settings.auth.user_cache_ttl_seconds <= 0 or _listener_task is not None:
+        return
+    _listener_task = asyncio.create_task(_listen_loop())
+
+
+async def stop_user_cache_listener() -> None:
+    """Stop the listener; the cache is bypassed afterwards."""
+    global _listener_task
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    await asyncio.gather(_listener_task, return_exceptions=True)
+    _listener_task = None
+
+
+def get_user_cache_stats() -> dict[str, Any]:
+    """User cache metrics for this worker process."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "enabled": _enabled(),
+        "ttl_seconds": settings.auth.user_cache_ttl_seconds,
+        "size": len(_cache),
+        "max_size": settings.auth.user_cache_size,
+        **_stats,
+        "hit_ratio": round(_stats["hits"] / lookups, 3) if lookups else None,
+    }
@@ -50,8 +50,13 @@ reload_extra_files = []
 
 # Server hooks
 def on_starting(server):
-    """Called just before the master process is initialized."""
-    pass
+    """Called just before the master process is initialized: apply pending DB migrations once."""
+    import asyncio
+
+    from app.migrations import migrate_database
+
+    applied = asyncio.run(migrate_database())
+    server.log.info("Database migrations applied: %s", applied or "none (up to date)")
 
 def on_reload(server):
     """Called to recycle workers during a reload via SIGHUP."""
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark latency of an unrelated endpoint (GET /health) during a login storm.
+
+Runs against a live server: one client loop probes --probe-path at a fixed rate
+while --concurrency clients repeatedly POST /api/auth/login. Reports p50/p99/max
+probe latency without load and under the storm, plus login throughput.
+
+Start the server with a single worker (WORKERS=1) so every login lands on the
+same event loop as the probes. With bcrypt on the event loop, probe p99 grows
+to roughly the bcrypt cost times the number of queued logins; with bcrypt on
+the thread pool it should stay close to the idle value.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    if not latencies:
+        print(f"{label:<8} no samples")
+        return
+    print(
+        f"{label:<8} n={len(latencies):<5} p50={statistics.median(latencies):7.1f} ms  "
+        f"p99={_percentile(latencies, 99):7.1f} ms  max={max(latencies):7.1f} ms"
+    )
+
+
+async def _probe(client: httpx.AsyncClient, path: str, interval: float, stop: asyncio.Event) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def _login_loop(client: httpx.AsyncClient, email: str, password: str, stop: asyncio.Event) -> int:
+    logins = 0
+    while not stop.is_set():
+        response = await client.post("/api/auth/login", json={"email": email, "password": password})
+        if response.status_code != 200:
+            raise SystemExit(f"Login failed with {response.status_code}: {response.text[:200]}")
+        logins += 1
+    return logins
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, args.probe_path, args.interval, stop))
+        await asyncio.sleep(args.duration)
+        stop.set()
+        _report("idle", await probe)
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, args.probe_path, args.interval, stop))
+        storm = [
+            asyncio.create_task(_login_loop(client, args.email, args.password, stop))
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        logins = sum(await asyncio.gather(*storm))
+        _report("storm", await probe)
+        print(f"logins   {logins} in {args.duration:g}s ({logins / args.duration:.1f}/s, concurrency {args.concurrency})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="Server base URL")
+    parser.add_argument("--email", required=True, help="Existing user to log in as")
+    parser.add_argument("--password", required=True, help="Password of that user")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.02, help="Seconds between probes")
+    parser.add_argument("--probe-path", default="/health", help="Endpoint probed for latency")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark plain GET latency and throughput while roadmap generations wait on a slow LLM.
+
+Runs the app in-process (httpx ASGI transport) against DATABASE_URL with the
+OpenAI client replaced by a stub that streams each roadmap item slowly
+(--llm-seconds per item), so no API key or network is needed. It creates a
+throwaway user with --generations preparations ready for step 3, then:
+
+1. idle: --probe-clients loop on GET /api/preparations/{id} for --duration s
+2. load: the same probes while --generations roadmap streams
+   (GET /api/preparations/{id}/roadmap/stream) run concurrently
+
+and reports probe p50/p99/max latency, probe throughput and the most pool
+connections checked out. If LLM awaits held pooled connections, probes would
+queue for a connection (up to DB_POOL_TIMEOUT) once generations exceed
+pool_size + max_overflow; with short transaction phases they stay flat.
+The bench user and everything it created are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import types
+import uuid
+from pathlib import Path
+
+# Stub LLM: needs an API key to take the LLM code paths, and no cache so every item "calls" it
+os.environ.setdefault("OPENAI_API_KEY", "bench-stub")
+os.environ["OPENAI_CACHE_ENABLED"] = "false"
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from sqlalchemy import text
+
+from app import create_app
+from app.modules.account.models import User
+from app.modules.analysis.models import JDAnalysis
+from app.modules.preparation.models import Preparation, PreparationStatus
+from app.modules.questions.models import AssessmentSession
+from app.utils import llm_cache
+from app.utils.auth import create_access_token
+from app.utils.db import database
+
+KNOWLEDGE_AREAS = ["Python", "SQL", "System design", "Testing", "Networking"]
+
+
+class _StubStream:
+    """Async iterator of chat completion chunks, one every delay seconds."""
+
+    def __init__(self, chunks: int, delay: float) -> None:
+        self._remaining = chunks
+        self._delay = delay
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._remaining <= 0:
+            raise StopAsyncIteration
+        self._remaining -= 1
+        await asyncio.sleep(self._delay)
+        delta = types.SimpleNamespace(content="lorem ipsum ")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)])
+
+
+def _stub_openai_client(llm_seconds: float, chunks: int = 20):
+    async def create(**kwargs):
+        return _StubStream(chunks, llm_seconds / chunks)
+
+    completions = types.SimpleNamespace(create=create)
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _report(label: str, latencies: list[float], seconds: float) -> None:
+    if not latencies:
+        print(f"{label:<6} no samples")
+        return
+    print(
+        f"{label:<6} n={len(latencies):<6} {len(latencies) / seconds:7.1f} req/s  "
+        f"p50={statistics.median(latencies):7.1f} ms  p99={_percentile(latencies, 99):7.1f} ms  "
+        f"max={max(latencies):7.1f} ms"
+    )
+
+
+async def _setup(generations: int) -> tuple[int, str, list[int]]:
+    """Bench user + preparations with memory scan done; returns (user_id, token, preparation ids)."""
+    async with database.session_maker() as session:
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", hashed_password="!")
+        session.add(user)
+        await session.flush()
+        questions = [{"question_text": f"Q{i}", "knowledge_area": area} for i, area in enumerate(KNOWLEDGE_AREAS)]
+        prep_ids = []
+        for _ in range(generations):
+            jd = JDAnalysis(user_id=user.id, raw_text="Bench JD", extracted_keywords={"skills": KNOWLEDGE_AREAS})
+            session.add(jd)
+            await session.flush()
+            prep = Preparation(
+                user_id=user.id,
+                jd_analysis_id=jd.id,
+                status=PreparationStatus.MEMORY_SCAN_DONE,
+                knowledge_areas=KNOWLEDGE_AREAS,
+                memory_scan_questions=questions,
+            )
+            session.add(prep)
+            await session.flush()
+            session.add(AssessmentSession(user_id=user.id, preparation_id=prep.id, session_type="memory_scan"))
+            prep_ids.append(prep.id)
+        await session.commit()
+        token = create_access_token(data={"user_id": user.id, "email": user.email})
+        return user.id, token, prep_ids
+
+
+async def _cleanup(user_id: int) -> None:
+    statements = [
+        "DELETE FROM daily_tasks WHERE roadmap_id IN (SELECT id FROM roadmaps WHERE user_id = :user_id)",
+        "UPDATE preparations SET roadmap_id = NULL WHERE user_id = :user_id",
+        "DELETE FROM roadmaps WHERE user_id = :user_id",
+        "DELETE FROM assessment_sessions WHERE user_id = :user_id",
+        "DELETE FROM jobs WHERE user_id = :user_id",
+        "DELETE FROM preparations WHERE user_id = :user_id",
+        "DELETE FROM jd_analyses WHERE user_id = :user_id",
+        "DELETE FROM users WHERE id = :user_id",
+    ]
+    async with database.session_maker() as session:
+        for statement in statements:
+            await session.execute(text(statement), {"user_id": user_id})
+        await session.commit()
+
+
+async def _probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def _probe_phase(client: httpx.AsyncClient, path: str, clients: int, until) -> tuple[list[float], float]:
+    """Probe with clients loops until the awaitable until finishes; returns (latencies, seconds)."""
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    started = time.perf_counter()
+    probes = [asyncio.create_task(_probe(client, path, stop, latencies)) for _ in range(clients)]
+    try:
+        await until
+    finally:
+        stop.set()
+        await asyncio.gather(*probes)
+    return latencies, time.perf_counter() - started
+
+
+async def _generate(client: httpx.AsyncClient, prep_id: int) -> None:
+    async with client.stream("GET", f"/api/preparations/{prep_id}/roadmap/stream") as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("event: error"):
+                raise SystemExit(f"Roadmap generation failed for preparation {prep_id}")
+            if line.startswith("event: done"):
+                return
+
+
+async def _watch_pool(stop: asyncio.Event) -> int:
+    peak = 0
+    while not stop.is_set():
+        peak = max(peak, database.engine.pool.checkedout())
+        await asyncio.sleep(0.01)
+    return peak
+
+
+async def main(args: argparse.Namespace) -> None:
+    llm_cache.get_openai_client = lambda: _stub_openai_client(args.llm_seconds)
+    database.init_db()
+    await database.create_db_and_tables()
+    app = create_app()
+
+    user_id, token, prep_ids = await _setup(args.generations)
+    probe_path = f"/api/preparations/{prep_ids[0]}"
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=600) as client:
+            latencies, seconds = await _probe_phase(client, probe_path, args.probe_clients, asyncio.sleep(args.duration))
+            _report("idle", latencies, seconds)
+
+            pool_stop = asyncio.Event()
+            pool_watch = asyncio.create_task(_watch_pool(pool_stop))
+            generations = asyncio.gather(*(_generate(client, prep_id) for prep_id in prep_ids))
+            latencies, seconds = await _probe_phase(client, probe_path, args.probe_clients, generations)
+            pool_stop.set()
+            _report("load", latencies, seconds)
+            print(
+                f"{args.generations} roadmap generations ({len(KNOWLEDGE_AREAS)} items x {args.llm_seconds:g}s LLM) "
+                f"in {seconds:.1f}s; peak pool connections checked out: {await pool_watch} "
+                f"(pool_size={database.config.pool_size}, max_overflow={database.config.max_overflow})"
+            )
+    finally:
+        await _cleanup(user_id)
+        await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generations", type=int, default=20, help="Concurrent roadmap generations")
+    parser.add_argument("--llm-seconds", type=float, default=5.0, help="Stub LLM time per roadmap item")
+    parser.add_argument("--probe-clients", type=int, default=4, help="Concurrent GET probe loops")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of the idle phase")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark admin question search: full-text (search_vector + GIN) vs the old ILIKE scan.
+
+Generates synthetic questions (default 100k) inside a transaction that is rolled
+back at the end, then times both predicates for a few search terms.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func, or_, select, text
+from sqlmodel import col
+
+from app.modules.questions.models import Question
+from app.modules.questions.services import search_match, search_query, search_rank
+from app.utils.db import database
+
+WORDS = [
+    "python", "fastapi", "postgres", "index", "transaction", "react", "hooks", "kubernetes",
+    "terraform", "microservice", "cache", "redis", "kafka", "docker", "testing", "security",
+    "lập trình", "cơ sở dữ liệu", "hiệu năng", "bảo mật", "kiến trúc", "giao dịch",
+]
+
+DEFAULT_TERMS = ["postgres index", "hieu nang", "hiệu năng", "kube", "redis cache transaction"]
+
+
+async def _time(conn, stmt, repeat: int) -> tuple[float, int]:
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len((await conn.execute(stmt)).all())
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), rows
+
+
+async def main(rows: int, terms: list[str], repeat: int) -> None:
+    database.init_db()
+    await database.create_db_and_tables()
+
+    async with database.engine.connect() as conn:
+        outer = await conn.begin()
+        try:
+            user_id = (await conn.execute(text("SELECT min(id) FROM users"))).scalar()
+            if user_id is None:
+                print("Needs at least one user (run scripts/create_admin.py first)")
+                return
+            words = "ARRAY[" + ", ".join(f"'{w}'" for w in WORDS) + "]"
+            n = len(WORDS)
+            started = time.perf_counter()
+            await conn.execute(text(f"""
+                INSERT INTO questions (
+                    title, content, question_type, options, difficulty, status, is_official,
+                    source_type, created_by_user_id, tags, version, created_at, updated_at
+                )
+                SELECT
+                    'Question ' || g || ' ' || w[1 + g % {n}] || ' ' || w[1 + (g * 7) % {n}],
+                    repeat(w[1 + (g * 3) % {n}] || ' ' || w[1 + (g * 5) % {n}] || ' ', 20),
+                    'multiple_choice', '{{}}'::json, 'intermediate', 'approved', false,
+                    'admin_curated', :user_id,
+                    jsonb_build_array(w[1 + (g * 11) % {n}], w[1 + (g * 13) % {n}]),
+                    1, now(), now()
+                FROM generate_series(1, :rows) AS g, (SELECT {words} AS w) AS words
+            """), {"user_id": user_id, "rows": rows})
+            await conn.execute(text("ANALYZE questions"))
+            print(f"Inserted {rows} questions in {time.perf_counter() - started:.1f}s\n")
+
+            print(f"{'term':<28} {'fts ms':>8} {'fts rows':>9} {'ilike ms':>9} {'ilike rows':>11}")
+            for term in terms:
+                tsquery = search_query(term)
+                fts = (
+                    select(Question.id)
+                    .where(search_match(tsquery))
+                    .order_by(search_rank(tsquery).desc(), col(Question.id).desc())
+                    .limit(20)
+                )
+                pattern = f"%{term}%"
+                ilike = (
+                    select(Question.id)
+                    .where(or_(col(Question.title).ilike(pattern), col(Question.content).ilike(pattern)))
+                    .order_by(col(Question.created_at).desc())
+                    .limit(20)
+                )
+                fts_ms, fts_rows = await _time(conn, fts, repeat)
+                ilike_ms, ilike_rows = await _time(conn, ilike, repeat)
+                print(f"{term:<28} {fts_ms:>8.1f} {fts_rows:>9} {ilike_ms:>9.1f} {ilike_rows:>11}")
+
+            total = (await conn.execute(select(func.count()).select_from(Question))).scalar_one()
+            print(f"\nquestions in table during run: {total}")
+        finally:
+            await outer.rollback()
+    await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic questions to generate")
+    parser.add_argument("--terms", nargs="+", default=DEFAULT_TERMS, help="Search terms")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median reported)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.terms, args.repeat))
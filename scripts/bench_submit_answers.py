@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /api/questions/submit: DB round trips and latency vs answers per submission.
+
+Runs against DATABASE_URL inside a transaction that is rolled back at the end
+(test user and questions are never committed). The round-trip count should stay
+constant as the number of answers grows.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.account.models import User
+from app.modules.questions.models import (
+    AnswerSubmitItem,
+    ContentStatus,
+    Question,
+    SubmitAnswersRequest,
+)
+from app.modules.questions.user_views import submit_answers
+from app.utils.db import database
+
+
+async def main(sizes: list[int], repeat: int) -> None:
+    database.init_db()
+    await database.create_db_and_tables()
+
+    statements = 0
+
+    def _count(*_args, **_kwargs) -> None:
+        nonlocal statements
+        statements += 1
+
+    async with database.engine.connect() as conn:
+        outer = await conn.begin()
+        # The view commits; with savepoints those commits stay inside the outer transaction
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+            session.add(user)
+            await session.flush()
+            questions = [
+                Question(
+                    title=f"Bench question {i}",
+                    content="2 + 2 = ?",
+                    question_type="multiple_choice",
+                    options={"choices": ["3", "4"], "correct_index": 1},
+                    difficulty="beginner",
+                    status=ContentStatus.APPROVED.value,
+                    created_by_user_id=user.id,
+                )
+                for i in range(max(sizes))
+            ]
+            session.add_all(questions)
+            await session.flush()
+
+            event.listen(conn.sync_connection, "before_cursor_execute", _count)
+            print(f"{'answers':>8} {'round trips':>12} {'ms/submit':>10}")
+            for size in sizes:
+                body = SubmitAnswersRequest(
+                    session_type="knowledge_check",
+                    answers=[
+                        AnswerSubmitItem(question_id=q.id, selected_answer="4" if i % 2 else "3")
+                        for i, q in enumerate(questions[:size])
+                    ],
+                )
+                statements = 0
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    await submit_answers(session=session, current_user=user, body=body)
+                elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+                print(f"{size:>8} {statements / repeat:>12.1f} {elapsed_ms:>10.2f}")
+            event.remove(conn.sync_connection, "before_cursor_execute", _count)
+        finally:
+            await session.close()
+            await outer.rollback()
+    await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 200], help="Answers per submission")
+    parser.add_argument("--repeat", type=int, default=20, help="Submissions per size")
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
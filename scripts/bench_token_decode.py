@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-request access token decoding, with and without the token cache.
+
+No database needed: creates one access token with the configured JWT settings
+and times decode_access_token over --iterations calls, first verifying the
+signature on every call (uncached), then through the verified-token cache
+(warm after the first call).
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils import auth
+
+
+def _time_calls(fn, token: str, iterations: int, repeat: int) -> list[float]:
+    """Microseconds per call, one value per repeat."""
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn(token)
+        results.append((time.perf_counter() - started) / iterations * 1e6)
+    return results
+
+
+def main(iterations: int, repeat: int) -> None:
+    token = auth.create_access_token(data={"user_id": 1, "email": "bench@example.com"})
+    auth._token_cache.clear()
+
+    uncached = _time_calls(lambda t: auth._verify_access_token(t)[0], token, iterations, repeat)
+    cached = _time_calls(auth.decode_access_token, token, iterations, repeat)
+
+    print(f"{iterations} decodes x {repeat} runs ({auth.settings.auth.jwt_algorithm})")
+    for label, values in (("uncached", uncached), ("cached", cached)):
+        print(f"  {label:<9} median {statistics.median(values):8.2f} us/call  min {min(values):8.2f} us/call")
+    print(f"  speedup   {statistics.median(uncached) / statistics.median(cached):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="Decodes per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant")
+    args = parser.parse_args()
+    main(args.iterations, args.repeat)
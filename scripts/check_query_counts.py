@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Check the number of SQL queries issued by list/detail endpoints (exit code 1 on regression).
+
+Runs against DATABASE_URL inside a transaction that is rolled back at the end:
+seeds a user, a company and --rows contributions, then calls the endpoints and
+asserts their query count does not grow with the number of rows (no N+1).
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.modules.account.models import User
+from app.modules.admin.views import admin_get_contribution, admin_list_contributions
+from app.modules.company.models import Company
+from app.modules.contribution.models import Contribution
+from app.modules.contribution.views import list_my_contributions
+from app.utils.db import database
+from app.utils.query_counter import assert_max_queries
+
+
+async def main(rows: int) -> int:
+    database.init_db()
+    await database.create_db_and_tables()
+
+    failures = 0
+    async with database.engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            user = User(email=f"querycount-{time.time_ns()}@example.com", hashed_password="x", is_admin=True)
+            company = Company(name="Query Count Co")
+            session.add_all([user, company])
+            await session.flush()
+            contributions = [
+                Contribution(user_id=user.id, company_id=company.id, jd_content=f"JD {i}")
+                for i in range(rows)
+            ]
+            session.add_all(contributions)
+            await session.flush()
+
+            checks = [
+                (
+                    "GET /api/admin/contributions",
+                    1,
+                    lambda: admin_list_contributions(
+                        admin=user, session=session, response=Response(), status_filter=None,
+                        page=1, page_size=min(rows, 100), cursor=None,
+                    ),
+                ),
+                (
+                    "GET /api/admin/contributions/{id}",
+                    1,
+                    lambda: admin_get_contribution(
+                        contribution_id=contributions[0].id, admin=user, session=session
+                    ),
+                ),
+                (
+                    "GET /api/contributions",
+                    1,
+                    lambda: list_my_contributions(
+                        session=session, current_user=user, preparation_id=None, limit=min(rows, 100)
+                    ),
+                ),
+            ]
+            for name, expected, call in checks:
+                try:
+                    with assert_max_queries(conn, expected) as counter:
+                        await call()
+                    print(f"ok    {name}: {counter.count} queries")
+                except AssertionError as exc:
+                    failures += 1
+                    print(f"FAIL  {name}: {exc}")
+        finally:
+            await session.close()
+            await outer.rollback()
+    await database.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="Contributions to seed")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.rows)))
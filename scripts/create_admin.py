@@ -16,6 +16,7 @@ from app.config import settings
 from app.modules.account.models import User
 from app.utils.auth import get_password_hash
 from app.utils.db import database
+from app.utils.user_cache import invalidate_user
 
 
 async def create_admin_user(email: str, password: str) -> None:
@@ -45,12 +46,13 @@ async def create_admin_user(email: str, password: str) -> None:
                 # Update existing user to admin
                 existing_user.is_admin = True
                 session.add(existing_user)
+                await invalidate_user(session, existing_user.id)
                 await session.commit()
                 print(f"✓ Updated user {email} to admin.")
                 return
 
         # Create new admin user
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash(password)
         admin_user = User(
             email=email,
             hashed_password=hashed_password,
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Apply pending database migrations (app/migrations/versions) and exit.
+
+Use as a pre-start/release command when the app is not started through
+gunicorn.config.py (which migrates from the master process), e.g. with
+DB_MIGRATE_ON_STARTUP=false on the app processes.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.migrations import get_migrations, get_schema_version, migrate_database
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+
+async def show_status() -> None:
+    """Print the applied version and the pending migrations."""
+    engine = create_async_engine(str(settings.database.url), poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            current = await get_schema_version(conn)
+    finally:
+        await engine.dispose()
+    print(f"Database schema version: {current}")
+    pending = [m for m in get_migrations() if m.version > current]
+    if not pending:
+        print("No pending migrations")
+    for migration in pending:
+        print(f"  pending {migration.version:04d}_{migration.name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="Show the schema version and pending migrations only")
+    args = parser.parse_args()
+    asyncio.run(show_status() if args.status else migrate_database())
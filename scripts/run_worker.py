@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Run background job workers in a dedicated process (use with JOB_WORKERS=0 on the web app)."""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import app.modules.preparation.jobs  # noqa: F401  (registers job handlers)
+from app.config import settings
+from app.utils.db import database
+from app.utils.jobs import start_job_workers, stop_job_workers, wait_for_job_workers
+from app.utils.openai_client import close_openai_client, init_openai_client
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+
+async def main(concurrency: int) -> None:
+    """Start workers and run until SIGINT/SIGTERM."""
+    database.init_db()
+    await database.create_db_and_tables()
+    if settings.openai.api_key:
+        init_openai_client()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: asyncio.ensure_future(stop_job_workers()))
+
+    start_job_workers(concurrency)
+    try:
+        await wait_for_job_workers()
+    finally:
+        await close_openai_client()
+        await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(settings.jobs.workers, 1),
+        help="Worker coroutines in this process (default: JOB_WORKERS, at least 1)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
@@ -19,6 +19,7 @@ import {
 } from '@/store/api/endpoints/companiesApi'
 import {
   useListMyContributionsQuery,
+  useGetContributionQuery,
   useCreateContributionMutation,
 } from '@/store/api/endpoints/contributionApi'
 import { useListPreparationsQuery } from '@/store/api/endpoints/preparationApi'
@@ -178,7 +179,10 @@ export function ContributePage() {
   const { data: contributions = [], isLoading: loadingList } =
     useListMyContributionsQuery()
   const [selectedId, setSelectedId] = useState<number | null>(null)
-  const selected = contributions.find((c) => c.id === selectedId) ?? null
+  // List rows are summaries; the sheet loads the full contribution
+  const { currentData: selected } = useGetContributionQuery(selectedId ?? 0, {
+    skip: selectedId == null,
+  })
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault()
@@ -618,7 +622,7 @@ export function ContributePage() {
                         <ChevronRight className="ml-auto size-4 shrink-0 text-muted-foreground" />
                       </div>
                       <div className="mt-1 text-muted-foreground line-clamp-2">
-                        {c.jd_content.slice(0, 120)}…
+                        {c.jd_excerpt.slice(0, 120)}…
                       </div>
                       <div className="mt-2 flex flex-wrap gap-2 text-xs text-muted-foreground">
                         <span>
@@ -627,18 +631,20 @@ export function ContributePage() {
                         {c.preparation_id != null && (
                           <span>· Chuẩn bị #{c.preparation_id}</span>
                         )}
-                        {c.question_info?.length > 0 && (
-                          <span>· {c.question_info.length} câu hỏi</span>
+                        {c.question_count > 0 && (
+                          <span>· {c.question_count} câu hỏi</span>
                         )}
                       </div>
                     </button>
                   </li>
                 ))}
               </ul>
-              <Sheet open={!!selected} onOpenChange={(open) => !open && setSelectedId(null)}>
+              <Sheet open={selectedId != null} onOpenChange={(open) => !open && setSelectedId(null)}>
                 <SheetContent className="flex w-full flex-col p-0 sm:max-w-xl overflow-hidden">
-                  {selected && (
+                  {selected ? (
                     <ContributionDetailSheet contribution={selected} onClose={() => setSelectedId(null)} />
+                  ) : (
+                    <Skeleton className="m-6 mt-12 h-52" />
                   )}
                 </SheetContent>
               </Sheet>
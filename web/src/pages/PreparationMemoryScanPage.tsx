@@ -17,6 +17,10 @@ import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { ChevronLeft, ChevronRight, Trophy, RotateCcw, Map } from 'lucide-react'
 
+const REPORT_POLL_INTERVAL_MS = 2000
+// Ngừng poll báo cáo LLM sau khoảng này (job có thể còn đang thử lại); user bấm "Kiểm tra lại" để poll tiếp
+const REPORT_POLL_TIMEOUT_MS = 3 * 60 * 1000
+
 function ScoreGauge({ percent }: { percent: number }) {
   const clamped = Math.max(0, Math.min(100, percent))
   const rotation = (clamped / 100) * 180 // half circle 0-180deg
@@ -94,6 +98,8 @@ function ResultView({
   roadmapReady,
   onCreateRoadmap,
   onRedo,
+  onRecheckReport,
+  reportPollTimedOut,
   isCreatingRoadmap,
   isResetting,
 }: {
@@ -102,6 +108,8 @@ function ResultView({
   roadmapReady: boolean
   onCreateRoadmap: () => void
   onRedo: () => void
+  onRecheckReport: () => void
+  reportPollTimedOut: boolean
   isCreatingRoadmap: boolean
   isResetting: boolean
 }) {
@@ -169,6 +177,42 @@ function ResultView({
             </div>
           )}
 
+          {!result.llm_report && result.llm_report_status === 'pending' && !reportPollTimedOut && (
+            <div className="rounded-xl border bg-background/60 p-4 space-y-2">
+              <p className="text-sm font-semibold text-muted-foreground">
+                Đánh giá từ AI
+              </p>
+              <ThinkingLoader messages={['Đang tạo đánh giá chi tiết từ AI...']} />
+            </div>
+          )}
+
+          {!result.llm_report && result.llm_report_status === 'pending' && reportPollTimedOut && (
+            <div className="rounded-xl border bg-background/60 p-4 space-y-2">
+              <p className="text-sm font-semibold text-muted-foreground">
+                Đánh giá từ AI
+              </p>
+              <p className="text-sm text-muted-foreground">
+                Đánh giá chi tiết đang mất nhiều thời gian hơn bình thường. Điểm số và mức độ theo vùng
+                phía trên đã đầy đủ để bạn tiếp tục tạo roadmap.
+              </p>
+              <Button variant="outline" size="sm" onClick={onRecheckReport}>
+                Kiểm tra lại
+              </Button>
+            </div>
+          )}
+
+          {!result.llm_report && result.llm_report_status === 'failed' && (
+            <div className="rounded-xl border bg-background/60 p-4 space-y-2">
+              <p className="text-sm font-semibold text-muted-foreground">
+                Đánh giá từ AI
+              </p>
+              <p className="text-sm text-muted-foreground">
+                Không tạo được đánh giá chi tiết từ AI cho lần scan này. Điểm số và mức độ theo vùng phía
+                trên vẫn dùng được để tạo roadmap; bạn có thể làm lại scan để nhận đánh giá mới.
+              </p>
+            </div>
+          )}
+
           {result.llm_report && (
             <div className="rounded-xl border bg-background/60 p-4 space-y-2">
               <p className="text-sm font-semibold text-muted-foreground">
@@ -222,7 +266,14 @@ export function PreparationMemoryScanPage() {
   const id = Number(preparationId)
   const navigate = useNavigate()
 
-  const { data: preparation } = useGetPreparationQuery(id, { skip: !id || Number.isNaN(id) })
+  const [localResult, setLocalResult] = useState<LastMemoryScanResult | null>(null)
+  const [reportPending, setReportPending] = useState(false)
+  const [reportPollTimedOut, setReportPollTimedOut] = useState(false)
+  // Báo cáo LLM sinh nền sau khi nộp: poll preparation tới khi llm_report_status = done | failed (tối đa REPORT_POLL_TIMEOUT_MS)
+  const { data: preparation, refetch: refetchPreparation } = useGetPreparationQuery(id, {
+    skip: !id || Number.isNaN(id),
+    pollingInterval: reportPending && !reportPollTimedOut ? REPORT_POLL_INTERVAL_MS : 0,
+  })
   const { data: questions = [], isLoading } = useGetMemoryScanQuestionsQuery(
     { preparationId: id, source: 'auto' },
     { skip: !id || Number.isNaN(id) }
@@ -232,8 +283,6 @@ export function PreparationMemoryScanPage() {
   const [resetMemoryScan, { isLoading: isResetting }] = useResetMemoryScanMutation()
   const { setStepProgress, clearStepProgress } = usePreparationFlowProgress()
 
-  const [localResult, setLocalResult] = useState<LastMemoryScanResult | null>(null)
-
   useEffect(() => {
     if (isCreatingRoadmap) setStepProgress(2, 'Đang tạo roadmap học tập cho bạn...')
     else if (isSubmitting) setStepProgress(1, 'Đang chấm điểm và phân tích kết quả...')
@@ -241,10 +290,28 @@ export function PreparationMemoryScanPage() {
     else clearStepProgress()
   }, [isLoading, isSubmitting, isCreatingRoadmap, setStepProgress, clearStepProgress])
 
-  const result: LastMemoryScanResult | null = useMemo(
-    () => localResult ?? preparation?.last_memory_scan_result ?? null,
-    [localResult, preparation?.last_memory_scan_result]
-  )
+  const result: LastMemoryScanResult | null = useMemo(() => {
+    const saved = preparation?.last_memory_scan_result ?? null
+    if (!localResult) return saved
+    // Kết quả đã lưu của cùng lần nộp (có thể đã kèm llm_report) thay cho kết quả local
+    if (saved && saved.session_id === localResult.session_id) return saved
+    return localResult
+  }, [localResult, preparation?.last_memory_scan_result])
+
+  useEffect(() => {
+    setReportPending(result?.llm_report_status === 'pending')
+  }, [result?.llm_report_status])
+
+  useEffect(() => {
+    if (!reportPending || reportPollTimedOut) return
+    const timer = setTimeout(() => setReportPollTimedOut(true), REPORT_POLL_TIMEOUT_MS)
+    return () => clearTimeout(timer)
+  }, [reportPending, reportPollTimedOut])
+
+  const handleRecheckReport = useCallback(() => {
+    setReportPollTimedOut(false)
+    refetchPreparation()
+  }, [refetchPreparation])
   const roadmapReady = Boolean(preparation?.roadmap_id)
 
   const [currentIndex, setCurrentIndex] = useState(0)
@@ -285,8 +352,11 @@ export function PreparationMemoryScanPage() {
         correct_count: res.correct_count,
         total_questions: res.total_questions,
         knowledge_assessment: res.knowledge_assessment,
+        session_id: res.session_id,
         llm_report: res.llm_report ?? null,
+        llm_report_status: res.llm_report_status,
       })
+      setReportPollTimedOut(false)
     } catch {
       // Error handled by mutation
     }
@@ -309,6 +379,7 @@ export function PreparationMemoryScanPage() {
       setLocalResult(null)
       setAnswers({})
       setCurrentIndex(0)
+      setReportPollTimedOut(false)
     } catch {
       // Error handled by mutation
     }
@@ -322,6 +393,8 @@ export function PreparationMemoryScanPage() {
         roadmapReady={roadmapReady}
         onCreateRoadmap={handleCreateRoadmap}
         onRedo={handleRedo}
+        onRecheckReport={handleRecheckReport}
+        reportPollTimedOut={reportPollTimedOut}
         isCreatingRoadmap={isCreatingRoadmap}
         isResetting={isResetting}
       />
@@ -2,6 +2,7 @@ import { useState } from 'react'
 import {
   useListAdminContributionsQuery,
   useGetAdminContributionsCountQuery,
+  useGetAdminContributionQuery,
   useApproveContributionMutation,
   useRejectContributionMutation,
   type AdminContributionStatus,
@@ -68,11 +69,12 @@ export function AdminContributionsPage() {
 
   const pageSize = 15
 
-  const { data: contributions = [], isLoading } = useListAdminContributionsQuery({
+  const { data: contributionPage, isLoading } = useListAdminContributionsQuery({
     status: statusFilter === 'all' ? undefined : statusFilter,
     page,
     page_size: pageSize,
   })
+  const contributions = contributionPage?.items ?? []
   const { data: countData } = useGetAdminContributionsCountQuery({
     status: statusFilter === 'all' ? undefined : statusFilter,
   })
@@ -82,6 +84,10 @@ export function AdminContributionsPage() {
   const total = countData?.total ?? 0
   const totalPages = Math.max(1, Math.ceil(total / pageSize))
   const selected = contributions.find((c) => c.id === selectedId) ?? null
+  // List rows are summaries; JD, questions and responses come from the detail endpoint
+  const { currentData: detail } = useGetAdminContributionQuery(selectedId ?? 0, {
+    skip: selectedId == null,
+  })
 
   const handleApprove = async (id: number) => {
     try {
@@ -296,6 +302,10 @@ export function AdminContributionsPage() {
 
                   {/* Scrollable content */}
                   <div className="flex-1 overflow-y-auto px-6 py-5 space-y-6">
+                    {!detail ? (
+                      <Skeleton className="h-52 w-full" />
+                    ) : (
+                    <>
                     {/* JD */}
                     <section>
                       <h3 className="flex items-center gap-2 text-sm font-semibold text-foreground mb-2">
@@ -303,19 +313,19 @@ export function AdminContributionsPage() {
                         Job description
                       </h3>
                       <div className="rounded-lg border bg-muted/20 p-4 text-sm leading-relaxed whitespace-pre-wrap max-h-52 overflow-y-auto">
-                        {selected.jd_content}
+                        {detail.jd_content}
                       </div>
                     </section>
 
                     {/* Questions */}
-                    {selected.question_info?.length > 0 && (
+                    {detail.question_info?.length > 0 && (
                       <section>
                         <h3 className="flex items-center gap-2 text-sm font-semibold text-foreground mb-2">
                           <MessageCircleQuestion className="size-4 text-muted-foreground" />
-                          Câu hỏi phỏng vấn ({selected.question_info.length})
+                          Câu hỏi phỏng vấn ({detail.question_info.length})
                         </h3>
                         <ol className="rounded-lg border bg-muted/20 p-4 space-y-2.5 max-h-44 overflow-y-auto list-decimal list-inside text-sm leading-relaxed text-foreground/90 [&>li]:pl-1">
-                          {selected.question_info.map((q, i) => (
+                          {detail.question_info.map((q, i) => (
                             <li key={i}>
                               {typeof q.question_text === 'string'
                                 ? q.question_text
@@ -327,17 +337,19 @@ export function AdminContributionsPage() {
                     )}
 
                     {/* Candidate responses */}
-                    {selected.candidate_responses && (
+                    {detail.candidate_responses && (
                       <section>
                         <h3 className="flex items-center gap-2 text-sm font-semibold text-foreground mb-2">
                           <MessageSquare className="size-4 text-muted-foreground" />
                           Câu trả lời / phản hồi
                         </h3>
                         <div className="rounded-lg border bg-muted/20 p-4 text-sm leading-relaxed whitespace-pre-wrap max-h-44 overflow-y-auto">
-                          {selected.candidate_responses}
+                          {detail.candidate_responses}
                         </div>
                       </section>
                     )}
+                    </>
+                    )}
                   </div>
                 </div>
               )}
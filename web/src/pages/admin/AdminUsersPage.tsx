@@ -67,6 +67,7 @@ export function AdminUsersPage() {
         <div className="flex items-center gap-2">
           <Users className="h-5 w-5 text-muted-foreground" />
           <span className="text-sm text-muted-foreground">
+            {data?.total_is_estimate ? '~' : ''}
             {data?.total || 0} total users
           </span>
         </div>
@@ -229,7 +230,7 @@ export function AdminUsersPage() {
                 <Button
                   variant="outline"
                   onClick={() => setPage((p) => p + 1)}
-                  disabled={page * data.page_size >= data.total}
+                  disabled={!data.next_cursor}
                 >
                   Next
                 </Button>
@@ -72,7 +72,12 @@ export default function QuestionsListPage() {
 
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault()
-    setFilters({ ...filters, search: searchTerm, page: 1 })
+    setFilters({
+      ...filters,
+      search: searchTerm,
+      sort_by: searchTerm.trim() ? 'relevance' : 'updated_at',
+      page: 1,
+    })
   }
 
   const handleDifficultySelect = (value: string) => {
@@ -263,7 +268,11 @@ export default function QuestionsListPage() {
           <p className="text-sm text-muted-foreground order-2 sm:order-1">
             Showing <span className="font-medium text-foreground">{start}</span> to{' '}
             <span className="font-medium text-foreground">{end}</span> of{' '}
-            <span className="font-medium text-foreground">{total}</span> questions.
+            <span className="font-medium text-foreground">
+              {data?.total_is_estimate ? '~' : ''}
+              {total}
+            </span>{' '}
+            questions.
           </p>
           <div className="flex items-center gap-1 order-1 sm:order-2">
             <Button
@@ -295,7 +304,7 @@ export default function QuestionsListPage() {
               variant="outline"
               size="sm"
               onClick={() => setFilters({ ...filters, page: page + 1 })}
-              disabled={page >= totalPages}
+              disabled={!data?.next_cursor}
               className="h-8"
             >
               Next
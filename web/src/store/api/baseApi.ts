@@ -5,17 +5,34 @@ import { getRefreshToken, removeTokens, saveToken } from '@/utils/authStorage'
 // Define the base URL for your API
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api'
 
-const baseQuery = fetchBaseQuery({
+// Read-your-writes with a DB read replica: the backend returns this header after a write;
+// sending it back keeps our reads on the primary until then (whichever worker serves them).
+const READ_PRIMARY_HEADER = 'X-Read-Primary-Until'
+let readPrimaryUntil: string | null = null
+
+const rawBaseQuery = fetchBaseQuery({
   baseUrl: API_BASE_URL,
   prepareHeaders: (headers) => {
     const token = localStorage.getItem('token')
     if (token) {
       headers.set('authorization', `Bearer ${token}`)
     }
+    if (readPrimaryUntil) {
+      headers.set(READ_PRIMARY_HEADER, readPrimaryUntil)
+    }
     return headers
   },
 })
 
+const baseQuery: typeof rawBaseQuery = async (args, api, extraOptions) => {
+  const result = await rawBaseQuery(args, api, extraOptions)
+  const until = result.meta?.response?.headers.get(READ_PRIMARY_HEADER)
+  if (until) {
+    readPrimaryUntil = until
+  }
+  return result
+}
+
 /**
  * On 401, try to refresh the access token and retry the request once.
  * If refresh fails or no refresh token, clear tokens and redirect to login.
@@ -32,13 +32,19 @@ export interface UserListItem {
 export interface UserListResponse {
   users: UserListItem[]
   total: number
+  /** true when total is a planner estimate or a briefly cached count */
+  total_is_estimate: boolean
   page: number
   page_size: number
+  /** Pass as `cursor` to fetch the next page; null on the last page */
+  next_cursor: string | null
 }
 
 export interface UserListParams {
   page?: number
   page_size?: number
+  cursor?: string
+  exact_count?: boolean
   email?: string
   is_active?: boolean
   is_admin?: boolean
@@ -66,10 +72,36 @@ export interface AdminContribution {
   created_at: string
 }
 
+/** Admin list row: summary without JD / questions / responses (see getAdminContribution) */
+export interface AdminContributionSummary {
+  id: number
+  user_id: number
+  company_id: number
+  company_name?: string
+  user_email?: string
+  preparation_id: number | null
+  job_position: string | null
+  status: AdminContributionStatus
+  approved_at: string | null
+  created_at: string
+  jd_excerpt: string
+  question_count: number
+}
+
 export interface AdminContributionsParams {
   status?: AdminContributionStatus
   page?: number
   page_size?: number
+  /** next_cursor of the previous page */
+  cursor?: string
+}
+
+export interface AdminContributionPage {
+  page: number
+  page_size: number
+  /** Pass as `cursor` to fetch the next page; null on the last page */
+  next_cursor: string | null
+  items: AdminContributionSummary[]
 }
 
 /**
@@ -93,6 +125,8 @@ export const adminApi = baseApi.injectEndpoints({
         const searchParams = new URLSearchParams()
         if (p.page) searchParams.append('page', p.page.toString())
         if (p.page_size) searchParams.append('page_size', p.page_size.toString())
+        if (p.cursor) searchParams.append('cursor', p.cursor)
+        if (p.exact_count) searchParams.append('exact_count', 'true')
         if (p.email) searchParams.append('email', p.email)
         if (p.is_active !== undefined) searchParams.append('is_active', p.is_active.toString())
         if (p.is_admin !== undefined) searchParams.append('is_admin', p.is_admin.toString())
@@ -128,21 +162,22 @@ export const adminApi = baseApi.injectEndpoints({
     }),
 
     // List contributions (admin moderation)
-    listAdminContributions: builder.query<AdminContribution[], AdminContributionsParams | void>({
+    listAdminContributions: builder.query<AdminContributionPage, AdminContributionsParams | void>({
       query: (params = {}) => {
         const searchParams = new URLSearchParams()
         if (params?.status) searchParams.append('status', params.status)
         if (params?.page) searchParams.append('page', params.page.toString())
         if (params?.page_size) searchParams.append('page_size', params.page_size.toString())
+        if (params?.cursor) searchParams.append('cursor', params.cursor)
         return `/admin/contributions?${searchParams.toString()}`
       },
       providesTags: (result) =>
         result
-          ? [...result.map((c) => ({ type: 'AdminContribution' as const, id: c.id })), 'AdminContribution']
+          ? [...result.items.map((c) => ({ type: 'AdminContribution' as const, id: c.id })), 'AdminContribution']
           : ['AdminContribution'],
     }),
 
-    getAdminContributionsCount: builder.query<{ total: number }, { status?: AdminContributionStatus } | void>({
+    getAdminContributionsCount: builder.query<{ total: number; estimated: boolean }, { status?: AdminContributionStatus } | void>({
       query: (params) => {
         const searchParams = new URLSearchParams()
         if (params?.status) searchParams.append('status', params.status)
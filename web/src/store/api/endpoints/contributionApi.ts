@@ -17,6 +17,22 @@ export interface Contribution {
   created_at: string
 }
 
+/** Contribution rút gọn trong list (nội dung đầy đủ: getContribution) */
+export interface ContributionSummary {
+  id: number
+  user_id: number
+  company_id: number
+  company_name?: string
+  preparation_id: number | null
+  job_position: string | null
+  status: ContributionStatus
+  approved_at: string | null
+  created_at: string
+  /** Đoạn đầu của JD */
+  jd_excerpt: string
+  question_count: number
+}
+
 export interface ContributionCreateInput {
   company_id: number
   preparation_id?: number | null
@@ -29,7 +45,7 @@ export interface ContributionCreateInput {
 export const contributionApi = baseApi.injectEndpoints({
   endpoints: (builder) => ({
     listMyContributions: builder.query<
-      Contribution[],
+      ContributionSummary[],
       { preparation_id?: number; limit?: number } | void
     >({
       query: (params) => {
@@ -1,3 +1,4 @@
+import type { FetchBaseQueryError } from '@reduxjs/toolkit/query'
 import { baseApi } from '../baseApi'
 import type { JDAnalysisResult } from './analysisApi'
 
@@ -15,8 +16,12 @@ export interface LastMemoryScanResult {
   session_id?: number
   /** Báo cáo đánh giá từ LLM (Markdown), dựa trên bài test + đáp án + kết quả chấm */
   llm_report?: string | null
+  /** Báo cáo LLM sinh nền sau khi nộp: pending → done | failed */
+  llm_report_status?: MemoryScanReportStatus
 }
 
+export type MemoryScanReportStatus = 'pending' | 'done' | 'failed'
+
 export interface PreparationItem {
   id: number
   user_id: number
@@ -32,6 +37,9 @@ export interface PreparationItem {
   job_title?: string | null
 }
 
+/** Preparation rút gọn trong list (không có knowledge_areas / last_memory_scan_result) */
+export type PreparationSummary = Omit<PreparationItem, 'knowledge_areas' | 'last_memory_scan_result'>
+
 export interface MemoryScanQuestion {
   id: string
   question_text: string
@@ -64,8 +72,11 @@ export interface MemoryScanSubmitResponse {
   preparation_id: number
   roadmap_ready: boolean
   knowledge_assessment?: KnowledgeAreaAssessment[]
-  /** Báo cáo đánh giá từ LLM (Markdown) */
+  /** Báo cáo đánh giá từ LLM (Markdown); null khi còn pending */
   llm_report?: string | null
+  llm_report_status: MemoryScanReportStatus
+  /** Job sinh báo cáo LLM (poll preparations/{id}/jobs/{job_id} hoặc preparations/{id}) */
+  llm_report_job_id?: number | null
 }
 
 export interface RoadmapTaskReference {
@@ -94,9 +105,52 @@ export interface RoadmapTask {
   meta?: RoadmapTaskMeta
 }
 
+/** Background job (202 response of submit-jd / create-roadmap; memory-scan report job) */
+export interface PreparationJob<T = unknown> {
+  id: number
+  kind: string
+  status: 'queued' | 'running' | 'succeeded' | 'failed'
+  preparation_id: number | null
+  attempts: number
+  max_attempts: number
+  result: T | null
+  error: string | null
+  created_at: string
+  updated_at: string
+  finished_at: string | null
+}
+
+const JOB_POLL_INTERVAL_MS = 1500
+
+type BaseQuery = (arg: string | { url: string; method?: string; body?: unknown }) =>
+  Promise<{ data?: unknown; error?: FetchBaseQueryError }>
+
+/** POST a preparation step, then poll its job until it finishes; resolves with job.result. */
+async function runPreparationJob<T>(
+  baseQuery: BaseQuery,
+  preparationId: number,
+  request: { url: string; method: string; body?: unknown },
+): Promise<{ data: T } | { error: FetchBaseQueryError }> {
+  const started = await baseQuery(request)
+  if (started.error) return { error: started.error }
+  let job = started.data as PreparationJob<T>
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS))
+    const polled = await baseQuery(`preparations/${preparationId}/jobs/${job.id}`)
+    if (polled.error) return { error: polled.error }
+    job = polled.data as PreparationJob<T>
+  }
+  if (job.status === 'failed') {
+    return {
+      error: { status: 'CUSTOM_ERROR', error: job.error ?? 'Job failed', data: { detail: job.error } },
+    }
+  }
+  return { data: job.result as T }
+}
+
 export const preparationApi = baseApi.injectEndpoints({
   endpoints: (builder) => ({
-    listPreparations: builder.query<PreparationItem[], void>({
+    listPreparations: builder.query<PreparationSummary[], void>({
       query: () => 'preparations',
       providesTags: ['Interview'],
     }),
@@ -115,16 +169,16 @@ export const preparationApi = baseApi.injectEndpoints({
       JDAnalysisResult,
       { preparationId: number; params: SubmitJdParams }
     >({
-      query: ({ preparationId, params }) => {
+      queryFn: ({ preparationId, params }, _api, _extra, baseQuery) => {
         const formData = new FormData()
         if (params.text) formData.append('text', params.text)
         if (params.file) formData.append('file', params.file)
         if (params.linkedin_url) formData.append('linkedin_url', params.linkedin_url)
-        return {
+        return runPreparationJob<JDAnalysisResult>(baseQuery as BaseQuery, preparationId, {
           url: `preparations/${preparationId}/submit-jd`,
           method: 'POST',
           body: formData,
-        }
+        })
       },
       invalidatesTags: (_result, _err, { preparationId }) => [
         { type: 'Interview', id: `prep-${preparationId}` },
@@ -163,10 +217,12 @@ export const preparationApi = baseApi.injectEndpoints({
       { roadmap_id: number; preparation_id: number },
       number
     >({
-      query: (preparationId) => ({
-        url: `preparations/${preparationId}/create-roadmap`,
-        method: 'POST',
-      }),
+      queryFn: (preparationId, _api, _extra, baseQuery) =>
+        runPreparationJob<{ roadmap_id: number; preparation_id: number }>(
+          baseQuery as BaseQuery,
+          preparationId,
+          { url: `preparations/${preparationId}/create-roadmap`, method: 'POST' },
+        ),
       invalidatesTags: (_result, _err, preparationId) => [
         { type: 'Interview', id: `prep-${preparationId}` },
         'Interview',
@@ -23,8 +23,12 @@ export interface Question {
 
 export interface QuestionListResponse {
   total: number
+  /** true when total is a planner estimate or a briefly cached count */
+  total_is_estimate: boolean
   page: number
   page_size: number
+  /** Pass as `cursor` to fetch the next page; null on the last page */
+  next_cursor: string | null
   items: Question[]
 }
 
@@ -66,6 +70,8 @@ export interface QuestionFilterParams {
   sort_order?: 'asc' | 'desc'
   page?: number
   page_size?: number
+  cursor?: string
+  exact_count?: boolean
 }
 
 export interface Skill {
@@ -122,6 +128,8 @@ export const questionsApi = baseApi.injectEndpoints({
         if (params.sort_order) queryParams.append('sort_order', params.sort_order)
         if (params.page) queryParams.append('page', params.page.toString())
         if (params.page_size) queryParams.append('page_size', params.page_size.toString())
+        if (params.cursor) queryParams.append('cursor', params.cursor)
+        if (params.exact_count) queryParams.append('exact_count', 'true')
         
         return `/admin/questions?${queryParams.toString()}`
       },
@@ -225,7 +233,7 @@ export const questionsApi = baseApi.injectEndpoints({
     }),
 
     // Assign skills to question
-    assignSkillsToQuestion: builder.mutation<{ message: string }, { id: number; skill_ids: number[] }>({
+    assignSkillsToQuestion: builder.mutation<{ message: string; skill_ids: number[] }, { id: number; skill_ids: number[] }>({
       query: ({ id, skill_ids }) => ({
         url: `/admin/questions/${id}/assign-skills`,
         method: 'POST',
@@ -249,7 +257,10 @@ export const questionsApi = baseApi.injectEndpoints({
     }),
 
     // Bulk approve
-    bulkApproveQuestions: builder.mutation<{ message: string; approved_count: number }, BulkApproveRequest>({
+    bulkApproveQuestions: builder.mutation<
+      { message: string; approved_count: number; approved_ids: number[]; skipped_ids: number[] },
+      BulkApproveRequest
+    >({
       query: (data) => ({
         url: '/admin/questions/bulk-approve',
         method: 'POST',
@@ -259,7 +270,10 @@ export const questionsApi = baseApi.injectEndpoints({
     }),
 
     // Bulk reject
-    bulkRejectQuestions: builder.mutation<{ message: string; rejected_count: number }, BulkRejectRequest>({
+    bulkRejectQuestions: builder.mutation<
+      { message: string; rejected_count: number; rejected_ids: number[]; skipped_ids: number[] },
+      BulkRejectRequest
+    >({
       query: (data) => ({
         url: '/admin/questions/bulk-reject',
         method: 'POST',